@@ -26,8 +26,24 @@ int servoPos[16] = {0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0}; // Açı ol
 // Programın çalışma durumu
 bool isRunning = true;
 
+// Zamanlı yörünge (traj) durumu - loop() içinde millis() ile bloklamadan izlenir
+int trajStart[16];
+int trajTarget[16];
+unsigned long trajStartTime[16];
+unsigned long trajDuration[16];
+bool trajActive[16];
+
+// Telemetri durumu - tlm:millis:sira:dongu_us:bos_ram:bekleyen_bayt:t1:t2:i:m:r:p
+long sonSira = -1;                    // Son uygulanan sıra numarası
+unsigned long telemetriAralik = 0;    // Periyodik telemetri aralığı (ms), 0 = kapalı
+unsigned long sonTelemetri = 0;
+unsigned long oncekiDonguBasi = 0;
+unsigned long enUzunDongu = 0;        // Son telemetriden beri en uzun döngü süresi (us)
+
 void setup() {
   Serial.begin(115200);
+  // Komut satırları tek parça gelir; readStringUntil loop'u uzun süre bloklamasın
+  Serial.setTimeout(20);
 
 
   pwm.begin();
@@ -42,130 +58,211 @@ void setup() {
 }
 
 void loop() {
+  // Döngü süresini ölç (bloklayan hareketler uzun döngü olarak görünür)
+  unsigned long donguBasi = micros();
+  if (oncekiDonguBasi != 0 && donguBasi - oncekiDonguBasi > enUzunDongu) {
+    enUzunDongu = donguBasi - oncekiDonguBasi;
+  }
+  oncekiDonguBasi = donguBasi;
+  
+  // Aktif yörünge segmentlerini ilerlet
+  updateTrajectories();
+  
+  // Periyodik telemetri
+  if (telemetriAralik > 0 && millis() - sonTelemetri >= telemetriAralik) {
+    telemetriGonder();
+  }
+  
   if (Serial.available() > 0) {
     String komut = Serial.readStringUntil('\n');
     komut.trim();
     
-    // Program kontrolü
-    if (komut == "stop") {
-      isRunning = false;
-      return; // Loop'tan çıkarak diğer komutları işlemez
-    }
-    else if (komut == "start") {
-      isRunning = true;
-      return;
-    }
-    else if (komut == "status") {
-      return;
+    // Sıra numaralı komut (ör. movefingers:...#42): uygulandıktan sonra
+    // "ack:42:<millis>" yanıtı gönderilir, böylece host gecikmeyi ölçebilir
+    long sira = -1;
+    int diyez = komut.indexOf('#');
+    if (diyez != -1) {
+      sira = komut.substring(diyez + 1).toInt();
+      komut = komut.substring(0, diyez);
     }
     
-    // Eğer program durdurulmuşsa, diğer komutları işleme
-    if (!isRunning) {
-      return;
-    }
+    komutIsle(komut);
     
-    // Test komutları
-    if (komut.startsWith("test")) {
-      if (komut == "testall") {
-        testAllServos();
-      } else {
-        int servoNum = komut.substring(4).toInt();
-        testServo(servoNum);
-      }
+    if (sira >= 0) {
+      sonSira = sira;
+      Serial.print("ack:");
+      Serial.print(sira);
+      Serial.print(':');
+      Serial.println(millis());
+    }
+  }
+}
+
+// Tek bir komut satırını uygular
+void komutIsle(String komut) {
+  // Program kontrolü
+  if (komut == "stop") {
+    isRunning = false;
+    cancelTrajectories();
+    return; // Diğer komutları işlemeden çık
+  }
+  else if (komut == "start") {
+    isRunning = true;
+    return;
+  }
+  else if (komut == "status") {
+    // İstek üzerine tek telemetri satırı
+    telemetriGonder();
+    return;
+  }
+  // Periyodik telemetri - telemetry:aralik_ms (0 = kapalı)
+  else if (komut.startsWith("telemetry:")) {
+    telemetriAralik = komut.substring(10).toInt();
+    return;
+  }
+  
+  // Eğer program durdurulmuşsa, diğer komutları işleme
+  if (!isRunning) {
+    return;
+  }
+  
+  // Mutlak hareket komutları devam eden yörüngeleri iptal eder
+  if (!komut.startsWith("traj")) {
+    cancelTrajectories();
+  }
+  
+  // Test komutları
+  if (komut.startsWith("test")) {
+    if (komut == "testall") {
+      testAllServos();
+    } else {
+      int servoNum = komut.substring(4).toInt();
+      testServo(servoNum);
     }
-    // Standart servo hareketi
-    else if (komut.startsWith("servo:")) {
-      int ilkIkiNokta = komut.indexOf(':');
-      int ikinciIkiNokta = komut.indexOf(':', ilkIkiNokta + 1);
+  }
+  // Standart servo hareketi
+  else if (komut.startsWith("servo:")) {
+    int ilkIkiNokta = komut.indexOf(':');
+    int ikinciIkiNokta = komut.indexOf(':', ilkIkiNokta + 1);
+    
+    if (ilkIkiNokta != -1 && ikinciIkiNokta != -1) {
+      int servoNum = komut.substring(ilkIkiNokta + 1, ikinciIkiNokta).toInt();
+      int aci = komut.substring(ikinciIkiNokta + 1).toInt();
       
-      if (ilkIkiNokta != -1 && ikinciIkiNokta != -1) {
-        int servoNum = komut.substring(ilkIkiNokta + 1, ikinciIkiNokta).toInt();
-        int aci = komut.substring(ikinciIkiNokta + 1).toInt();
-        
-        setServo(servoNum, aci);
-      }
+      setServo(servoNum, aci);
     }
-    // Yavaş hareket - smoothmove:0:90:10 (servo:açı:hız)
-    else if (komut.startsWith("smoothmove:")) {
-      int ilkIkiNokta = komut.indexOf(':');
-      int ikinciIkiNokta = komut.indexOf(':', ilkIkiNokta + 1);
-      int ucuncuIkiNokta = komut.indexOf(':', ikinciIkiNokta + 1);
+  }
+  // Yavaş hareket - smoothmove:0:90:10 (servo:açı:hız)
+  else if (komut.startsWith("smoothmove:")) {
+    int ilkIkiNokta = komut.indexOf(':');
+    int ikinciIkiNokta = komut.indexOf(':', ilkIkiNokta + 1);
+    int ucuncuIkiNokta = komut.indexOf(':', ikinciIkiNokta + 1);
+    
+    if (ilkIkiNokta != -1 && ikinciIkiNokta != -1 && ucuncuIkiNokta != -1) {
+      int servoNum = komut.substring(ilkIkiNokta + 1, ikinciIkiNokta).toInt();
+      int aci = komut.substring(ikinciIkiNokta + 1, ucuncuIkiNokta).toInt();
+      int hiz = komut.substring(ucuncuIkiNokta + 1).toInt();
       
-      if (ilkIkiNokta != -1 && ikinciIkiNokta != -1 && ucuncuIkiNokta != -1) {
-        int servoNum = komut.substring(ilkIkiNokta + 1, ikinciIkiNokta).toInt();
-        int aci = komut.substring(ikinciIkiNokta + 1, ucuncuIkiNokta).toInt();
-        int hiz = komut.substring(ucuncuIkiNokta + 1).toInt();
-        
-        moveServoSmooth(servoNum, aci, hiz);
-      }
+      moveServoSmooth(servoNum, aci, hiz);
     }
-    // Kalibrasyon komutu - calibrate:0:150:600 (servo:min:max)
-    else if (komut.startsWith("calibrate:")) {
-      int ilkIkiNokta = komut.indexOf(':');
-      int ikinciIkiNokta = komut.indexOf(':', ilkIkiNokta + 1);
-      int ucuncuIkiNokta = komut.indexOf(':', ikinciIkiNokta + 1);
+  }
+  // Kalibrasyon komutu - calibrate:0:150:600 (servo:min:max)
+  else if (komut.startsWith("calibrate:")) {
+    int ilkIkiNokta = komut.indexOf(':');
+    int ikinciIkiNokta = komut.indexOf(':', ilkIkiNokta + 1);
+    int ucuncuIkiNokta = komut.indexOf(':', ikinciIkiNokta + 1);
+    
+    if (ilkIkiNokta != -1 && ikinciIkiNokta != -1 && ucuncuIkiNokta != -1) {
+      int servoNum = komut.substring(ilkIkiNokta + 1, ikinciIkiNokta).toInt();
+      int minVal = komut.substring(ikinciIkiNokta + 1, ucuncuIkiNokta).toInt();
+      int maxVal = komut.substring(ucuncuIkiNokta + 1).toInt();
       
-      if (ilkIkiNokta != -1 && ikinciIkiNokta != -1 && ucuncuIkiNokta != -1) {
-        int servoNum = komut.substring(ilkIkiNokta + 1, ikinciIkiNokta).toInt();
-        int minVal = komut.substring(ikinciIkiNokta + 1, ucuncuIkiNokta).toInt();
-        int maxVal = komut.substring(ucuncuIkiNokta + 1).toInt();
-        
-        calibrateServo(servoNum, minVal, maxVal);
-      }
+      calibrateServo(servoNum, minVal, maxVal);
     }
-    // Tüm parmakları tek komutla hareket ettirme
-    else if (komut.startsWith("movefingers:")) {
-      // Format: movefingers:t1:t2:i:m:r:p
-      // Örnek: movefingers:90:45:180:180:180:180
+  }
+  // Tüm parmakları tek komutla hareket ettirme
+  else if (komut.startsWith("movefingers:")) {
+    // Format: movefingers:t1:t2:i:m:r:p
+    // Örnek: movefingers:90:45:180:180:180:180
+    
+    int ilkIkiNokta = komut.indexOf(':');
+    int ikinciIkiNokta = komut.indexOf(':', ilkIkiNokta + 1);
+    int ucuncuIkiNokta = komut.indexOf(':', ikinciIkiNokta + 1);
+    int dorduncuIkiNokta = komut.indexOf(':', ucuncuIkiNokta + 1);
+    int besinciIkiNokta = komut.indexOf(':', dorduncuIkiNokta + 1);
+    int altinciIkiNokta = komut.indexOf(':', besinciIkiNokta + 1);
+    
+    if (ilkIkiNokta != -1 && ikinciIkiNokta != -1 && ucuncuIkiNokta != -1 && 
+        dorduncuIkiNokta != -1 && besinciIkiNokta != -1) {
       
-      int ilkIkiNokta = komut.indexOf(':');
-      int ikinciIkiNokta = komut.indexOf(':', ilkIkiNokta + 1);
-      int ucuncuIkiNokta = komut.indexOf(':', ikinciIkiNokta + 1);
-      int dorduncuIkiNokta = komut.indexOf(':', ucuncuIkiNokta + 1);
-      int besinciIkiNokta = komut.indexOf(':', dorduncuIkiNokta + 1);
-      int altinciIkiNokta = komut.indexOf(':', besinciIkiNokta + 1);
+      int thumb1 = komut.substring(ilkIkiNokta + 1, ikinciIkiNokta).toInt();
+      int thumb2 = komut.substring(ikinciIkiNokta + 1, ucuncuIkiNokta).toInt();
+      int index = komut.substring(ucuncuIkiNokta + 1, dorduncuIkiNokta).toInt();
+      int middle = komut.substring(dorduncuIkiNokta + 1, besinciIkiNokta).toInt();
+      int ring = komut.substring(besinciIkiNokta + 1, altinciIkiNokta).toInt();
+      int pinky = komut.substring(altinciIkiNokta + 1).toInt();
       
-      if (ilkIkiNokta != -1 && ikinciIkiNokta != -1 && ucuncuIkiNokta != -1 && 
-          dorduncuIkiNokta != -1 && besinciIkiNokta != -1) {
-        
-        int thumb1 = komut.substring(ilkIkiNokta + 1, ikinciIkiNokta).toInt();
-        int thumb2 = komut.substring(ikinciIkiNokta + 1, ucuncuIkiNokta).toInt();
-        int index = komut.substring(ucuncuIkiNokta + 1, dorduncuIkiNokta).toInt();
-        int middle = komut.substring(dorduncuIkiNokta + 1, besinciIkiNokta).toInt();
-        int ring = komut.substring(besinciIkiNokta + 1, altinciIkiNokta).toInt();
-        int pinky = komut.substring(altinciIkiNokta + 1).toInt();
-        
-        moveFingers(thumb1, thumb2, index, middle, ring, pinky);
-      }
-    }
-    // Hazır hareketler
-    else if (komut == "open") {
-      openHand();
+      moveFingers(thumb1, thumb2, index, middle, ring, pinky);
     }
-    else if (komut == "close") {
-      closeHand();
-    }
-    else if (komut == "thumbsup") {
-      thumbsUp();
-    }
-    else if (komut == "point") {
-      pointFinger();
-    }
-    else if (komut == "pinch") {
-      pinchGesture();
-    }
-    else if (komut == "wave") {
-      waveHand();
+  }
+  // Sadece değişen parmaklar - delta:parmak:açı[:parmak:açı...]
+  // Parmak sırası: 0=t1 1=t2 2=i 3=m 4=r 5=p, örnek: delta:2:45:4:90
+  else if (komut.startsWith("delta:")) {
+    int degerler[12];
+    int okunan = parseValues(komut, degerler, 12);
+    for (int i = 0; i + 1 < okunan; i += 2) {
+      if (degerler[i] >= 0 && degerler[i] < 6) {
+        setServo(BAS_PARMAK_1 + degerler[i], degerler[i + 1]);
+      }
     }
-    else if (komut == "init") {
-      Serial.println("Sistem başlatıldı");
+  }
+  // Zamanlı yörünge segmenti - traj:sure_ms:t1:t2:i:m:r:p
+  // Örnek: traj:100:90:45:180:180:180:180
+  else if (komut.startsWith("traj:")) {
+    int degerler[7];
+    if (parseValues(komut, degerler, 7) == 7) {
+      unsigned long sure = degerler[0] < 0 ? 0 : degerler[0];
+      for (int i = 0; i < 6; i++) {
+        startSegment(BAS_PARMAK_1 + i, degerler[i + 1], sure);
+      }
     }
-    else if (komut == "help") {
-      showHelp();
+  }
+  // Sabit hızlı yörünge segmenti - trajv:derece_saniye:t1:t2:i:m:r:p
+  else if (komut.startsWith("trajv:")) {
+    int degerler[7];
+    if (parseValues(komut, degerler, 7) == 7) {
+      for (int i = 0; i < 6; i++) {
+        startVelocitySegment(BAS_PARMAK_1 + i, degerler[i + 1], degerler[0]);
+      }
     }
-    else {
+  }
+  // Hazır hareketler
+  else if (komut == "open") {
+    openHand();
+  }
+  else if (komut == "close") {
+    closeHand();
+  }
+  else if (komut == "thumbsup") {
+    thumbsUp();
+  }
+  else if (komut == "point") {
+    pointFinger();
+  }
+  else if (komut == "pinch") {
+    pinchGesture();
+  }
+  else if (komut == "wave") {
+    waveHand();
+  }
+  else if (komut == "init") {
+    Serial.println("Sistem başlatıldı");
+  }
+  else if (komut == "help") {
+    showHelp();
+  }
+  else {
 
-    }
   }
 }
 
@@ -197,6 +294,128 @@ void setServo(uint8_t servoNum, int angle) {
 
 void showHelp() {}
 
+// Boş RAM (yığın ile heap arası bayt)
+int bosRam() {
+#ifdef __AVR__
+  extern int __heap_start, *__brkval;
+  int v;
+  return (int) &v - (__brkval == 0 ? (int) &__heap_start : (int) __brkval);
+#else
+  return -1;
+#endif
+}
+
+// Durum satırı: tlm:millis:sira:dongu_us:bos_ram:bekleyen_bayt:t1:t2:i:m:r:p
+void telemetriGonder() {
+  Serial.print("tlm:");
+  Serial.print(millis());
+  Serial.print(':');
+  Serial.print(sonSira);
+  Serial.print(':');
+  Serial.print(enUzunDongu);
+  Serial.print(':');
+  Serial.print(bosRam());
+  Serial.print(':');
+  Serial.print(Serial.available());
+  for (int i = BAS_PARMAK_1; i <= SERCE_PARMAK; i++) {
+    Serial.print(':');
+    Serial.print(servoPos[i]);
+  }
+  Serial.println();
+  sonTelemetri = millis();
+  enUzunDongu = 0;
+}
+
+// Komuttaki ilk ':' sonrasındaki ':' ile ayrılmış tamsayıları okur
+int parseValues(String komut, int *degerler, int adet) {
+  int okunan = 0;
+  int bas = komut.indexOf(':');
+  while (bas != -1 && okunan < adet) {
+    int son = komut.indexOf(':', bas + 1);
+    if (son == -1) {
+      degerler[okunan++] = komut.substring(bas + 1).toInt();
+      break;
+    }
+    degerler[okunan++] = komut.substring(bas + 1, son).toInt();
+    bas = son;
+  }
+  return okunan;
+}
+
+// Servoyu ölü bölge olmadan doğrudan yazar (yörünge adımları için)
+void writeServo(uint8_t servoNum, int angle) {
+  if (angle < 0) angle = 0;
+  if (angle > 180) angle = 180;
+  
+  if (servoPos[servoNum] == angle) {
+    return;
+  }
+  
+  uint16_t pulse = map(angle, 0, 180, servoMin[servoNum], servoMax[servoNum]);
+  pwm.setPWM(servoNum, 0, pulse);
+  servoPos[servoNum] = angle;
+}
+
+// Servoyu mevcut konumundan hedefe 'sure' milisaniyede götüren segment başlatır
+void startSegment(uint8_t servoNum, int target, unsigned long sure) {
+  if (servoNum < 10 || servoNum > 15) {
+    return;
+  }
+  
+  if (target < 0) target = 0;
+  if (target > 180) target = 180;
+  
+  trajStart[servoNum] = servoPos[servoNum];
+  trajTarget[servoNum] = target;
+  trajStartTime[servoNum] = millis();
+  trajDuration[servoNum] = sure;
+  trajActive[servoNum] = true;
+}
+
+// Hedefe sabit hızla (derece/saniye) giden segment başlatır
+void startVelocitySegment(uint8_t servoNum, int target, int hiz) {
+  if (servoNum < 10 || servoNum > 15) {
+    return;
+  }
+  
+  if (target < 0) target = 0;
+  if (target > 180) target = 180;
+  
+  unsigned long sure = 0;
+  if (hiz > 0) {
+    sure = (unsigned long)abs(target - servoPos[servoNum]) * 1000UL / hiz;
+  }
+  startSegment(servoNum, target, sure);
+}
+
+// Aktif segmentleri millis()'e göre ilerletir, hiç beklemez
+void updateTrajectories() {
+  unsigned long simdi = millis();
+  
+  for (int i = 10; i <= 15; i++) {
+    if (!trajActive[i]) {
+      continue;
+    }
+    
+    unsigned long gecen = simdi - trajStartTime[i];
+    int aci;
+    if (gecen >= trajDuration[i]) {
+      aci = trajTarget[i];
+      trajActive[i] = false;
+    } else {
+      long fark = trajTarget[i] - trajStart[i];
+      aci = trajStart[i] + fark * (long)gecen / (long)trajDuration[i];
+    }
+    writeServo(i, aci);
+  }
+}
+
+void cancelTrajectories() {
+  for (int i = 10; i <= 15; i++) {
+    trajActive[i] = false;
+  }
+}
+
 
 void testServo(int servoNum) {
   if (servoNum < 10 || servoNum > 15) {
@@ -250,10 +469,13 @@ void moveServoSmooth(uint8_t servoNum, int targetAngle, int speedDelay) {
   
   int currentAngle = servoPos[servoNum];
   
+  // Hata ayıklama satırı: servo, mevcut açı, hedef açı. Satır sonu şart,
+  // yoksa ardından gelen "ack:" yanıtı aynı satıra yapışır
   Serial.print(servoNum);
+  Serial.print(' ');
   Serial.print(currentAngle);
-  Serial.print(targetAngle);
-
+  Serial.print(' ');
+  Serial.println(targetAngle);
   
   // Yumuşak geçiş için kademeli hareket
   if (currentAngle < targetAngle) {
@@ -43,6 +43,11 @@ def check_arduino_connection(port, baudrate=115200):
 if __name__ == "__main__":
     import sys
     
+    # Import süresi profili: -X importtime ile yeniden çalıştır
+    if '--profile-imports' in sys.argv:
+        from utils.import_profile import run_with_import_profile
+        sys.exit(run_with_import_profile())
+    
     # Komut satırı argümanlarını işle
     if len(sys.argv) > 1:
         port = sys.argv[1]
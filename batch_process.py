@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Offline batch processing of recorded sessions.
+
+Runs hand detection and angle calculation over video files, in parallel
+with one HandDetector per worker process, and writes the landmark and
+servo-angle streams of every video to ``<output>/<video name>.npz``. Videos
+found under a directory or glob pattern keep their subfolders below it, so
+``recordings/a/session.mp4`` and ``recordings/b/session.mp4`` become
+``<output>/a/session.npz`` and ``<output>/b/session.npz``:
+
+    frame_index   (N,)       int32    frame number in the video
+    timestamp_ms  (N,)       float64  video timestamp of the frame
+    detected      (N,)       bool     a hand was found
+    landmarks     (N, 21, 3) float32  normalized landmarks, NaN without a hand
+    angles        (N, 6)     int16    servo angles in FINGER_ORDER, -1 without a hand
+    fingers       (6,)       str      finger names of the angle columns
+    fps           ()         float64  video frame rate
+
+Videos whose output already exists are skipped, so an interrupted run can
+simply be restarted.
+
+Usage:
+    python batch_process.py recordings/ --output landmarks/
+    python batch_process.py "recordings/2024-*/*.mp4" --workers 8
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from multiprocessing import Pool
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from config.settings import FINGER_ANGLE_RANGES, MEDIAPIPE_CONFIG, SMOOTH_FACTOR
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv', '.webm')
+
+# Per-process detector settings, set by the pool initializer, and the
+# detector created from them on the worker's first video
+_detector_config = None
+_detector = None
+
+
+class VideoResult(NamedTuple):
+    """Outcome of processing one video."""
+    video: str
+    output: str
+    frames: int
+    detected: int
+    seconds: float
+    error: Optional[str] = None
+
+
+def _pattern_root(pattern: str) -> str:
+    """The directory part of a glob pattern before its first wildcard."""
+    parts = []
+    for part in pattern.split(os.sep):
+        if any(char in part for char in '*?['):
+            return os.sep.join(parts)
+        parts.append(part)
+    return os.path.dirname(pattern)  # A plain file name
+
+
+def find_videos(inputs: List[str]) -> Dict[str, str]:
+    """
+    Expand directories and glob patterns into video files.
+
+    Args:
+        inputs: Video files, directories or glob patterns
+
+    Returns:
+        Unique video paths, sorted, mapped to their path relative to the
+        input they were found under (the directory, or the part of the
+        pattern before its first wildcard)
+    """
+    videos = {}
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, files in os.walk(item):
+                for name in files:
+                    if name.lower().endswith(VIDEO_EXTENSIONS):
+                        path = os.path.join(root, name)
+                        videos.setdefault(path, os.path.relpath(path, item))
+        else:
+            root = _pattern_root(item) or os.curdir
+            for path in glob.glob(item):
+                if os.path.isfile(path):
+                    videos.setdefault(path, os.path.relpath(path, root))
+    return dict(sorted(videos.items()))
+
+
+def output_path(name: str, output_dir: str) -> str:
+    """
+    Args:
+        name: Video path relative to its input (see find_videos)
+        output_dir: Output directory
+
+    Returns:
+        The .npz path written for a video
+    """
+    return os.path.join(output_dir, os.path.splitext(name)[0] + '.npz')
+
+
+def assign_outputs(videos: Dict[str, str], output_dir: str) -> Dict[str, str]:
+    """
+    Map every video to its output file.
+
+    Args:
+        videos: Result of find_videos()
+        output_dir: Output directory
+
+    Returns:
+        Output path by video
+
+    Raises:
+        ValueError: If two videos would write the same output, e.g. two
+            'session.mp4' files passed from different folders
+    """
+    outputs = {}
+    owners = {}
+    for video, name in videos.items():
+        output = output_path(name, output_dir)
+        if output in owners:
+            raise ValueError(f"{owners[output]} and {video} would both be written to {output}; "
+                             f"pass their common parent directory or a glob pattern instead")
+        owners[output] = video
+        outputs[video] = output
+    return outputs
+
+
+def _init_worker(config: Dict):
+    """
+    Store the detector settings for this worker.
+
+    The detector is created by the first job instead: a worker whose
+    initializer raises is replaced by the pool over and over, and the run
+    would hang instead of reporting the error.
+    """
+    global _detector_config
+    _detector_config = config
+
+
+def _get_detector():
+    """This worker's HandDetector, created on first use."""
+    global _detector
+    if _detector is None:
+        import cv2
+        from hand_tracking import HandDetector
+
+        # One worker per core: keep OpenCV from starting its own thread pool
+        cv2.setNumThreads(1)
+        _detector = HandDetector(_detector_config)
+    return _detector
+
+
+def process_video(video: str, output: str, max_frames: int = 0) -> VideoResult:
+    """
+    Run detection over one video and write its streams.
+
+    Args:
+        video: Input video path
+        output: Output .npz path
+        max_frames: Stop after this many frames (0 = whole video)
+
+    Returns:
+        VideoResult
+    """
+    import cv2
+    from hand_tracking import AngleCalculator
+    from hand_tracking.landmarks import NUM_LANDMARKS, landmarks_to_array
+    from serial_comm.protocol import FINGER_ORDER
+
+    start = time.perf_counter()
+    detector = _get_detector()
+    capture = cv2.VideoCapture(video)
+    if not capture.isOpened():
+        return VideoResult(video, output, 0, 0, 0.0, "cannot open video")
+
+    # Smoothing state must not carry over between videos
+    angle_calculator = AngleCalculator(FINGER_ANGLE_RANGES, SMOOTH_FACTOR)
+    fps = capture.get(cv2.CAP_PROP_FPS)
+    timestamps, landmarks, angles, detected = [], [], [], []
+    no_hand = np.full((NUM_LANDMARKS, 3), np.nan, dtype=np.float32)
+    no_angles = [-1] * len(FINGER_ORDER)
+
+    try:
+        while not max_frames or len(timestamps) < max_frames:
+            ret, frame = capture.read()
+            if not ret:
+                break
+            timestamps.append(capture.get(cv2.CAP_PROP_POS_MSEC))
+            results = detector.detect_hands(frame)
+            if results.multi_hand_landmarks:
+                hand = results.multi_hand_landmarks[0].landmark
+                finger_angles = angle_calculator.calculate_servo_angles(hand)
+                landmarks.append(landmarks_to_array(hand))
+                angles.append([finger_angles[finger] for finger in FINGER_ORDER])
+                detected.append(True)
+            else:
+                landmarks.append(no_hand)
+                angles.append(no_angles)
+                detected.append(False)
+    except Exception as e:
+        return VideoResult(video, output, len(timestamps), sum(detected),
+                           time.perf_counter() - start, str(e))
+    finally:
+        capture.release()
+
+    frames = len(timestamps)
+    # Write under a temporary name so an interrupted run never leaves a
+    # partial file that would be skipped on resume
+    temporary = output + '.part.npz'
+    np.savez(temporary,
+             frame_index=np.arange(frames, dtype=np.int32),
+             timestamp_ms=np.array(timestamps, dtype=np.float64),
+             detected=np.array(detected, dtype=bool),
+             landmarks=np.array(landmarks, dtype=np.float32).reshape(frames, NUM_LANDMARKS, 3),
+             angles=np.array(angles, dtype=np.int16).reshape(frames, len(FINGER_ORDER)),
+             fingers=np.array(FINGER_ORDER),
+             fps=np.float64(fps))
+    os.replace(temporary, output)
+    return VideoResult(video, output, frames, sum(detected), time.perf_counter() - start)
+
+
+def _process_job(job) -> VideoResult:
+    video, output, max_frames = job
+    try:
+        return process_video(video, output, max_frames)
+    except Exception as e:
+        return VideoResult(video, output, 0, 0, 0.0, str(e))
+
+
+def run_batch(videos: Dict[str, str], output_dir: str, workers: int, overwrite: bool = False,
+              max_frames: int = 0) -> List[VideoResult]:
+    """
+    Process videos in a worker pool, printing progress and a summary.
+
+    Args:
+        videos: Input videos and their relative names (see find_videos)
+        output_dir: Directory for the .npz outputs
+        workers: Number of worker processes
+        overwrite: Reprocess videos whose output already exists
+        max_frames: Frame limit per video (0 = no limit)
+
+    Returns:
+        Results of the videos processed in this run
+
+    Raises:
+        ValueError: If two videos map to the same output (checked before any work starts)
+    """
+    outputs = assign_outputs(videos, output_dir)
+    jobs = []
+    for video, output in outputs.items():
+        if not overwrite and os.path.exists(output):
+            continue
+        os.makedirs(os.path.dirname(output) or os.curdir, exist_ok=True)
+        jobs.append((video, output, max_frames))
+
+    skipped = len(videos) - len(jobs)
+    print(f"{len(videos)} videos, {skipped} already done, {len(jobs)} to process "
+          f"with {workers} workers")
+    if not jobs:
+        return []
+
+    results = []
+    start = time.perf_counter()
+    with Pool(workers, initializer=_init_worker, initargs=(MEDIAPIPE_CONFIG,)) as pool:
+        # Longest videos are not known in advance; chunksize=1 keeps workers busy
+        for n, result in enumerate(pool.imap_unordered(_process_job, jobs, chunksize=1), 1):
+            results.append(result)
+            name = os.path.basename(result.video)
+            if result.error:
+                print(f"[{n}/{len(jobs)}] {name}: FAILED ({result.error})")
+            else:
+                fps = result.frames / result.seconds if result.seconds > 0 else 0.0
+                print(f"[{n}/{len(jobs)}] {name}: {result.frames} frames, "
+                      f"{result.detected} with hand, {fps:.1f} frames/s")
+    elapsed = time.perf_counter() - start
+
+    done = [r for r in results if not r.error]
+    frames = sum(r.frames for r in done)
+    busy = sum(r.seconds for r in results)
+    print(f"\nProcessed {len(done)}/{len(jobs)} videos, {frames} frames in {elapsed:.1f} s")
+    if elapsed > 0 and busy > 0:
+        print(f"Throughput: {frames / elapsed:.1f} frames/s total, "
+              f"{frames / busy:.1f} frames/s per worker, "
+              f"parallel speedup {busy / elapsed:.2f}x on {workers} workers")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch hand-landmark extraction for recorded videos")
+    parser.add_argument('inputs', nargs='+', help='Video files, directories or glob patterns')
+    parser.add_argument('--output', default='batch_output', help='Output directory for .npz files')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes (default: number of cores)')
+    parser.add_argument('--overwrite', action='store_true', help='Reprocess videos with existing output')
+    parser.add_argument('--max-frames', type=int, default=0, help='Frame limit per video (0 = all)')
+    args = parser.parse_args()
+
+    videos = find_videos(args.inputs)
+    if not videos:
+        print("No videos found.")
+        sys.exit(1)
+
+    try:
+        results = run_batch(videos, args.output, max(1, args.workers), args.overwrite, args.max_frames)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    if any(result.error for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
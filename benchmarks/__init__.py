@@ -0,0 +1,2 @@
+# benchmarks/__init__.py
+# Stand-alone performance measurements; run as `python -m benchmarks.<name>`.
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Angle pipeline benchmark on synthetic hand poses.
+
+Uses SyntheticHandGenerator (known ground truth, no camera or MediaPipe) to
+measure:
+  * generator throughput, in poses/s
+  * AngleCalculator throughput on MediaPipe-compatible landmark objects
+  * raw-angle error caused by landmark noise, per finger
+  * servo-angle error of the smoothed stream against the noise-free,
+    unsmoothed servo angles (noise rejection vs smoothing lag)
+
+Usage:
+    python -m benchmarks.angle_pipeline --poses 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from config.settings import FINGER_ANGLE_RANGES, SMOOTH_FACTOR
+from hand_tracking.angle_calculator import AngleCalculator
+from hand_tracking.synthetic_hands import ANGLE_NAMES, SyntheticHandGenerator, to_results
+
+
+def servo_stream(results, smooth_factor: float) -> np.ndarray:
+    """
+    Run AngleCalculator over a stream of results.
+
+    Returns:
+        (N, 6) servo angles, NaN where no hand was detected
+    """
+    calculator = AngleCalculator(FINGER_ANGLE_RANGES, smooth_factor)
+    angles = np.full((len(results), len(ANGLE_NAMES)), np.nan)
+    for i, result in enumerate(results):
+        if result.multi_hand_landmarks:
+            servo = calculator.calculate_servo_angles(result.multi_hand_landmarks[0].landmark)
+            angles[i] = [servo[name] for name in ANGLE_NAMES]
+    return angles
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Angle pipeline benchmark on synthetic poses")
+    parser.add_argument('--poses', type=int, default=1000000, help='Poses for the generator throughput test')
+    parser.add_argument('--frames', type=int, default=20000, help='Frames through AngleCalculator')
+    parser.add_argument('--noise', type=float, nargs='+', default=[0.0, 0.002, 0.005],
+                        help='Landmark noise levels (normalized image units)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    args = parser.parse_args()
+
+    generator = SyntheticHandGenerator(seed=args.seed, noise=0.003, dropout=0.02, handedness=None)
+    start = time.perf_counter()
+    for _ in generator.iter_batches(args.poses):
+        pass
+    elapsed = time.perf_counter() - start
+    print(f"Generator: {args.poses} poses in {elapsed:.2f} s ({args.poses / elapsed:,.0f} poses/s)\n")
+
+    print("AngleCalculator throughput and raw-angle error p95 [deg]")
+    print(f"{'noise':>6} {'poses/s':>9} " + ' '.join(f"{n:>9}" for n in ANGLE_NAMES))
+    for noise in args.noise:
+        poses = SyntheticHandGenerator(seed=args.seed, noise=noise).generate(args.frames)
+        results = to_results(poses)
+        calculator = AngleCalculator(FINGER_ANGLE_RANGES, 0.0)
+        start = time.perf_counter()
+        measured = np.array([list(calculator.calculate_raw_angles(r.multi_hand_landmarks[0].landmark).values())
+                             for r in results])
+        rate = len(results) / (time.perf_counter() - start)
+        error = np.percentile(np.abs(measured - poses.raw_angles), 95, axis=0)
+        print(f"{noise:6.3f} {rate:9,.0f} " + ' '.join(f"{e:9.2f}" for e in error))
+
+    print(f"\nSmoothed stream (SMOOTH_FACTOR={SMOOTH_FACTOR}) vs noise-free servo angles, mean abs error [deg]")
+    print(f"{'noise':>6} {'smooth':>7} " + ' '.join(f"{n:>9}" for n in ANGLE_NAMES))
+    for noise in args.noise:
+        poses = SyntheticHandGenerator(seed=args.seed, noise=noise, dropout=0.02).generate(args.frames, stream=True)
+        clean = poses._replace(points=poses.clean_points, detected=np.ones(len(poses.points), dtype=bool))
+        truth = servo_stream(to_results(clean), 0.0)
+        for smooth in (0.0, SMOOTH_FACTOR):
+            measured = servo_stream(to_results(poses), smooth)
+            error = np.nanmean(np.abs(measured - truth), axis=0)
+            print(f"{noise:6.3f} {smooth:7.2f} " + ' '.join(f"{e:9.2f}" for e in error))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Card-state detection benchmark: per-cell Python loop vs vectorized board.
+
+Compares the original MemoryGameWithCV.detect_cards cell loop (slice, sum,
+scan matched pairs) with memory_game.vision on 4x4 to 10x10 boards, with
+half of the cards already matched.
+
+Usage:
+    python -m benchmarks.board_detection --repeat 200
+"""
+import argparse
+import time
+import numpy as np
+
+from memory_game.vision import cell_fill_ratios, open_cells
+
+BOARD_SIZE = 400
+OPEN_CARD_RATIO = 0.1
+
+
+def make_board(rows: int, cols: int, seed: int = 0):
+    """
+    Build a synthetic threshold image and a half-matched game state.
+
+    Returns:
+        Tuple of (thresh, grid_cells, matched_pairs, matched_mask)
+    """
+    rng = np.random.default_rng(seed)
+    thresh = np.zeros((BOARD_SIZE, BOARD_SIZE), dtype=np.uint8)
+    cell_h, cell_w = BOARD_SIZE // rows, BOARD_SIZE // cols
+
+    grid_cells = []
+    for row in range(rows):
+        for col in range(cols):
+            x1, y1 = col * cell_w, row * cell_h
+            grid_cells.append([x1, y1, x1 + cell_w, y1 + cell_h])
+            if rng.random() < 0.3:
+                thresh[y1 + 4:y1 + cell_h - 4, x1 + 4:x1 + cell_w - 4] = 255
+
+    cells = rng.permutation(len(grid_cells))
+    matched = cells[:len(cells) // 2]
+    matched_pairs = [(f"card_{a}", f"card_{b}") for a, b in zip(matched[0::2], matched[1::2])]
+    matched_mask = np.zeros(len(grid_cells), dtype=bool)
+    matched_mask[matched[:len(matched_pairs) * 2]] = True
+    return thresh, grid_cells, matched_pairs, matched_mask
+
+
+def detect_loop(thresh, grid_cells, matched_pairs):
+    """Original per-cell implementation."""
+    found = []
+    for i, (x1, y1, x2, y2) in enumerate(grid_cells):
+        cell_id = f"card_{i}"
+        if any(cell_id in pair for pair in matched_pairs):
+            continue
+        cell_region = thresh[y1:y2, x1:x2]
+        white_ratio = np.sum(cell_region > 0) / cell_region.size
+        if white_ratio > OPEN_CARD_RATIO:
+            found.append(i)
+    return found
+
+
+def detect_vectorized(thresh, rows, cols, matched_mask):
+    """Whole-board implementation used by board_game.py."""
+    ratios = cell_fill_ratios(thresh, rows, cols)
+    return open_cells(ratios, OPEN_CARD_RATIO, matched_mask).tolist()
+
+
+def _time(func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Card detection benchmark")
+    parser.add_argument('--repeat', type=int, default=200, help='Iterations per measurement')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[4, 6, 8, 10],
+                        help='Board sizes (N for an NxN grid)')
+    args = parser.parse_args()
+
+    print(f"{'board':>7} {'loop [ms]':>10} {'vectorized [ms]':>16} {'speedup':>8}")
+    for n in args.sizes:
+        thresh, grid_cells, matched_pairs, matched_mask = make_board(n, n)
+        expected = detect_loop(thresh, grid_cells, matched_pairs)
+        actual = detect_vectorized(thresh, n, n, matched_mask)
+        assert expected == actual, f"{n}x{n}: results differ"
+
+        loop_time = _time(lambda: detect_loop(thresh, grid_cells, matched_pairs), args.repeat)
+        vec_time = _time(lambda: detect_vectorized(thresh, n, n, matched_mask), args.repeat)
+        print(f"{n:>3}x{n:<3} {loop_time * 1000:10.3f} {vec_time * 1000:16.3f} {loop_time / vec_time:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
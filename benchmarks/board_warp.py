@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Board rectification benchmark: per-frame warpPerspective vs cached remap.
+
+Measures, per frame, the detection path before and after BoardWarp:
+  * preview:  getPerspectiveTransform + warpPerspective every frame
+  * warp:     warpPerspective (BGR) + BGR->gray on the warped board
+  * detect:   BoardWarp.warp (cached BGR remap) + BGR->gray, as board_game.py
+              does to keep a colour board inset
+  * gray:     BoardWarp.warp_gray (gray on the board region + cached remap),
+              for callers that need no colour
+Speedups are relative to warp.
+
+Usage:
+    python -m benchmarks.board_warp --repeat 300
+"""
+import argparse
+import time
+import cv2
+import numpy as np
+
+from memory_game.board_warp import BoardWarp
+
+BOARD_SIZE = 400
+TARGET = np.float32([[0, 0], [BOARD_SIZE, 0], [0, BOARD_SIZE], [BOARD_SIZE, BOARD_SIZE]])
+
+RESOLUTIONS = {
+    '480p': (480, 640),
+    '720p': (720, 1280),
+    '1080p': (1080, 1920),
+}
+
+
+def corners_for(height: int, width: int):
+    """A slightly skewed board covering the middle of the frame."""
+    return [[width * 0.25, height * 0.15], [width * 0.78, height * 0.18],
+            [width * 0.22, height * 0.9], [width * 0.8, height * 0.88]]
+
+
+def _time(func, repeat: int) -> float:
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Board warp benchmark")
+    parser.add_argument('--repeat', type=int, default=300, help='Iterations per measurement')
+    args = parser.parse_args()
+
+    print(f"{'frame':>6} {'preview [ms]':>13} {'warp [ms]':>10} {'detect [ms]':>12} {'speedup':>8} "
+          f"{'gray [ms]':>10} {'speedup':>8}")
+    for name, (height, width) in RESOLUTIONS.items():
+        frame = cv2.GaussianBlur(np.random.randint(0, 255, (height, width, 3), dtype=np.uint8), (9, 9), 0)
+        points = corners_for(height, width)
+        matrix = cv2.getPerspectiveTransform(np.float32(points), TARGET)
+        board_warp = BoardWarp((BOARD_SIZE, BOARD_SIZE))
+        board_warp.set_points(points)
+
+        def preview():
+            m = cv2.getPerspectiveTransform(np.float32(points), TARGET)
+            return cv2.warpPerspective(frame, m, (BOARD_SIZE, BOARD_SIZE))
+
+        def warp():
+            warped = cv2.warpPerspective(frame, matrix, (BOARD_SIZE, BOARD_SIZE))
+            return cv2.cvtColor(warped, cv2.COLOR_BGR2GRAY)
+
+        def detect():
+            return cv2.cvtColor(board_warp.warp(frame), cv2.COLOR_BGR2GRAY)
+
+        def gray():
+            return board_warp.warp_gray(frame)
+
+        for func in (detect, gray):
+            diff = np.abs(warp().astype(np.int16) - func()).max()
+            assert diff <= 4, f"{name}: {func.__name__} differs from warpPerspective by {diff}"
+
+        preview_ms = _time(preview, args.repeat)
+        warp_ms = _time(warp, args.repeat)
+        detect_ms = _time(detect, args.repeat)
+        gray_ms = _time(gray, args.repeat)
+        print(f"{name:>6} {preview_ms:13.3f} {warp_ms:10.3f} {detect_ms:12.3f} {warp_ms / detect_ms:7.1f}x "
+              f"{gray_ms:10.3f} {warp_ms / gray_ms:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Host/board protocol checks against ArduinoEmulator.
+
+Each check drives ArduinoInterface through the emulator the way main.py
+does and asserts on what the emulated board ended up doing, so protocol
+regressions show up without a board attached. Exits non-zero on failure.
+
+Usage:
+    python -m benchmarks.emulator_checks
+"""
+import sys
+import time
+
+from serial_comm.arduino_comm import EMULATOR_PORT, ArduinoInterface
+from serial_comm.emulator import ArduinoEmulator
+from serial_comm.protocol import FINGER_ORDER, SERVO_CHANNELS, format_trajectory
+from utils.tracing import ACK, LatencyTracer
+
+# Seconds to wait for the emulated board; shorter than FLOW_ACK_TIMEOUT, so a
+# lost ack fails a check instead of being papered over by the timeout
+WAIT_TIMEOUT = 1.0
+
+
+def wait_for(condition, timeout: float = WAIT_TIMEOUT) -> bool:
+    """Poll ``condition`` until it holds or ``timeout`` seconds pass."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.001)
+    return True
+
+
+def check_preset_ack(legacy_debug_output: bool):
+    """
+    A preset's ack must open the flow-control window for the next target.
+
+    With ``legacy_debug_output`` the emulator prints moveServoSmooth()'s
+    debug values without a newline, like older sketches, so the ack arrives
+    glued to them ('10001011000ack:0:12').
+    """
+    arduino = ArduinoInterface(EMULATOR_PORT, 115200, flow_window=1)
+    arduino.ser.legacy_debug_output = legacy_debug_output
+    try:
+        arduino.send_preset('open')
+        for angle in (30, 60, 90, 120):
+            assert wait_for(lambda: arduino.in_flight() == 0), "ack of the previous command was lost"
+            arduino.send_move({finger: angle for finger in FINGER_ORDER})
+        assert wait_for(lambda: arduino.in_flight() == 0), "ack of the last target was lost"
+        assert arduino.commands_sent == 5, f"{arduino.commands_sent} commands sent, expected 5"
+        assert arduino.coalesced == 0, f"{arduino.coalesced} targets coalesced"
+        assert arduino.ack_timeouts == 0, f"{arduino.ack_timeouts} ack timeouts"
+        assert set(arduino.ser.positions().values()) == {120}, arduino.ser.positions()
+    finally:
+        arduino.close()
+
+
+def check_preset_drops_pending_target():
+    """
+    A preset must replace a target waiting in the flow-control window, not
+    be overridden by it once the preset's ack releases the window.
+    """
+    arduino = ArduinoInterface(f"{EMULATOR_PORT}:50", 115200, flow_window=1)
+    try:
+        arduino.send_move({finger: 10 for finger in FINGER_ORDER})
+        arduino.send_move({finger: 80 for finger in FINGER_ORDER})  # Waits in the window
+        arduino.send_preset('open')
+        assert wait_for(lambda: arduino.in_flight() == 0), "ack of the preset was lost"
+        arduino.poll_acks()
+        commands = [command.partition('#')[0] for _, command in arduino.ser.commands]
+        assert commands == ['movefingers:10:10:10:10:10:10', 'open'], commands
+        assert arduino.coalesced == 1, f"{arduino.coalesced} targets coalesced, expected 1"
+    finally:
+        arduino.close()
+
+
+def check_traced_preset(legacy_debug_output: bool):
+    """
+    A traced frame that triggers a preset must close with the board's ack,
+    as main.py --trace collects it.
+    """
+    arduino = ArduinoInterface(EMULATOR_PORT, 115200, sequence_numbers=True)
+    arduino.ser.legacy_debug_output = legacy_debug_output
+    tracer = LatencyTracer()
+    try:
+        trace = tracer.begin()
+        arduino.send_preset('pinch', trace)
+        tracer.finish(trace)
+        assert trace.seq is not None, "preset was not tagged on the trace"
+        for seq, board_ms, read_time in arduino.poll_acks():
+            tracer.ack(seq, board_ms, timestamp=read_time)
+        assert trace.time_of(ACK) is not None, "trace has no ack stage"
+    finally:
+        arduino.close()
+
+
+def check_traced_ack_read_time(poll_delay: float = 0.2, max_ack_s: float = 0.05):
+    """
+    A traced ack must be stamped when the reader thread reads it, not when
+    main.py gets round to polling it a frame (or a shutdown sleep) later.
+    """
+    arduino = ArduinoInterface(EMULATOR_PORT, 115200, flow_window=1)  # Starts the reader thread
+    tracer = LatencyTracer()
+    try:
+        trace = tracer.begin()
+        arduino.send_preset('open', trace)
+        tracer.finish(trace)
+        assert wait_for(lambda: arduino.in_flight() == 0), "ack of the preset was lost"
+        time.sleep(poll_delay)
+        for seq, board_ms, read_time in arduino.poll_acks():
+            tracer.ack(seq, board_ms, timestamp=read_time)
+        ack_s = trace.time_of(ACK) - trace.time_of('write')
+        assert ack_s <= max_ack_s, f"ack stamped {ack_s * 1000:.0f} ms after the write"
+    finally:
+        arduino.close()
+
+
+def check_trajectory_stream(segment_ms: int = 40, frames: int = 40, frame_s: float = 0.005):
+    """
+    A trajectory-mode frame stream must leave every servo at the last target.
+
+    Frames ramp from the open hand to a pose with a different angle per
+    finger and then hold it, as main.py keeps sending the current target
+    every frame; the board interpolates each 'traj:' segment on its own.
+    """
+    start = {finger: 90 for finger in FINGER_ORDER}
+    final = {finger: 30 + 20 * i for i, finger in enumerate(FINGER_ORDER)}
+    arduino = ArduinoInterface(EMULATOR_PORT, 115200, trajectory_mode=True, segment_ms=segment_ms)
+    board = arduino.ser
+    try:
+        for frame in range(frames):
+            t = min(1.0, frame / (frames // 2))
+            angles = {finger: round(start[finger] + (final[finger] - start[finger]) * t)
+                      for finger in FINGER_ORDER}
+            arduino.send_finger_angles(angles, update_interval=1, angle_threshold=2)
+            time.sleep(frame_s)
+        expected = dict(zip(SERVO_CHANNELS, (final[finger] for finger in FINGER_ORDER)))
+        assert wait_for(lambda: board.positions() == expected), \
+            f"servos at {board.positions()}, expected {expected}"
+
+        commands = [command for _, command in board.commands]
+        assert commands, "no segments reached the board"
+        assert all(command.startswith('traj:') for command in commands), commands
+        assert len(commands) < frames, f"{len(commands)} segments for {frames} frames"
+        last = format_trajectory(final, segment_ms).strip()
+        assert commands[-1].startswith(last), f"last segment {commands[-1]!r}, expected {last!r}"
+    finally:
+        arduino.close()
+
+
+def check_throttle_recovers_after_reset(ack_timeout: float = 0.3, frame_s: float = 0.01):
+    """
+    Throttling must end once the board has been silent for ``ack_timeout``.
+
+    A reset board has telemetry off and never acks the commands that were
+    in flight, so without a resync every later update is throttled.
+    """
+    arduino = ArduinoInterface(EMULATOR_PORT, 115200, telemetry_ms=20, ack_timeout=ack_timeout)
+    try:
+        def stream(frames, start):
+            for frame in range(frames):
+                angle = (start + frame) % 180
+                arduino.send_finger_angles({finger: angle for finger in FINGER_ORDER},
+                                           update_interval=1, angle_threshold=0)
+                time.sleep(frame_s)
+
+        stream(10, 0)
+        assert arduino.ser.commands, "nothing sent before the reset"
+        frames = arduino.monitor.frames
+        arduino.ser = ArduinoEmulator()  # Reset: telemetry off, acks of in-flight commands lost
+        stream(int(3 * ack_timeout / frame_s), 10)
+        # A few updates still go out until telemetry counts as stale; later
+        # ones must too, once the silence has lasted ack_timeout
+        late = [command for t, command in arduino.ser.commands
+                if t > ack_timeout and command.startswith('movefingers')]
+        assert late, f"{arduino.throttled} updates throttled, none sent after the board went silent"
+        assert arduino.monitor.resyncs >= 1, "monitor was not resynced"
+        assert arduino.ser.telemetry_interval_ms == 20, "telemetry was not requested again"
+        assert wait_for(lambda: arduino.monitor.frames > frames), "no telemetry from the reset board"
+        assert wait_for(lambda: not arduino.monitor.is_behind(arduino.last_sequence)), \
+            "board still counts as behind after the resync"
+    finally:
+        arduino.close()
+
+
+CHECKS = [
+    ("preset ack opens the flow-control window", lambda: check_preset_ack(False)),
+    ("preset ack after unterminated debug output", lambda: check_preset_ack(True)),
+    ("preset drops the target waiting in the window", check_preset_drops_pending_target),
+    ("traced preset closes with its ack", lambda: check_traced_preset(False)),
+    ("traced preset closes after unterminated debug output", lambda: check_traced_preset(True)),
+    ("traced ack is stamped when read, not when polled", check_traced_ack_read_time),
+    ("trajectory stream ends at the last target", check_trajectory_stream),
+    ("throttling recovers after a board reset", check_throttle_recovers_after_reset),
+]
+
+
+def main() -> int:
+    failed = 0
+    for name, check in CHECKS:
+        try:
+            check()
+        except AssertionError as e:
+            failed += 1
+            print(f"FAIL  {name}: {e}")
+        else:
+            print(f"ok    {name}")
+    print(f"\n{len(CHECKS) - failed}/{len(CHECKS)} checks passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Card-flip detection benchmark on a synthetic board sequence.
+
+The sequence contains real flips (cards turned face-up and left open) and a
+dark "hand" sweeping over the board for a few frames. Compares:
+  * per-frame: threshold the whole board every frame, flip on the first
+    frame a cell exceeds the open ratio (original detect_cards)
+  * tracker:   CellFlipTracker (change detection + N-frame hysteresis)
+
+Usage:
+    python -m benchmarks.flip_tracking --frames 600
+"""
+import argparse
+import time
+import cv2
+import numpy as np
+
+from memory_game.flip_tracker import CellFlipTracker
+from memory_game.vision import cell_fill_ratios
+
+BOARD_SIZE = 400
+OPEN_CARD_RATIO = 0.1
+
+
+def make_sequence(frames: int, rows: int, cols: int, seed: int = 0):
+    """
+    Build the synthetic sequence.
+
+    Returns:
+        (list of grayscale boards, number of real flips)
+    """
+    rng = np.random.default_rng(seed)
+    cell_h, cell_w = BOARD_SIZE // rows, BOARD_SIZE // cols
+    base = np.full((BOARD_SIZE, BOARD_SIZE), 200, dtype=np.uint8)
+    flip_frames = {int(f): int(c) for f, c in zip(np.linspace(20, frames - 40, 6),
+                                                  rng.choice(rows * cols, 6, replace=False))}
+    sweeps = range(frames // 3, frames - 20, frames // 3)
+
+    sequence = []
+    for frame_no in range(frames):
+        if frame_no in flip_frames:
+            row, col = divmod(flip_frames[frame_no], cols)
+            y, x = row * cell_h, col * cell_w
+            cv2.putText(base, "A", (x + cell_w // 4, y + cell_h * 3 // 4), cv2.FONT_HERSHEY_SIMPLEX,
+                        cell_h / 40, 30, max(2, cell_h // 8))
+        board = base.copy()
+        for start in sweeps:
+            if start <= frame_no < start + 3:
+                # Hand passing over: dark blob moving across the board
+                x = (frame_no - start) * BOARD_SIZE // 3
+                cv2.ellipse(board, (x + 60, BOARD_SIZE // 2), (70, 120), 0, 0, 360, 60, -1)
+        noise = rng.normal(0, 2, board.shape)
+        sequence.append(np.clip(board + noise, 0, 255).astype(np.uint8))
+    return sequence, len(flip_frames)
+
+
+def run_per_frame(sequence, rows, cols):
+    is_open = np.zeros(rows * cols, dtype=bool)
+    flips = 0
+    for gray in sequence:
+        blurred = cv2.GaussianBlur(gray, (5, 5), 0)
+        _, thresh = cv2.threshold(blurred, 150, 255, cv2.THRESH_BINARY_INV)
+        now_open = cell_fill_ratios(thresh, rows, cols).ravel() > OPEN_CARD_RATIO
+        flips += int(np.count_nonzero(now_open & ~is_open))
+        is_open = now_open
+    return flips, rows * cols
+
+
+def run_tracker(sequence, rows, cols, confirm_frames):
+    tracker = CellFlipTracker(rows, cols, OPEN_CARD_RATIO, confirm_frames)
+    flips = 0
+    evaluated = 0
+    for gray in sequence:
+        flips += len(tracker.update(gray))
+        evaluated += tracker.evaluated_cells
+    return flips, evaluated / len(sequence)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Card-flip tracking benchmark")
+    parser.add_argument('--frames', type=int, default=600, help='Frames in the sequence')
+    parser.add_argument('--confirm-frames', type=int, default=5, help='Tracker hysteresis')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[4, 8], help='Grid sizes (N x N)')
+    args = parser.parse_args()
+
+    print(f"{'grid':>5} {'method':>10} {'ms/frame':>9} {'cells/frame':>12} {'flips':>6} {'true':>5}")
+    for size in args.sizes:
+        sequence, true_flips = make_sequence(args.frames, size, size)
+        for name, run in (('per-frame', lambda: run_per_frame(sequence, size, size)),
+                          ('tracker', lambda: run_tracker(sequence, size, size, args.confirm_frames))):
+            start = time.perf_counter()
+            flips, cells = run()
+            ms = (time.perf_counter() - start) / len(sequence) * 1000
+            print(f"{size:>2}x{size:<2} {name:>10} {ms:9.3f} {cells:12.1f} {flips:6d} {true_flips:5d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Flow-control benchmark on an emulated slow board.
+
+Streams targets at a fixed frame rate to ArduinoEmulator with ``command_ms``
+set, so the board blocks on every command like moveServoSmooth() does. It
+compares writing every target with windowed flow control. The age of each
+target when the board has finished applying it (when it sends the ack) is
+the servo lag. Without a window this
+lag grows for as long as the host outpaces the board. With one, it stays
+bounded by the window.
+
+Usage:
+    python -m benchmarks.flow_control --fps 30 --command-ms 80 --seconds 5
+"""
+import argparse
+import contextlib
+import io
+import time
+
+import numpy as np
+
+from serial_comm.arduino_comm import EMULATOR_PORT, ArduinoInterface
+from serial_comm.protocol import FINGER_ORDER, SEQUENCE_SEPARATOR
+
+
+def frame_angles(index: int):
+    """Target for frame ``index``; the first two fingers encode the index."""
+    angles = {finger: 90 for finger in FINGER_ORDER}
+    angles[FINGER_ORDER[0]] = index % 180
+    angles[FINGER_ORDER[1]] = (index // 180) % 180
+    return angles
+
+
+def frame_index(command: str) -> int:
+    """Recover the frame index from an applied movefingers command."""
+    values = command.partition(SEQUENCE_SEPARATOR)[0].split(':')[1:]
+    return int(values[1]) * 180 + int(values[0])
+
+
+def run(window: int, fps: float, command_ms: float, seconds: float) -> dict:
+    """
+    Stream frames for ``seconds`` and measure the lag of every applied target.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):  # Keep connection messages out of the table
+        arduino = ArduinoInterface(f"{EMULATOR_PORT}:{command_ms:g}", 115200, flow_window=window)
+    board = arduino.ser
+    frame_times = []
+    start = time.monotonic()
+    for index in range(int(seconds * fps)):
+        deadline = start + index / fps
+        while time.monotonic() < deadline:
+            arduino.poll_acks()  # Lets the emulated board run when no reader thread does
+            time.sleep(0.001)
+        frame_times.append(time.monotonic() - board.epoch)
+        arduino.send_move(frame_angles(index))
+    end = time.monotonic() - board.epoch
+
+    # board.commands holds start times; the move is done command_ms later
+    done = command_ms / 1000
+    applied = [(t + done, frame_index(command)) for t, command in board.commands
+               if command.startswith('movefingers')]
+    lag_ms = np.array([(t - frame_times[index]) * 1000 for t, index in applied])
+    # Age of the pose the hand is in when streaming stops
+    final_ms = (end - frame_times[applied[-1][1]]) * 1000 if applied else float('nan')
+    stats = {
+        'sent': arduino.commands_sent,
+        'applied': len(applied),
+        'coalesced': arduino.coalesced,
+        'backlog': board.pending_commands,
+        'lag_p50': np.percentile(lag_ms, 50),
+        'lag_p95': np.percentile(lag_ms, 95),
+        'lag_max': lag_ms.max(),
+        'final': final_ms,
+    }
+    arduino.stop_reader()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Flow-control benchmark on an emulated slow board")
+    parser.add_argument('--fps', type=float, default=30.0, help='Host frame rate')
+    parser.add_argument('--command-ms', type=float, default=80.0, help='Board busy time per command')
+    parser.add_argument('--seconds', type=float, default=5.0, help='Streaming time per run')
+    parser.add_argument('--windows', type=int, nargs='+', default=[0, 1, 2, 4],
+                        help='Flow-control windows to compare (0 = write every target)')
+    args = parser.parse_args()
+
+    print(f"{args.fps:g} fps host, board busy {args.command_ms:g} ms per command, {args.seconds:g} s\n")
+    print(f"{'window':>6} {'sent':>6} {'applied':>7} {'coalesced':>9} {'backlog':>7} "
+          f"{'lag p50':>8} {'lag p95':>8} {'lag max':>8} {'final':>8}  [ms]")
+    for window in args.windows:
+        s = run(window, args.fps, args.command_ms, args.seconds)
+        print(f"{window if window else 'off':>6} {s['sent']:6d} {s['applied']:7d} {s['coalesced']:9d} "
+              f"{s['backlog']:7d} {s['lag_p50']:8.0f} {s['lag_p95']:8.0f} {s['lag_max']:8.0f} {s['final']:8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Frame handoff benchmark: SharedFrameRing vs multiprocessing.Queue.
+
+A producer process publishes frames at a fixed rate and the main process
+consumes them, measuring producer-side cost per frame, consumer-side cost
+per frame and capture-to-consumer latency at 720p and 1080p.
+
+Usage:
+    python -m benchmarks.frame_handoff --frames 300 --fps 60
+"""
+import argparse
+import multiprocessing as mp
+import time
+import numpy as np
+from queue import Empty
+
+from capture.frame_ring import SharedFrameRing
+
+RESOLUTIONS = {
+    '720p': (720, 1280, 3),
+    '1080p': (1080, 1920, 3),
+}
+
+
+def _pace(start: float, index: int, fps: float):
+    """Sleep until the scheduled time of frame ``index``."""
+    delay = start + index / fps - time.perf_counter()
+    if delay > 0:
+        time.sleep(delay)
+
+
+def _ring_producer(spec, frames: int, fps: float, costs):
+    ring = SharedFrameRing.attach(spec)
+    source = np.random.randint(0, 255, spec.shape, dtype=np.uint8)
+    start = time.perf_counter()
+    total = 0.0
+    for i in range(frames):
+        _pace(start, i, fps)
+        t0 = time.perf_counter()
+        # Stand-in for cap.read(view): the capture writes straight into the slot
+        slot, view = ring.begin_write()
+        np.copyto(view, source)
+        ring.commit(slot, t0)
+        total += time.perf_counter() - t0
+    costs.put(total / frames)
+    ring.close()
+
+
+def _queue_producer(queue, shape, frames: int, fps: float, costs):
+    source = np.random.randint(0, 255, shape, dtype=np.uint8)
+    start = time.perf_counter()
+    total = 0.0
+    for i in range(frames):
+        _pace(start, i, fps)
+        t0 = time.perf_counter()
+        # cap.read() returns a new array, which is then pickled into the queue
+        frame = source.copy()
+        queue.put((t0, frame))
+        total += time.perf_counter() - t0
+    queue.put(None)
+    costs.put(total / frames)
+
+
+def _summary(name: str, latencies, consumer_cost: float, producer_cost: float, frames: int):
+    latencies = np.array(latencies) * 1000
+    print(f"  {name:<8} received {len(latencies):4d}/{frames}  "
+          f"producer {producer_cost * 1000:6.2f} ms/frame  "
+          f"consumer {consumer_cost * 1000:6.2f} ms/frame  "
+          f"latency p50 {np.percentile(latencies, 50):6.2f} ms  "
+          f"p95 {np.percentile(latencies, 95):6.2f} ms")
+
+
+def bench_ring(shape, frames: int, fps: float, slots: int = 4):
+    """
+    Measure handoff through a SharedFrameRing.
+    """
+    ring = SharedFrameRing(shape, slots=slots)
+    costs = mp.Queue()
+    producer = mp.Process(target=_ring_producer, args=(ring.spec, frames, fps, costs))
+    producer.start()
+
+    latencies = []
+    consumer_time = 0.0
+    checksum = 0
+    last = -1
+    while last < frames - 1 and (producer.is_alive() or ring.frames_written - 1 > last):
+        t0 = time.perf_counter()
+        item = ring.read_latest(after=last)
+        if item is None:
+            time.sleep(0.0002)
+            continue
+        # Touch the view the way inference would read it
+        checksum = int(item.frame[::32, ::32, 0].sum())
+        if ring.is_valid(item):
+            now = time.perf_counter()
+            latencies.append(now - item.timestamp)
+            consumer_time += now - t0
+        last = item.frame_number
+
+    producer.join()
+    _summary('ring', latencies, consumer_time / max(len(latencies), 1), costs.get(), frames)
+    ring.close()
+    return checksum
+
+
+def bench_queue(shape, frames: int, fps: float):
+    """
+    Measure handoff through a multiprocessing.Queue.
+    """
+    queue = mp.Queue(maxsize=4)
+    costs = mp.Queue()
+    producer = mp.Process(target=_queue_producer, args=(queue, shape, frames, fps, costs))
+    producer.start()
+
+    latencies = []
+    consumer_time = 0.0
+    checksum = 0
+    while True:
+        t0 = time.perf_counter()
+        try:
+            item = queue.get_nowait()
+        except Empty:
+            time.sleep(0.0002)
+            continue
+        if item is None:
+            break
+        timestamp, frame = item
+        checksum = int(frame[::32, ::32, 0].sum())
+        now = time.perf_counter()
+        latencies.append(now - timestamp)
+        consumer_time += now - t0
+
+    producer.join()
+    _summary('queue', latencies, consumer_time / max(len(latencies), 1), costs.get(), frames)
+    return checksum
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Frame handoff benchmark")
+    parser.add_argument('--frames', type=int, default=300, help='Frames per run')
+    parser.add_argument('--fps', type=float, default=60.0, help='Producer frame rate')
+    parser.add_argument('--slots', type=int, default=4, help='Ring slots')
+    parser.add_argument('--resolution', choices=sorted(RESOLUTIONS), action='append',
+                        help='Resolution to test (default: all)')
+    args = parser.parse_args()
+
+    for name in args.resolution or ['720p', '1080p']:
+        shape = RESOLUTIONS[name]
+        print(f"\n{name} {shape[1]}x{shape[0]} @ {args.fps:.0f} fps, {args.frames} frames")
+        bench_queue(shape, args.frames, args.fps)
+        bench_ring(shape, args.frames, args.fps, args.slots)
+
+
+if __name__ == "__main__":
+    main()
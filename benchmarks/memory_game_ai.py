@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Memory game AI benchmark: list-scanning turn decision vs indexed policy.
+
+Both versions decide one AI turn (first and second card) on a board where
+half of the pairs are matched and one card of every remaining pair has been
+seen, i.e. the AI has no known pair and must pick unseen cards:
+  * scan:    the original ai_move logic (scans matched_pairs for every card)
+  * indexed: PerfectMemoryPolicy on MemoryGameEngine
+
+Usage:
+    python -m benchmarks.memory_game_ai --sizes 4 8 16 32
+"""
+import argparse
+import random
+import time
+
+from memory_game.engine import MemoryGameEngine
+from memory_game.policies import PerfectMemoryPolicy
+
+
+def make_state(size: int, seed: int = 0):
+    """Play a size x size board to the benchmark position."""
+    rng = random.Random(seed)
+    engine = MemoryGameEngine(size, size, rng=rng)
+    policy = PerfectMemoryPolicy(random.Random(seed))
+    engine.observers.append(policy)
+
+    cells_by_label = {}
+    for cell, label in enumerate(engine.labels):
+        cells_by_label.setdefault(label, []).append(cell)
+    labels = sorted(cells_by_label)
+    half = len(labels) // 2
+
+    for label in labels[:half]:
+        first, second = cells_by_label[label]
+        engine.reveal(first)
+        engine.reveal(second)
+    for label in labels[half:]:
+        policy.observe(cells_by_label[label][0], label)
+
+    # The same position in the original representation
+    matched_pairs = [tuple(f"card_{cell}" for cell in cells_by_label[label]) for label in labels[:half]]
+    card_labels = {f"card_{cell}": label for cell, label in enumerate(engine.labels)}
+    ai_memory = {label: [f"card_{cells_by_label[label][0]}"] for label in labels[half:]}
+    legacy = (size * size, matched_pairs, card_labels, ai_memory)
+    return engine, policy, legacy
+
+
+def decide_scan(num_cells, matched_pairs, card_labels, ai_memory):
+    """Original MemoryGameWithCV.ai_move card selection."""
+    known_pairs = []
+    for label, cards in ai_memory.items():
+        unique_cards = [card for card in cards if not any(card in pair for pair in matched_pairs)]
+        if len(unique_cards) >= 2:
+            known_pairs.append(unique_cards[:2])
+    if known_pairs:
+        return random.choice(known_pairs)
+    available_cards = [f"card_{i}" for i in range(num_cells)
+                       if f"card_{i}" not in [card for pair in matched_pairs for card in pair]]
+    return random.sample(available_cards, 2)
+
+
+def decide_indexed(engine, policy):
+    first = policy.choose_first(engine)
+    return first, policy.choose_second(engine, first, engine.labels[first])
+
+
+def _time(func, min_time: float) -> float:
+    func()
+    count = 0
+    start = time.perf_counter()
+    while True:
+        func()
+        count += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return elapsed / count * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory game AI benchmark")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[4, 8, 16, 32],
+                        help='Board sizes (N for an N x N grid)')
+    parser.add_argument('--min-time', type=float, default=0.5, help='Seconds per measurement')
+    args = parser.parse_args()
+
+    print(f"{'board':>7} {'scan [us]':>11} {'indexed [us]':>13} {'speedup':>9}")
+    for size in args.sizes:
+        engine, policy, legacy = make_state(size)
+        scan_us = _time(lambda: decide_scan(*legacy), args.min_time)
+        indexed_us = _time(lambda: decide_indexed(engine, policy), args.min_time)
+        print(f"{size:>3}x{size:<3} {scan_us:11.1f} {indexed_us:13.2f} {scan_us / indexed_us:8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Hand-presence gate benchmark: idle cost, skipped detector runs and wake-up latency.
+
+Replays a frame sequence through PresenceGate. The hand detector is replaced
+by ground truth ("hand present in this frame"), so the numbers show the
+gate alone:
+  * ms/frame of the gate while idle
+  * fraction of frames on which the detector would have run
+  * wake-up latency: frames from a hand appearing to the gate passing it on
+  * false wake-ups while nobody is present
+
+The default sequence is synthetic: a static noisy scene into which a
+skin-coloured hand slides from the edge, stays, and leaves again. A recorded
+session can be replayed instead. Ground truth then comes from the
+``detected`` column of the batch_process.py output for that video:
+
+    python -m benchmarks.presence_gate
+    python -m benchmarks.presence_gate --video session.mp4 --landmarks batch_output/session.npz
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from hand_tracking.presence_gate import PresenceGate
+
+WIDTH, HEIGHT = 640, 480
+SKIN_BGR = (120, 150, 200)
+
+
+def make_sequence(frames: int, visits: int, seed: int = 0):
+    """
+    Build the synthetic scene.
+
+    Returns:
+        (list of BGR frames, bool array of hand presence)
+    """
+    rng = np.random.default_rng(seed)
+    scene = cv2.GaussianBlur((rng.random((HEIGHT, WIDTH, 3)) * 120 + 40).astype(np.uint8), (0, 0), 8)
+    present = np.zeros(frames, dtype=bool)
+    slots = np.linspace(0, frames, visits + 1).astype(int)
+    sequence = []
+    for frame_no in range(frames):
+        image = scene.copy()
+        for start, end in zip(slots[:-1], slots[1:]):
+            # Hand enters halfway through the slot and leaves before its end
+            enter, leave = (start + end) // 2, end - (end - start) // 8
+            if enter <= frame_no < leave:
+                slide = min(1.0, (frame_no - enter + 1) / 6)
+                x = int(-80 + slide * (WIDTH // 2 + 80))
+                cv2.ellipse(image, (x, HEIGHT // 2), (70, 110), 0, 0, 360, SKIN_BGR, -1)
+                present[frame_no] = True
+        noise = rng.normal(0, 3, image.shape)
+        sequence.append(np.clip(image + noise, 0, 255).astype(np.uint8))
+    return sequence, present
+
+
+def load_recording(video: str, landmarks: str):
+    """
+    Load a recorded video and the hand-presence ground truth from batch_process.py.
+
+    Returns:
+        (list of BGR frames, bool array of hand presence)
+    """
+    from capture.frame_source import VideoFileSource
+
+    present = np.load(landmarks)['detected']
+    with VideoFileSource(video) as source:
+        sequence = [frame.image for _, frame in zip(range(len(present)), source)]
+    return sequence, present[:len(sequence)]
+
+
+def replay(sequence, present, config=None):
+    """
+    Run the gate over a sequence with ground truth standing in for the detector.
+
+    Returns:
+        Dictionary of results
+    """
+    gate = PresenceGate(config)
+    detector_runs = 0
+    gate_time = 0.0
+    idle_checks = 0
+    latencies = []
+    false_wakes = 0
+    missed = 0
+    appeared_at = None
+
+    for frame_no, (image, hand) in enumerate(zip(sequence, present)):
+        if hand and (frame_no == 0 or not present[frame_no - 1]):
+            missed += appeared_at is not None
+            appeared_at = frame_no
+        was_idle = gate.idle
+        start = time.perf_counter()
+        run = gate.check(image)
+        if was_idle:
+            gate_time += time.perf_counter() - start
+            idle_checks += 1
+        if not run:
+            continue
+        detector_runs += 1
+        if was_idle and not gate.idle and not hand:
+            false_wakes += 1
+        gate.report(bool(hand))
+        if hand and appeared_at is not None:
+            latencies.append(frame_no - appeared_at)
+            appeared_at = None
+
+    return {
+        'frames': len(sequence),
+        'detector_runs': detector_runs,
+        'idle_ms': gate_time / idle_checks * 1000 if idle_checks else 0.0,
+        'latencies': latencies,
+        'missed': missed + (appeared_at is not None),
+        'false_wakes': false_wakes,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hand-presence gate benchmark")
+    parser.add_argument('--frames', type=int, default=900, help='Synthetic sequence length')
+    parser.add_argument('--visits', type=int, default=6, help='Times the synthetic hand appears')
+    parser.add_argument('--video', help='Recorded video to replay instead of the synthetic scene')
+    parser.add_argument('--landmarks', help='batch_process.py output of --video (ground truth)')
+    parser.add_argument('--idle-after', type=int, default=30, help='Frames without a hand before idling')
+    args = parser.parse_args()
+
+    if args.video:
+        if not args.landmarks:
+            parser.error('--video needs --landmarks for the ground truth')
+        sequence, present = load_recording(args.video, args.landmarks)
+    else:
+        sequence, present = make_sequence(args.frames, args.visits)
+
+    result = replay(sequence, present, {'idle_after': args.idle_after})
+    latencies = np.array(result['latencies'])
+    print(f"Frames:               {result['frames']} ({int(present.sum())} with a hand)")
+    print(f"Detector runs:        {result['detector_runs']} "
+          f"({result['detector_runs'] / max(1, result['frames']):.0%} of frames)")
+    print(f"Gate cost while idle: {result['idle_ms']:.3f} ms/frame")
+    if len(latencies):
+        print(f"Wake-up latency:      mean {latencies.mean():.2f} frames, max {latencies.max()} frames "
+              f"over {len(latencies)} appearances")
+    print(f"Missed appearances:   {result['missed']}")
+    print(f"False wake-ups:       {result['false_wakes']}")
+
+
+if __name__ == "__main__":
+    main()
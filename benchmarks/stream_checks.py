@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Stream publisher checks on localhost.
+
+Publishes synthetic frames through StreamPublisher and asserts on what a
+StreamSubscriber receives, so conflation regressions show up without a
+camera. Exits non-zero on failure.
+
+Usage:
+    python -m benchmarks.stream_checks
+"""
+import sys
+import threading
+import time
+
+import numpy as np
+
+from serial_comm.protocol import FINGER_ORDER
+from streaming.framing import Hand
+from streaming.publisher import StreamPublisher
+from streaming.subscriber import StreamSubscriber
+
+ADDRESS = 'tcp:127.0.0.1:8766'
+
+
+def check_slow_subscriber_staleness(fps: float = 30.0, records_per_s: float = 10.0, seconds: float = 10.0,
+                                    max_age_s: float = 5.0, max_growth_s: float = 1.5):
+    """
+    A subscriber reading slower than the publisher must see records of
+    bounded age: conflation keeps it current instead of queueing. Without
+    it the age grows by about two thirds of a second every second here.
+    """
+    publisher = StreamPublisher(ADDRESS)
+    publisher.start()
+    stop = threading.Event()
+    angles = {finger: 90 for finger in FINGER_ORDER}
+    hands = [Hand(np.zeros((21, 3), dtype=np.float32), 'Right', 0.9)]
+
+    def publish():
+        while not stop.is_set():
+            publisher.publish(angles, hands)
+            time.sleep(1 / fps)
+
+    thread = threading.Thread(target=publish, daemon=True)
+    thread.start()
+    subscriber = StreamSubscriber(ADDRESS)
+    ages = []  # (seconds since subscribing, record age) pairs
+    try:
+        start = time.monotonic()
+        for frame in subscriber:
+            elapsed = time.monotonic() - start
+            ages.append((elapsed, time.time() - frame.timestamp))
+            if elapsed > seconds:
+                break
+            time.sleep(1 / records_per_s)
+    finally:
+        stop.set()
+        thread.join()
+        subscriber.close()
+        publisher.close()
+
+    early = np.median([age for t, age in ages if 0.2 * seconds <= t < 0.5 * seconds])
+    late = np.median([age for t, age in ages if t >= 0.7 * seconds])
+    worst = max(age for _, age in ages)
+    assert late - early <= max_growth_s, \
+        f"record age grew from {early:.1f} s to {late:.1f} s: records are queued, not conflated"
+    assert worst <= max_age_s, f"records up to {worst:.1f} s old"
+
+
+CHECKS = [
+    ("slow subscriber sees records of bounded age", check_slow_subscriber_staleness),
+]
+
+
+def main() -> int:
+    failed = 0
+    for name, check in CHECKS:
+        try:
+            check()
+        except AssertionError as e:
+            failed += 1
+            print(f"FAIL  {name}: {e}")
+        else:
+            print(f"ok    {name}")
+    print(f"\n{len(CHECKS) - failed}/{len(CHECKS)} checks passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,40 +4,75 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from PIL import Image, ImageTk
 import time
-import random
 import os
 
+from capture.frame_source import open_frame_source
+from config.settings import CAMERA_SOURCE, CAMERA_CONFIG
+from memory_game.board_warp import BoardWarp
+from memory_game.engine import AI, FIRST, IGNORED, MATCH, PLAYER, MemoryGameEngine
+from memory_game.flip_tracker import CellFlipTracker
+from memory_game.policies import PerfectMemoryPolicy
+from memory_game.vision_worker import BoardVisionWorker
+
+# Açık kart için hücredeki minimum beyaz piksel oranı (ortama göre ayarlayın)
+OPEN_CARD_RATIO = 0.1
+
+# Kart açılışının sayılması için gereken ardışık kare sayısı (elin geçişi gibi
+# kısa süreli değişiklikler yok sayılır)
+FLIP_CONFIRM_FRAMES = 5
+
+# Düzleştirilmiş oyun alanının boyutu (piksel)
+BOARD_SIZE = 400
+
+# UI'nın yeni kare olup olmadığını kontrol etme aralığı (ms)
+DISPLAY_POLL_MS = 15
+
 class MemoryGameWithCV:
-    def __init__(self, root):
+    def __init__(self, root, grid_rows=4, grid_cols=4, card_index=None, source=CAMERA_SOURCE):
         self.root = root
         self.root.title("Hafıza Oyunu")
         self.root.geometry("1200x800")
         self.root.configure(bg="#f0f0f0")
         
         # Oyun ayarları
-        self.card_pairs = 8  # 8 çift = 16 kart
         self.card_positions = []  # Kartların koordinatları [x1, y1, x2, y2]
-        self.detected_cards = []  # Tespit edilen açık kartlar
-        self.matched_pairs = []  # Eşleşen çiftler
-        self.card_labels = {}  # Kart etiketleri (çiftleri belirlemek için)
-        
-        # Oyuncu bilgileri
-        self.current_player = "player"  # "player" veya "ai"
-        self.player_score = 0
-        self.ai_score = 0
+        self.detected_cards = set()  # Tespit edilen açık kartlar
+        self.matched_mask = np.zeros(0, dtype=bool)  # Hücre bazında eşleşmiş kart maskesi
         self.last_flipped_card = None
-        self.ai_memory = {}  # Yapay zekanın hafızası {label: [positions]}
         
         # Kamera ayarları
+        self.source = source  # Kamera indeksi, video dosyası, görüntü klasörü veya 'synthetic'
         self.camera = None
         self.is_running = False
         self.frame = None
+        self.vision_worker = None
+        self.shown_frame_number = 0
+        self.photo_image = None  # Her karede yeniden kullanılan görüntü tamponu
         
         # Kartların yerleşimi için grid oluşturma
-        self.grid_rows = 4
-        self.grid_cols = 4
+        # (kart çifti sayısı hücre sayısından türetilir; tek hücre boş kalır)
+        self.grid_rows = grid_rows
+        self.grid_cols = grid_cols
         self.grid_cells = []  # [[x1,y1,x2,y2], ...] - Her hücre için koordinatlar
         
+        # Oyun kuralları, skorlar ve kart etiketleri arayüzden bağımsız motorda tutulur;
+        # yapay zeka motoru gözlemci olarak izler ve açılan her kartı hatırlar
+        self.engine = MemoryGameEngine(self.grid_rows, self.grid_cols)
+        self.ai_policy = PerfectMemoryPolicy()
+        self.engine.observers.append(self.ai_policy)
+        
+        # Kart yüzü tanıma dizini (memory_game.card_index); yoksa etiketler rastgele kalır
+        self.card_index = card_index
+        if card_index is not None and len(card_index.faces) != self.engine.num_pairs:
+            print(f"Uyarı: dizinde {len(card_index.faces)} kart yüzü var, "
+                  f"ızgara {self.engine.num_pairs} çift gerektiriyor")
+        
+        # Perspektif dönüşümü ve remap tabloları; sadece köşe noktaları değişince yeniden hesaplanır
+        self.board_warp = BoardWarp((BOARD_SIZE, BOARD_SIZE))
+        
+        # Hücre bazında değişim takibi; sadece değişen hücreler yeniden değerlendirilir
+        self.flip_tracker = None
+        
         # Arayüz oluşturma
         self.create_ui()
         
@@ -102,13 +137,18 @@ class MemoryGameWithCV:
         if self.is_running:
             return
         
-        self.camera = cv2.VideoCapture(0)
+        self.camera = open_frame_source(self.source, **CAMERA_CONFIG)
         if not self.camera.isOpened():
             messagebox.showerror("Hata", "Kamera açılamadı!")
             return
         
         self.is_running = True
         self.start_button.config(text="Durdur", command=self.stop_game)
+        
+        # Kamera okuma ve görüntü işleme arka plan iş parçacığında çalışır
+        self.vision_worker = BoardVisionWorker(self.camera, self.process_frame)
+        self.vision_worker.start()
+        self.shown_frame_number = 0
         self.update_camera()
         
         self.status_label.config(text="Kartları masaya yerleştirin ve kalibrasyon yapın.")
@@ -116,65 +156,102 @@ class MemoryGameWithCV:
     def stop_game(self):
         """Oyunu ve kamerayı durdurur"""
         self.is_running = False
+        if self.vision_worker:
+            self.vision_worker.stop()
+            self.vision_worker = None
         if self.camera:
             self.camera.release()
         self.start_button.config(text="Başlat", command=self.start_game)
         self.status_label.config(text="Oyun durduruldu.")
     
+    def process_frame(self, frame):
+        """Kareyi işler (arka plan iş parçacığında çalışır)
+        
+        Returns:
+            (işaretlenmiş kare, açılan kart hücre indeksleri)
+        """
+        self.frame = frame.copy()
+        events = []
+        
+        # Eğer kalibrasyon yapılıyorsa
+        if self.is_calibrating:
+            # Kalibrasyon noktalarını göster
+            for i, point in enumerate(list(self.calibration_points)):
+                cv2.circle(frame, (point[0], point[1]), 5, (0, 255, 0), -1)
+                cv2.putText(frame, str(i+1), (point[0] + 10, point[1]), 
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
+            
+            # Eğer tüm ızgara noktaları kalibre edildiyse, ızgarayı çiz
+            if len(self.calibration_points) == 4:
+                width, height = BOARD_SIZE, BOARD_SIZE
+                self.board_warp.set_points(self.calibration_points[:4])
+                warped = self.board_warp.warp(frame)
+                
+                # Izgara çizgileri
+                cell_height = height // self.grid_rows
+                cell_width = width // self.grid_cols
+                
+                for i in range(self.grid_rows + 1):
+                    y = i * cell_height
+                    cv2.line(warped, (0, y), (width, y), (0, 255, 0), 2)
+                
+                for i in range(self.grid_cols + 1):
+                    x = i * cell_width
+                    cv2.line(warped, (x, 0), (x, height), (0, 255, 0), 2)
+                
+                # Warped görüntüyü ana kare içine yerleştir
+                h, w = frame.shape[:2]
+                offset_x, offset_y = 50, 50
+                frame[offset_y:offset_y+height, offset_x:offset_x+width] = warped
+        
+        # Eğer oyun aktifse, kart tespiti yap
+        elif self.grid_cells and self.engine.current_player == PLAYER:
+            events = self.detect_cards(frame)
+        
+        return frame, events
+    
     def update_camera(self):
-        """Kamera görüntüsünü günceller ve kart tespiti yapar"""
-        if not self.is_running:
+        """Arka plan iş parçacığının sonuçlarını UI'a aktarır"""
+        if not self.is_running or self.vision_worker is None:
             return
         
-        ret, frame = self.camera.read()
-        if ret:
-            self.frame = frame.copy()
-            
-            # Eğer kalibrasyon yapılıyorsa
-            if self.is_calibrating:
-                # Kalibrasyon noktalarını göster
-                for i, point in enumerate(self.calibration_points):
-                    cv2.circle(frame, (point[0], point[1]), 5, (0, 255, 0), -1)
-                    cv2.putText(frame, str(i+1), (point[0] + 10, point[1]), 
-                                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
-                
-                # Eğer tüm ızgara noktaları kalibre edildiyse, ızgarayı çiz
-                if len(self.calibration_points) == 4:
-                    pts1 = np.float32(self.calibration_points)
-                    width, height = 400, 400
-                    pts2 = np.float32([[0, 0], [width, 0], [0, height], [width, height]])
-                    matrix = cv2.getPerspectiveTransform(pts1, pts2)
-                    warped = cv2.warpPerspective(frame, matrix, (width, height))
-                    
-                    # Izgara çizgileri
-                    cell_height = height // self.grid_rows
-                    cell_width = width // self.grid_cols
-                    
-                    for i in range(self.grid_rows + 1):
-                        y = i * cell_height
-                        cv2.line(warped, (0, y), (width, y), (0, 255, 0), 2)
-                    
-                    for i in range(self.grid_cols + 1):
-                        x = i * cell_width
-                        cv2.line(warped, (x, 0), (x, height), (0, 255, 0), 2)
-                    
-                    # Warped görüntüyü ana kare içine yerleştir
-                    h, w = frame.shape[:2]
-                    offset_x, offset_y = 50, 50
-                    frame[offset_y:offset_y+height, offset_x:offset_x+width] = warped
-            
-            # Eğer oyun aktifse, kart tespiti yap
-            elif self.grid_cells and self.current_player == "player":
-                self.detect_cards(frame)
-            
-            # Görüntüyü dönüştür ve UI'a yerleştir
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            img = Image.fromarray(frame_rgb)
-            imgtk = ImageTk.PhotoImage(image=img)
-            self.camera_view.imgtk = imgtk
-            self.camera_view.configure(image=imgtk)
-        
-        self.root.after(30, self.update_camera)
+        # Açılan kart olaylarını oyun mantığına ilet (Tk iş parçacığında)
+        for cell_index, face in self.vision_worker.pending_events():
+            # Olay kuyruktayken kart eşleşmiş olabilir
+            if self.matched_mask[cell_index]:
+                continue
+            self.handle_flipped_card(f"card_{cell_index}", cell_index, self.frame, face)
+        
+        latest = self.vision_worker.latest_frame(after=self.shown_frame_number)
+        if latest is not None:
+            self.shown_frame_number, frame = latest
+            self.show_frame(frame)
+        
+        self.root.after(DISPLAY_POLL_MS, self.update_camera)
+    
+    def show_frame(self, frame):
+        """Kareyi etiket boyutuna küçültüp tek bir PhotoImage üzerine yazar"""
+        frame_height, frame_width = frame.shape[:2]
+        display_width = self.camera_view.winfo_width()
+        display_height = self.camera_view.winfo_height()
+        
+        # Etiket henüz yerleşmediyse orijinal boyutu kullan
+        if display_width <= 1 or display_height <= 1:
+            display_width, display_height = frame_width, frame_height
+        
+        # Önce küçült, sonra renk dönüşümü yap (daha az piksel işlenir)
+        if (display_width, display_height) != (frame_width, frame_height):
+            frame = cv2.resize(frame, (display_width, display_height), interpolation=cv2.INTER_AREA)
+        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        img = Image.fromarray(frame_rgb)
+        
+        # Boyut değişmediyse mevcut PhotoImage'ı yeniden kullan
+        if self.photo_image is not None and (self.photo_image.width(), self.photo_image.height()) == img.size:
+            self.photo_image.paste(img)
+        else:
+            self.photo_image = ImageTk.PhotoImage(image=img)
+            self.camera_view.imgtk = self.photo_image
+            self.camera_view.configure(image=self.photo_image)
     
     def start_calibration(self):
         """Kalibrasyon modunu başlatır"""
@@ -216,11 +293,10 @@ class MemoryGameWithCV:
         self.is_calibrating = False
         self.camera_view.unbind("<Button-1>")
         
-        # Perspektif dönüşümü
-        pts1 = np.float32(self.calibration_points)
-        width, height = 400, 400
-        pts2 = np.float32([[0, 0], [width, 0], [0, height], [width, height]])
-        self.transform_matrix = cv2.getPerspectiveTransform(pts1, pts2)
+        # Perspektif dönüşümü (köşeler değişmediyse önbellekteki tablolar kullanılır)
+        width, height = BOARD_SIZE, BOARD_SIZE
+        self.board_warp.set_points(self.calibration_points)
+        self.transform_matrix = self.board_warp.matrix
         
         # Grid hücrelerini oluştur
         self.grid_cells = []
@@ -234,181 +310,155 @@ class MemoryGameWithCV:
                 x2 = x1 + cell_width
                 y2 = y1 + cell_height
                 self.grid_cells.append([x1, y1, x2, y2])
+        self.matched_mask = np.zeros(len(self.grid_cells), dtype=bool)
+        self.flip_tracker = self._new_flip_tracker()
         
-        # Kart etiketlerini oluştur (rastgele)
-        labels = []
-        for i in range(self.card_pairs):
-            labels.extend([i, i])  # Her etiketin iki örneği
-        random.shuffle(labels)
-        
-        # Etiketleri grid hücrelerine ata
-        self.card_labels = {}
-        for i, cell in enumerate(self.grid_cells):
-            card_id = f"card_{i}"
-            label = labels[i]
-            self.card_labels[card_id] = label
+        # Kart etiketlerini rastgele dağıt ve yeni oyunu başlat
+        self.engine.reset()
         
         self.status_label.config(text="Kalibrasyon tamamlandı. Oyun başladı! Sıra: Oyuncu")
         self.new_game_button.config(state=tk.NORMAL)
-        self.current_player = "player"
+    
+    def _new_flip_tracker(self):
+        """Izgara için boş bir kart açılış takipçisi oluşturur"""
+        return CellFlipTracker(self.grid_rows, self.grid_cols, OPEN_CARD_RATIO, FLIP_CONFIRM_FRAMES)
     
     def detect_cards(self, frame):
-        """Açık kartları tespit eder"""
-        if not self.grid_cells or not hasattr(self, 'transform_matrix'):
-            return
-        
-        # Perspektif dönüşümü
-        warped = cv2.warpPerspective(frame, self.transform_matrix, (400, 400))
-        
-        # Renk dönüşümleri ve eşik işlemleri
+        """Açık kartları tespit eder
+        
+        Returns:
+            Yeni açılan kartlar için (hücre indeksi, tanınan yüz etiketi veya None) listesi
+        """
+        events = []
+        tracker = self.flip_tracker
+        if not self.grid_cells or tracker is None or not self.board_warp.is_ready:
+            return events
+        
+        # Önbellekteki tablolarla tek remap: renkli görüntü gösterim için,
+        # küçük tahta görüntüsünden gri tonlama tespit için
+        warped = self.board_warp.warp(frame)
         gray = cv2.cvtColor(warped, cv2.COLOR_BGR2GRAY)
-        blurred = cv2.GaussianBlur(gray, (5, 5), 0)
-        _, thresh = cv2.threshold(blurred, 150, 255, cv2.THRESH_BINARY_INV)
         
-        # Her hücreyi kontrol et
-        for i, (x1, y1, x2, y2) in enumerate(self.grid_cells):
-            cell_id = f"card_{i}"
-            
-            # Bu kart zaten eşleştirildi mi?
-            if any(cell_id in pair for pair in self.matched_pairs):
-                continue
-            
-            # Hücre bölgesini al
-            cell_region = thresh[y1:y2, x1:x2]
-            
-            # Hücredeki beyaz piksel oranı
-            white_ratio = np.sum(cell_region > 0) / cell_region.size
+        # Değişen hücreleri değerlendir; açılış yeterince uzun sürdüyse olay üret
+        for i in tracker.update(gray):
+            i = int(i)
+            # Kart açık olarak işaretlendi (oyun mantığı UI iş parçacığında işler)
+            if not self.matched_mask[i] and f"card_{i}" not in self.detected_cards:
+                events.append((i, self._recognize_card(gray, i)))
+        
+        # Açık ve henüz eşleşmemiş hücreleri işaretle
+        for i in np.flatnonzero(tracker.open_mask & ~self.matched_mask):
+            x1, y1, x2, y2 = self.grid_cells[i]
             
-            # Eğer belirli bir eşik değerinden fazla beyaz piksel varsa, kart açık demektir
-            # (Değerler gerçek ortama göre ayarlanmalıdır)
-            if white_ratio > 0.1:  # Eşik değerini ayarlayın
-                # Kart açık olarak işaretlendi
-                if cell_id not in self.detected_cards:
-                    self.handle_flipped_card(cell_id, i, frame)
-                
-                # Kart bölgesini çiz
-                cv2.rectangle(warped, (x1, y1), (x2, y2), (0, 255, 0), 2)
-                # Kart etiketini göster
-                cv2.putText(warped, f"Card {i} (Type: {self.card_labels[cell_id]})", 
-                            (x1, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
+            # Kart bölgesini çiz
+            cv2.rectangle(warped, (x1, y1), (x2, y2), (0, 255, 0), 2)
+            # Kart etiketini göster
+            cv2.putText(warped, f"Card {i} (Type: {self.engine.labels[i]})", 
+                        (x1, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
         
         # Dönüştürülmüş görüntüyü ana kare içine yerleştir
         h, w = frame.shape[:2]
         offset_x, offset_y = 50, 50
-        frame[offset_y:offset_y+400, offset_x:offset_x+400] = warped
+        frame[offset_y:offset_y+BOARD_SIZE, offset_x:offset_x+BOARD_SIZE] = warped
+        return events
+    
+    def _recognize_card(self, gray, cell_index):
+        """Hücredeki kart yüzünü dizinde arar (arka plan iş parçacığında çalışır)
+        
+        Returns:
+            Yüz etiketi, dizin yoksa veya eşleşme bulunamazsa None
+        """
+        if self.card_index is None:
+            return None
+        x1, y1, x2, y2 = self.grid_cells[cell_index]
+        # Izgara çizgilerinin ve komşu kartların etkisini azaltmak için kenarları kırp
+        margin_x, margin_y = (x2 - x1) // 10, (y2 - y1) // 10
+        face, _ = self.card_index.match(gray[y1 + margin_y:y2 - margin_y, x1 + margin_x:x2 - margin_x])
+        return face
     
-    def handle_flipped_card(self, card_id, cell_index, frame):
-        """Açılan kartı işler"""
-        if self.current_player != "player" or card_id in self.detected_cards:
+    def handle_flipped_card(self, card_id, cell_index, frame, face=None):
+        """Oyuncunun açtığı kartı oyun motoruna iletir"""
+        if self.engine.current_player != PLAYER or card_id in self.detected_cards:
             return
         
-        # Kartı açık olarak işaretle
-        self.detected_cards.append(card_id)
+        # Tanınan yüz, rastgele dağıtılmış etiketin yerine geçer
+        if face is not None and not self.engine.assign_label(cell_index, face):
+            print(f"Uyarı: {card_id} için tanınan yüz ({face}) oyun durumuyla çelişiyor, yok sayıldı")
+        
+        result = self.engine.reveal(cell_index)
+        if result.outcome == IGNORED:
+            return
         
-        # Yapay zeka hafızasına ekle
-        card_label = self.card_labels[card_id]
-        if card_label not in self.ai_memory:
-            self.ai_memory[card_label] = []
-        if card_id not in self.ai_memory[card_label]:
-            self.ai_memory[card_label].append(card_id)
+        # Kartı açık olarak işaretle
+        self.detected_cards.add(card_id)
         
-        # İlk kart mı kontrol et
-        if not self.last_flipped_card:
+        if result.outcome == FIRST:
             self.last_flipped_card = card_id
             self.status_label.config(text=f"Kart açıldı: {card_id}. İkinci kartı açın.")
+        elif result.outcome == MATCH:
+            # Eşleşme bulundu
+            self._mark_matched(result.first_cell, cell_index)
+            self.player_score_label.config(text=str(self.engine.scores[PLAYER]))
+            self.status_label.config(text="Eşleşme buldunuz! Tekrar sıra sizde.")
+            
+            # Eşleşen kartları tespit listesinden çıkar
+            self.detected_cards.discard(self.last_flipped_card)
+            self.detected_cards.discard(card_id)
+            self.last_flipped_card = None
+            
+            # Oyun bitti mi kontrol et
+            if self.engine.is_over:
+                self.end_game()
         else:
-            # İkinci kart açıldığında eşleşme kontrolü
-            first_card_label = self.card_labels[self.last_flipped_card]
-            second_card_label = self.card_labels[card_id]
+            # Eşleşme yok, sıra yapay zekaya geçiyor
+            self.status_label.config(text="Eşleşme bulunamadı. Sıra yapay zekada.")
             
-            if first_card_label == second_card_label:
-                # Eşleşme bulundu
-                self.matched_pairs.append((self.last_flipped_card, card_id))
-                self.player_score += 1
-                self.player_score_label.config(text=str(self.player_score))
-                self.status_label.config(text="Eşleşme buldunuz! Tekrar sıra sizde.")
-                
-                # Eşleşen kartları tespit listesinden çıkar
-                self.detected_cards.remove(self.last_flipped_card)
-                self.detected_cards.remove(card_id)
-                self.last_flipped_card = None
-                
-                # Oyun bitti mi kontrol et
-                if len(self.matched_pairs) == self.card_pairs:
-                    self.end_game()
-            else:
-                # Eşleşme yok, sıra yapay zekaya geçiyor
-                self.status_label.config(text="Eşleşme bulunamadı. Sıra yapay zekada.")
-                self.current_player = "ai"
-                
-                # Kartları 2 saniye sonra kapatılmış olarak işaretle
-                self.root.after(2000, lambda: self.reset_flipped_cards())
-                
-                # Yapay zekanın hamlesi için 3 saniye bekle
-                self.root.after(3000, self.ai_move)
+            # Kartları 2 saniye sonra kapatılmış olarak işaretle
+            self.root.after(2000, lambda: self.reset_flipped_cards())
+            
+            # Yapay zekanın hamlesi için 3 saniye bekle
+            self.root.after(3000, self.ai_move)
+    
+    def _mark_matched(self, *cell_indices):
+        """Eşleşen kartları hücre maskesinde işaretler"""
+        for cell_index in cell_indices:
+            self.matched_mask[cell_index] = True
     
     def reset_flipped_cards(self):
         """Eşleşmeyen kartları kapatır"""
-        if self.last_flipped_card and self.last_flipped_card in self.detected_cards:
-            self.detected_cards.remove(self.last_flipped_card)
-        
-        # Eşleşen kartlar dışındakileri temizle
-        matched_card_ids = [card for pair in self.matched_pairs for card in pair]
-        self.detected_cards = [card for card in self.detected_cards if card in matched_card_ids]
-        
+        # Eşleşen kartlar eşleştikleri anda listeden çıkarıldığından kalanların hepsi kapanır
+        self.detected_cards.clear()
         self.last_flipped_card = None
     
     def ai_move(self):
         """Yapay zekanın hamlesini gerçekleştirir"""
-        if self.current_player != "ai" or len(self.matched_pairs) == self.card_pairs:
+        if self.engine.current_player != AI or self.engine.is_over:
             return
         
         self.status_label.config(text="Yapay zeka hamle yapıyor...")
         
-        # Bilinen eşleşmeler var mı kontrol et
-        known_pairs = []
-        for label, cards in self.ai_memory.items():
-            unique_cards = [card for card in cards if not any(card in pair for pair in self.matched_pairs)]
-            if len(unique_cards) >= 2:
-                known_pairs.append(unique_cards[:2])
-        
-        if known_pairs:
-            # Bilinen bir çift seç
-            selected_pair = random.choice(known_pairs)
-            first_card, second_card = selected_pair
-        else:
-            # Rastgele iki kart seç
-            available_cards = [f"card_{i}" for i in range(len(self.grid_cells)) 
-                              if f"card_{i}" not in [card for pair in self.matched_pairs for card in pair]]
-            
-            if len(available_cards) < 2:
-                self.end_game()
-                return
-            
-            first_card, second_card = random.sample(available_cards, 2)
-        
-        # İlk kartı aç
-        first_card_label = self.card_labels[first_card]
-        self.status_label.config(text=f"Yapay zeka ilk kartı açtı: {first_card}")
+        # İlk kartı aç (politika önce bilinen bir çifti dener)
+        first_cell = self.ai_policy.choose_first(self.engine)
+        result = self.engine.reveal(first_cell)
+        self.status_label.config(text=f"Yapay zeka ilk kartı açtı: card_{first_cell}")
         
         # İkinci kartı 1 saniye sonra aç
-        self.root.after(1000, lambda: self.complete_ai_move(first_card, second_card))
+        self.root.after(1000, lambda: self.complete_ai_move(first_cell, result.label))
     
-    def complete_ai_move(self, first_card, second_card):
+    def complete_ai_move(self, first_cell, first_label):
         """Yapay zekanın hamlesini tamamlar"""
         # İkinci kartı aç
-        second_card_label = self.card_labels[second_card]
+        second_cell = self.ai_policy.choose_second(self.engine, first_cell, first_label)
+        result = self.engine.reveal(second_cell)
         
-        # Kartlar eşleşiyor mu kontrol et
-        if self.card_labels[first_card] == self.card_labels[second_card]:
+        if result.outcome == MATCH:
             # Eşleşme bulundu
-            self.matched_pairs.append((first_card, second_card))
-            self.ai_score += 1
-            self.ai_score_label.config(text=str(self.ai_score))
+            self._mark_matched(first_cell, second_cell)
+            self.ai_score_label.config(text=str(self.engine.scores[AI]))
             self.status_label.config(text="Yapay zeka eşleşme buldu! Tekrar sıra onda.")
             
             # Oyun bitti mi kontrol et
-            if len(self.matched_pairs) == self.card_pairs:
+            if self.engine.is_over:
                 self.end_game()
             else:
                 # Sıra hala yapay zekada
@@ -416,16 +466,17 @@ class MemoryGameWithCV:
         else:
             # Eşleşme yok, sıra oyuncuya geçiyor
             self.status_label.config(text="Yapay zeka eşleşme bulamadı. Sıra sizde.")
-            self.current_player = "player"
     
     def end_game(self):
         """Oyunu bitirir ve sonucu gösterir"""
-        if self.player_score > self.ai_score:
-            result = f"Tebrikler! Kazandınız! Skor: {self.player_score}-{self.ai_score}"
-        elif self.ai_score > self.player_score:
-            result = f"Yapay zeka kazandı. Skor: {self.player_score}-{self.ai_score}"
+        player_score, ai_score = self.engine.scores
+        winner = self.engine.winner()
+        if winner == PLAYER:
+            result = f"Tebrikler! Kazandınız! Skor: {player_score}-{ai_score}"
+        elif winner == AI:
+            result = f"Yapay zeka kazandı. Skor: {player_score}-{ai_score}"
         else:
-            result = f"Berabere bitti! Skor: {self.player_score}-{self.ai_score}"
+            result = f"Berabere bitti! Skor: {player_score}-{ai_score}"
         
         self.status_label.config(text=f"Oyun bitti. {result}")
         messagebox.showinfo("Oyun Bitti", result)
@@ -433,33 +484,37 @@ class MemoryGameWithCV:
     def reset_game(self):
         """Oyunu sıfırlar"""
         # Oyun değişkenlerini sıfırla
-        self.detected_cards = []
-        self.matched_pairs = []
+        self.detected_cards = set()
+        self.matched_mask = np.zeros(len(self.grid_cells), dtype=bool)
+        if self.grid_cells:
+            self.flip_tracker = self._new_flip_tracker()
         self.last_flipped_card = None
-        self.player_score = 0
-        self.ai_score = 0
-        self.ai_memory = {}
-        self.current_player = "player"
+        
+        # Yeni kart etiketleri dağıt; skorlar ve yapay zeka hafızası da sıfırlanır
+        self.engine.reset()
         
         # Skorları güncelle
         self.player_score_label.config(text="0")
         self.ai_score_label.config(text="0")
         
-        # Yeni kart etiketleri oluştur
-        if self.grid_cells:
-            labels = []
-            for i in range(self.card_pairs):
-                labels.extend([i, i])
-            random.shuffle(labels)
-            
-            self.card_labels = {}
-            for i in range(len(self.grid_cells)):
-                self.card_labels[f"card_{i}"] = labels[i]
-        
         self.status_label.config(text="Yeni oyun başladı! Sıra: Oyuncu")
 
 # Programı başlat
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Kamera ile hafıza oyunu")
+    parser.add_argument('--rows', type=int, default=4, help='Izgara satır sayısı')
+    parser.add_argument('--cols', type=int, default=4, help='Izgara sütun sayısı')
+    parser.add_argument('--source', default=str(CAMERA_SOURCE),
+                        help="Kamera indeksi, video dosyası, görüntü klasörü veya 'synthetic'")
+    parser.add_argument('--card-index', help='Kart yüzü dizini (python -m memory_game.card_index build ...)')
+    args = parser.parse_args()
+    
+    card_index = None
+    if args.card_index:
+        from memory_game.card_index import CardIndex
+        card_index = CardIndex.load(args.card_index)
+    
     root = tk.Tk()
-    app = MemoryGameWithCV(root)
+    app = MemoryGameWithCV(root, args.rows, args.cols, card_index, args.source)
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,11 @@
+# capture/__init__.py
+from utils.lazy_import import lazy_exports
+
+__all__ = ['SharedFrameRing', 'FrameSource', 'Frame', 'open_frame_source']
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'SharedFrameRing': '.frame_ring',
+    'FrameSource': '.frame_source',
+    'Frame': '.frame_source',
+    'open_frame_source': '.frame_source',
+})
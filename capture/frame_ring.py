@@ -0,0 +1,215 @@
+"""
+Shared-memory ring buffer for passing camera frames between processes.
+
+Frames live in preallocated slots of a ``multiprocessing.shared_memory``
+block, so the capture process can read straight into a slot and the
+inference process can use it as a zero-copy NumPy view. Each slot is
+guarded by a sequence counter (seqlock): the writer makes it odd while the
+slot is being written and even once it is complete, and a reader checks that
+the counter is unchanged after using the frame.
+"""
+import time
+import numpy as np
+from multiprocessing import shared_memory
+from typing import NamedTuple, Optional, Tuple
+
+_INT64 = np.dtype(np.int64)
+_FLOAT64 = np.dtype(np.float64)
+
+
+class RingSpec(NamedTuple):
+    """Everything another process needs to attach to a ring."""
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+    slots: int
+
+
+class FrameSlot(NamedTuple):
+    """A frame read from the ring."""
+    frame_number: int
+    frame: np.ndarray
+    timestamp: float
+    slot: int
+    sequence: int
+
+
+class SharedFrameRing:
+    """
+    Single-writer, multi-reader ring of fixed-size frames in shared memory.
+    """
+    def __init__(self, shape: Tuple[int, ...], dtype=np.uint8, slots: int = 4,
+                 name: Optional[str] = None, create: bool = True):
+        """
+        Create or attach to a ring.
+
+        Args:
+            shape: Frame shape, e.g. (720, 1280, 3)
+            dtype: Frame dtype
+            slots: Number of frame slots
+            name: Shared memory name (generated when creating without one)
+            create: Create a new block (True) or attach to an existing one
+        """
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.slots = slots
+        self.frame_bytes = int(np.prod(self.shape)) * self.dtype.itemsize
+
+        # Header: [frames written, per-slot sequence..., per-slot frame number...]
+        # followed by per-slot timestamps, then the slot data (64-byte aligned)
+        counters = (1 + 2 * slots) * _INT64.itemsize
+        timestamps = slots * _FLOAT64.itemsize
+        self._data_offset = (counters + timestamps + 63) // 64 * 64
+        size = self._data_offset + slots * self.frame_bytes
+
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=size if create else 0)
+        self.owner = create
+
+        buf = self.shm.buf
+        header = np.ndarray((1 + 2 * slots,), dtype=_INT64, buffer=buf)
+        self._written = header[0:1]
+        self._sequence = header[1:1 + slots]
+        self._frame_numbers = header[1 + slots:]
+        self._timestamps = np.ndarray((slots,), dtype=_FLOAT64, buffer=buf, offset=counters)
+        self._frames = np.ndarray((slots,) + self.shape, dtype=self.dtype,
+                                  buffer=buf, offset=self._data_offset)
+        if create:
+            header[:] = 0
+            self._timestamps[:] = 0.0
+
+    @classmethod
+    def attach(cls, spec: RingSpec) -> 'SharedFrameRing':
+        """
+        Attach to a ring created in another process.
+
+        Args:
+            spec: Ring description from the creating process
+
+        Returns:
+            SharedFrameRing view of the same memory
+        """
+        return cls(spec.shape, spec.dtype, spec.slots, name=spec.name, create=False)
+
+    @property
+    def spec(self) -> RingSpec:
+        """
+        Returns:
+            Picklable description used by other processes to attach
+        """
+        return RingSpec(self.shm.name, self.shape, self.dtype.str, self.slots)
+
+    @property
+    def frames_written(self) -> int:
+        return int(self._written[0])
+
+    # Writer side
+
+    def begin_write(self) -> Tuple[int, np.ndarray]:
+        """
+        Claim the next slot for writing.
+
+        The returned view can be filled in place, e.g. ``cap.read(view)``.
+        Call ``commit`` (or ``abort``) when done.
+
+        Returns:
+            Tuple of (slot index, writable frame view)
+        """
+        slot = self.frames_written % self.slots
+        self._sequence[slot] += 1  # odd: write in progress
+        return slot, self._frames[slot]
+
+    def commit(self, slot: int, timestamp: Optional[float] = None):
+        """
+        Publish a slot claimed with ``begin_write``.
+
+        Args:
+            slot: Slot index from begin_write
+            timestamp: Capture timestamp (defaults to time.perf_counter())
+        """
+        frame_number = self.frames_written
+        self._timestamps[slot] = time.perf_counter() if timestamp is None else timestamp
+        self._frame_numbers[slot] = frame_number
+        self._sequence[slot] += 1  # even: slot is stable
+        self._written[0] = frame_number + 1
+
+    def abort(self, slot: int):
+        """
+        Release a slot claimed with ``begin_write`` without publishing it.
+
+        Args:
+            slot: Slot index from begin_write
+        """
+        self._sequence[slot] += 1
+
+    def write(self, frame: np.ndarray, timestamp: Optional[float] = None) -> int:
+        """
+        Copy a frame into the next slot and publish it.
+
+        Args:
+            frame: Frame with the ring's shape
+            timestamp: Capture timestamp
+
+        Returns:
+            Frame number of the published frame
+        """
+        slot, view = self.begin_write()
+        view[...] = frame
+        frame_number = self.frames_written
+        self.commit(slot, timestamp)
+        return frame_number
+
+    # Reader side
+
+    def read_latest(self, after: int = -1, copy: bool = False) -> Optional[FrameSlot]:
+        """
+        Get the most recently published frame.
+
+        With ``copy=False`` the frame is a view into shared memory; the writer
+        may reuse the slot after ``slots - 1`` further frames, so check
+        ``is_valid`` after using it.
+
+        Args:
+            after: Only return frames with a number greater than this
+            copy: Return a private copy instead of a view
+
+        Returns:
+            FrameSlot, or None if no newer stable frame is available
+        """
+        written = self.frames_written
+        if written == 0 or written - 1 <= after:
+            return None
+        slot = (written - 1) % self.slots
+        sequence = int(self._sequence[slot])
+        if sequence & 1:
+            return None
+        frame = self._frames[slot]
+        if copy:
+            frame = frame.copy()
+        result = FrameSlot(int(self._frame_numbers[slot]), frame,
+                           float(self._timestamps[slot]), slot, sequence)
+        if not self.is_valid(result):
+            return None
+        return result
+
+    def is_valid(self, frame_slot: FrameSlot) -> bool:
+        """
+        Check that a slot was not overwritten since it was read.
+
+        Args:
+            frame_slot: Frame returned by read_latest
+
+        Returns:
+            True if the data seen through the view is intact
+        """
+        return int(self._sequence[frame_slot.slot]) == frame_slot.sequence
+
+    def close(self):
+        """
+        Release this process's mapping (and the block itself if it owns it).
+        """
+        # Drop views into the buffer before closing the mapping
+        self._written = self._sequence = self._frame_numbers = None
+        self._timestamps = self._frames = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
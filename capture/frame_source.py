@@ -0,0 +1,469 @@
+"""
+Frame sources for every tool that reads video.
+
+All backends share one interface: ``read_frame()`` returns a Frame with the
+image, a ``time.monotonic()`` capture timestamp and a frame index, and the
+``read()``/``isOpened()``/``release()`` methods mirror cv2.VideoCapture so a
+source can be dropped in wherever a capture object was used.
+
+Backends:
+  * CameraSource:          cv2.VideoCapture device with resolution, FPS,
+                           FOURCC and driver buffer size settings
+  * VideoFileSource:       recorded video, optionally paced and looped
+  * ImageDirectorySource:  folder of still images, in name order
+  * SyntheticSource:       generated test pattern, no hardware needed
+  * LatestFrameSource:     wraps any source with a grab thread and always
+                           returns the newest frame, dropping stale ones
+
+Unreadable images are skipped, up to MAX_READ_FAILURES in a row. Failed
+camera reads are retried only on LatestFrameSource's grab thread, up to
+MAX_READ_FAILURES in a row RETRY_DELAY apart; a bare CameraSource ends on
+the first failed read. LatestFrameSource waits FIRST_FRAME_TIMEOUT for the
+first frame, since cameras can take seconds to deliver it, and
+FRAME_TIMEOUT for every later one.
+"""
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Iterator, NamedTuple, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+SYNTHETIC_PREFIX = 'synthetic'
+
+# Consecutive failed reads tolerated before a source counts as ended
+MAX_READ_FAILURES = 10
+# Seconds between retries of a failed live read
+RETRY_DELAY = 0.01
+# Seconds LatestFrameSource.read_frame() waits for the first frame, and for later ones
+FIRST_FRAME_TIMEOUT = 10.0
+FRAME_TIMEOUT = 2.0
+
+
+class Frame(NamedTuple):
+    """A captured frame."""
+    image: np.ndarray
+    timestamp: float  # time.monotonic() when the frame was captured
+    index: int        # Frame number from the start of the source
+
+
+class FrameSource(ABC):
+    """
+    Base class of all frame sources.
+
+    Subclasses implement ``_grab()``, returning the next image and its
+    capture time, or None at the end of the stream.
+    """
+    def __init__(self):
+        self.frame_count = 0
+        self.last_timestamp = None
+
+    @abstractmethod
+    def _grab(self) -> Optional[Tuple[np.ndarray, float]]:
+        """Capture the next image; returns (image, time.monotonic()) or None at the end."""
+
+    def isOpened(self) -> bool:
+        return True
+
+    def read_frame(self) -> Optional[Frame]:
+        """
+        Read the next frame.
+
+        Returns:
+            Frame, or None if no frame is available
+        """
+        grabbed = self._grab()
+        if grabbed is None:
+            return None
+        image, timestamp = grabbed
+        frame = Frame(image, timestamp, self.frame_count)
+        self.frame_count += 1
+        self.last_timestamp = timestamp
+        return frame
+
+    def read(self) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        cv2.VideoCapture-compatible read.
+
+        Returns:
+            Tuple of (success, image)
+        """
+        frame = self.read_frame()
+        if frame is None:
+            return False, None
+        return True, frame.image
+
+    def release(self):
+        """
+        Release the underlying device or file.
+        """
+
+    def __iter__(self) -> Iterator[Frame]:
+        while True:
+            frame = self.read_frame()
+            if frame is None:
+                return
+            yield frame
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class _Pacer:
+    """Sleeps so that successive frames are delivered at a fixed rate."""
+    def __init__(self, fps: Optional[float]):
+        self.period = 1.0 / fps if fps else 0.0
+        self.next_time = None
+
+    def wait(self):
+        if not self.period:
+            return
+        now = time.monotonic()
+        if self.next_time is None or now - self.next_time > self.period:
+            # First frame, or we fell behind: restart the schedule
+            self.next_time = now
+        elif self.next_time > now:
+            time.sleep(self.next_time - now)
+        self.next_time += self.period
+
+
+class CameraSource(FrameSource):
+    """
+    Live camera through cv2.VideoCapture.
+    """
+    def __init__(self, device: int = 0, width: Optional[int] = None, height: Optional[int] = None,
+                 fps: Optional[float] = None, fourcc: Optional[str] = None,
+                 buffer_size: Optional[int] = 1):
+        """
+        Open a camera.
+
+        Settings the driver does not support are ignored by OpenCV; the
+        values actually in effect are available as attributes afterwards.
+
+        Args:
+            device: Camera index
+            width: Requested frame width
+            height: Requested frame height
+            fps: Requested frame rate
+            fourcc: Requested pixel format, e.g. 'MJPG'
+            buffer_size: Driver-side frame queue length (1 = least latency)
+        """
+        super().__init__()
+        self.capture = cv2.VideoCapture(device)
+        self.width = self.height = 0
+        self.fps = 0.0
+        if not self.capture.isOpened():
+            return
+        # Some backends only accept a resolution after the pixel format is set
+        if fourcc:
+            self.capture.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+        if width:
+            self.capture.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        if height:
+            self.capture.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        if fps:
+            self.capture.set(cv2.CAP_PROP_FPS, fps)
+        if buffer_size:
+            self.capture.set(cv2.CAP_PROP_BUFFERSIZE, buffer_size)
+
+        self.width = int(self.capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self.capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.fps = self.capture.get(cv2.CAP_PROP_FPS)
+
+    def isOpened(self) -> bool:
+        return self.capture.isOpened()
+
+    def _grab(self) -> Optional[Tuple[np.ndarray, float]]:
+        # Timestamp between grab and decode: closest to the exposure
+        if not self.capture.grab():
+            return None
+        timestamp = time.monotonic()
+        ret, image = self.capture.retrieve()
+        return (image, timestamp) if ret else None
+
+    def release(self):
+        self.capture.release()
+
+
+class VideoFileSource(FrameSource):
+    """
+    Recorded video file.
+    """
+    def __init__(self, path: str, realtime: bool = False, loop: bool = False):
+        """
+        Open a video.
+
+        Args:
+            path: Video file path
+            realtime: Deliver frames at the file's frame rate
+            loop: Restart from the beginning at the end of the file
+        """
+        super().__init__()
+        self.path = path
+        self.loop = loop
+        self.capture = cv2.VideoCapture(path)
+        self.fps = self.capture.get(cv2.CAP_PROP_FPS)
+        self.width = int(self.capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self.capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self._pacer = _Pacer(self.fps if realtime else None)
+
+    def isOpened(self) -> bool:
+        return self.capture.isOpened()
+
+    def _grab(self) -> Optional[Tuple[np.ndarray, float]]:
+        self._pacer.wait()
+        ret, image = self.capture.read()
+        if not ret and self.loop and self.frame_count:
+            self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, image = self.capture.read()
+        return (image, time.monotonic()) if ret else None
+
+    def release(self):
+        self.capture.release()
+
+
+class ImageDirectorySource(FrameSource):
+    """
+    Still images from a folder, in file name order.
+    """
+    def __init__(self, folder: str, fps: Optional[float] = None, loop: bool = False,
+                 max_failures: int = MAX_READ_FAILURES):
+        """
+        Open an image folder.
+
+        Args:
+            folder: Directory containing the images
+            fps: Delivery rate (None = as fast as they are read)
+            loop: Start over after the last image
+            max_failures: Unreadable images in a row that are skipped
+                before the stream ends
+        """
+        super().__init__()
+        self.paths = sorted(os.path.join(folder, name) for name in os.listdir(folder)
+                            if name.lower().endswith(IMAGE_EXTENSIONS))
+        self.loop = loop
+        self.fps = fps or 0.0
+        self.max_failures = max_failures
+        self.skipped = 0
+        self._position = 0
+        self._pacer = _Pacer(fps)
+
+    def isOpened(self) -> bool:
+        return bool(self.paths)
+
+    def _grab(self) -> Optional[Tuple[np.ndarray, float]]:
+        failures = 0
+        while True:
+            if self._position >= len(self.paths):
+                if not self.loop or not self.paths:
+                    return None
+                self._position = 0
+            path = self.paths[self._position]
+            self._position += 1
+            image = cv2.imread(path)
+            if image is not None:
+                break
+            self.skipped += 1
+            failures += 1
+            print(f"Could not read image, skipping: {path}")
+            if failures >= self.max_failures:
+                return None
+        self._pacer.wait()
+        return image, time.monotonic()
+
+
+class SyntheticSource(FrameSource):
+    """
+    Generated test pattern: moving colour bars with the frame number.
+    """
+    def __init__(self, width: int = 640, height: int = 480, fps: float = 30.0,
+                 realtime: bool = True, frames: int = 0):
+        """
+        Create the pattern generator.
+
+        Args:
+            width: Frame width
+            height: Frame height
+            fps: Frame rate
+            realtime: Deliver frames at ``fps`` (otherwise as fast as possible)
+            frames: Stop after this many frames (0 = endless)
+        """
+        super().__init__()
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.frames = frames
+        self._pacer = _Pacer(fps if realtime else None)
+        hue = np.linspace(0, 179, width, dtype=np.float32)
+        bars = np.zeros((1, width, 3), dtype=np.uint8)
+        bars[0, :, 0] = hue.astype(np.uint8)
+        bars[0, :, 1:] = 255
+        self._bars = cv2.cvtColor(bars, cv2.COLOR_HSV2BGR)
+
+    def _grab(self) -> Optional[Tuple[np.ndarray, float]]:
+        if self.frames and self.frame_count >= self.frames:
+            return None
+        self._pacer.wait()
+        shift = (self.frame_count * 4) % self.width
+        image = np.repeat(np.roll(self._bars, shift, axis=1), self.height, axis=0)
+        cv2.putText(image, str(self.frame_count), (10, self.height - 20),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1.0, (255, 255, 255), 2)
+        return image, time.monotonic()
+
+
+class LatestFrameSource(FrameSource):
+    """
+    Reads another source on a background thread and keeps only the newest
+    frame, so a slow consumer always gets the most recent image instead of
+    working through a queue of stale ones.
+    """
+    def __init__(self, source: FrameSource, max_failures: int = MAX_READ_FAILURES,
+                 frame_timeout: float = FRAME_TIMEOUT, first_frame_timeout: float = FIRST_FRAME_TIMEOUT):
+        """
+        Start the grab thread.
+
+        Args:
+            source: Source to read from
+            max_failures: Failed reads in a row that are retried before the
+                stream ends
+            frame_timeout: Default wait of read_frame() for a new frame
+            first_frame_timeout: Default wait until the source has delivered
+                its first frame (camera start-up)
+        """
+        super().__init__()
+        self.source = source
+        self.max_failures = max_failures
+        self.frame_timeout = frame_timeout
+        self.first_frame_timeout = first_frame_timeout
+        self.read_failures = 0
+        self.frames_dropped = 0
+        self._latest = None
+        self._returned_index = -1
+        self._ended = False
+        self._condition = threading.Condition()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="FrameGrabber", daemon=True)
+        if source.isOpened():
+            self._thread.start()
+
+    def _run(self):
+        failures = 0
+        while not self._stop_event.is_set():
+            frame = self.source.read_frame()
+            if frame is None:
+                failures += 1
+                self.read_failures += 1
+                # A dropped camera frame is usually transient: retry before giving up
+                if failures < self.max_failures and self.source.isOpened():
+                    self._stop_event.wait(RETRY_DELAY)
+                    continue
+            else:
+                failures = 0
+            with self._condition:
+                if frame is None:
+                    self._ended = True
+                    self._condition.notify_all()
+                    return
+                self._latest = frame
+                self._condition.notify_all()
+
+    def isOpened(self) -> bool:
+        return self.source.isOpened()
+
+    def _grab(self) -> Optional[Tuple[np.ndarray, float]]:
+        frame = self._wait_newest(self._default_timeout())
+        return None if frame is None else (frame.image, frame.timestamp)
+
+    def read_frame(self, timeout: Optional[float] = None) -> Optional[Frame]:
+        """
+        Wait for a frame newer than the last one returned.
+
+        Args:
+            timeout: Maximum wait in seconds (default: first_frame_timeout
+                until the source delivers its first frame, then frame_timeout)
+
+        Returns:
+            The newest Frame (keeping the wrapped source's index), or None if
+            the source ended or no frame arrived in time
+        """
+        frame = self._wait_newest(self._default_timeout() if timeout is None else timeout)
+        if frame is not None:
+            self.frame_count += 1
+            self.last_timestamp = frame.timestamp
+        return frame
+
+    def _default_timeout(self) -> float:
+        return self.first_frame_timeout if self._latest is None else self.frame_timeout
+
+    def _wait_newest(self, timeout: float) -> Optional[Frame]:
+        with self._condition:
+            newer = lambda: self._ended or (self._latest is not None and
+                                            self._latest.index > self._returned_index)
+            self._condition.wait_for(newer, timeout)
+            frame = self._latest
+            if frame is None or frame.index <= self._returned_index:
+                return None
+            self.frames_dropped += frame.index - self._returned_index - 1
+            self._returned_index = frame.index
+        return frame
+
+    def release(self):
+        self._stop_event.set()
+        if self._thread.is_alive():
+            self._thread.join(1.0)
+        self.source.release()
+
+
+def open_frame_source(source: Union[int, str] = 0, width: Optional[int] = None,
+                      height: Optional[int] = None, fps: Optional[float] = None,
+                      fourcc: Optional[str] = None, buffer_size: Optional[int] = 1,
+                      latest_only: bool = True, frame_timeout: float = FRAME_TIMEOUT,
+                      first_frame_timeout: float = FIRST_FRAME_TIMEOUT, **options: Any) -> FrameSource:
+    """
+    Open a frame source from a short description.
+
+    Args:
+        source: Camera index (int or digit string), 'synthetic', an image
+            directory or a video file path
+        width: Requested width (camera, synthetic)
+        height: Requested height (camera, synthetic)
+        fps: Requested frame rate (camera, synthetic, image directory)
+        fourcc: Camera pixel format, e.g. 'MJPG'
+        buffer_size: Camera driver buffer size
+        latest_only: Read live sources (camera, synthetic) on a grab thread
+            and always return the newest frame
+        frame_timeout: With latest_only, seconds read_frame() waits for a frame
+        first_frame_timeout: With latest_only, seconds read_frame() waits for
+            the first frame
+        **options: Extra backend arguments (e.g. loop, realtime, frames)
+
+    Returns:
+        FrameSource; check isOpened() before use
+    """
+    if isinstance(source, str) and source.isdigit():
+        source = int(source)
+
+    if isinstance(source, int):
+        frame_source = CameraSource(source, width, height, fps, fourcc, buffer_size)
+        live = True
+    elif source == SYNTHETIC_PREFIX:
+        frame_source = SyntheticSource(width or 640, height or 480, fps or 30.0, **options)
+        live = options.get('realtime', True)
+    elif os.path.isdir(source):
+        frame_source = ImageDirectorySource(source, fps, **options)
+        live = False
+    else:
+        frame_source = VideoFileSource(source, **options)
+        live = False
+
+    if live and latest_only:
+        return LatestFrameSource(frame_source, frame_timeout=frame_timeout,
+                                 first_frame_timeout=first_frame_timeout)
+    return frame_source
+
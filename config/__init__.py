@@ -1,2 +1,2 @@
 # config/__init__.py
-from .settings import MEDIAPIPE_CONFIG, DEFAULT_SERIAL_PORT, DEFAULT_BAUDRATE, SERIAL_TIMEOUT, FINGER_ANGLE_RANGES, SMOOTH_FACTOR, UPDATE_INTERVAL, ANGLE_UPDATE_THRESHOLD
\ No newline at end of file
+from .settings import MEDIAPIPE_CONFIG, FLOW_TRACKING, FLOW_TRACKING_CONFIG, PRESENCE_GATE, PRESENCE_CONFIG, CAMERA_SOURCE, CAMERA_CONFIG, DEFAULT_SERIAL_PORT, DEFAULT_BAUDRATE, SERIAL_TIMEOUT, TELEMETRY_INTERVAL_MS, TELEMETRY_THROTTLE, TELEMETRY_LIMITS, FLOW_WINDOW, FLOW_ACK_TIMEOUT, STREAM_ADDRESS, STREAM_CONFIG, LANDMARK_SOURCE, LANDMARK_INGEST_CONFIG, FINGER_ANGLE_RANGES, SMOOTH_FACTOR, UPDATE_INTERVAL, ANGLE_UPDATE_THRESHOLD, TRAJECTORY_MODE, TRAJECTORY_SEGMENT_MS, DELTA_MODE, FINGER_DEADBANDS, KEYFRAME_INTERVAL, GESTURE_PRESETS, GESTURE_CONFIG
\ No newline at end of file
@@ -10,11 +10,71 @@ MEDIAPIPE_CONFIG = {
     'min_tracking_confidence': 0.5
 }
 
+# Optical-flow tracking between MediaPipe inferences
+FLOW_TRACKING = False  # Propagate landmarks with Lucas-Kanade flow between inferences
+FLOW_TRACKING_CONFIG = {
+    'detect_interval': 3,    # Run MediaPipe every N frames
+    'max_fb_error': 1.5,     # Forward-backward error (pixels) that counts as drift
+    'min_valid_ratio': 0.8,  # Re-detect when fewer landmarks than this track cleanly
+}
+
+# Hand-presence gate (idle mode while nobody is at the station)
+PRESENCE_GATE = False  # Skip MediaPipe on empty frames
+PRESENCE_CONFIG = {
+    'motion_ratio': 0.02,  # Fraction of moving thumbnail pixels that wakes tracking
+    'skin_ratio': 0.03,    # Skin-coloured fraction above the background that wakes tracking
+    'idle_after': 30,      # Frames without a hand before going idle
+    'idle_fps': 10,        # Frame rate while idle
+}
+
+# Camera / frame source settings
+CAMERA_SOURCE = 0  # Camera index, video file, image directory or 'synthetic'
+CAMERA_CONFIG = {
+    'width': None,       # Requested resolution (None = driver default)
+    'height': None,
+    'fps': None,         # Requested frame rate (None = driver default)
+    'fourcc': None,      # Pixel format, e.g. 'MJPG' for high frame rates over USB
+    'buffer_size': 1,    # Driver frame queue; 1 avoids processing stale frames
+    'latest_only': True, # Grab thread that always hands out the newest frame
+    'first_frame_timeout': 10.0,  # Seconds to wait for the camera's first frame (latest_only)
+    'frame_timeout': 2.0,         # Seconds to wait for each later frame before the stream ends
+}
+
 # Serial communication settings
 DEFAULT_SERIAL_PORT = '/dev/ttyUSB0'
 DEFAULT_BAUDRATE = 115200
 SERIAL_TIMEOUT = 1
 
+# Board telemetry (status frames read on a background thread)
+TELEMETRY_INTERVAL_MS = 0  # Status frame period requested from the board (0 = off)
+TELEMETRY_THROTTLE = True  # Skip angle updates while the board falls behind
+TELEMETRY_LIMITS = {
+    'max_queue_depth': 4,  # Commands written but not yet applied
+    'max_loop_ms': 50,     # Longest loop iteration (a blocking move)
+    'max_rx_pending': 32,  # Bytes waiting in the board's 64-byte receive buffer
+    'stale_intervals': 3,  # Missing frames before the board counts as stuck
+}
+
+# Angle/landmark streaming to local subscribers (see streaming/publisher.py)
+STREAM_ADDRESS = None  # 'tcp:127.0.0.1:8765' or 'unix:/tmp/hand_mimic.sock' (None = off)
+STREAM_CONFIG = {
+    'max_subscribers': 16,      # Further connections are refused
+    'write_buffer': 1024,       # Bytes queued per subscriber before updates are conflated
+}
+
+# Remote landmark ingest (detection on a separate node, see streaming/landmark_ingest.py)
+LANDMARK_SOURCE = None  # 'udp:0.0.0.0:9000' or 'tcp:0.0.0.0:9000' to listen on (None = local MediaPipe)
+LANDMARK_INGEST_CONFIG = {
+    'width': 640,         # Canvas the received landmarks are drawn on
+    'height': 480,
+    'hand_timeout': 0.5,  # Seconds without a frame before the hand counts as lost
+    'restart_gap': 1000,  # Backwards sequence jump that means the node restarted
+}
+
+# Ack-based flow control
+FLOW_WINDOW = 0  # Unacknowledged targets in flight; newer targets replace waiting ones (0 = off)
+FLOW_ACK_TIMEOUT = 2.0  # Seconds without an ack before a full window is assumed lost
+
 # Finger angle settings
 # Default threshold values (modify with calibration)
 FINGER_ANGLE_RANGES = {
@@ -29,4 +89,27 @@ FINGER_ANGLE_RANGES = {
 # Smoothing and update settings
 SMOOTH_FACTOR = 0.7  # Higher value = smoother movement, more lag
 UPDATE_INTERVAL = 2  # Update every N frames
-ANGLE_UPDATE_THRESHOLD = 5  # Minimum angle change to trigger an update
\ No newline at end of file
+ANGLE_UPDATE_THRESHOLD = 5  # Minimum angle change to trigger an update
+
+# Trajectory streaming settings
+TRAJECTORY_MODE = False  # Send timed segments that the Arduino interpolates
+TRAJECTORY_SEGMENT_MS = 100  # Duration of each segment (= max send interval)
+
+# Delta encoding settings
+DELTA_MODE = False  # Send only fingers that changed (requires the 'delta' sketch command)
+FINGER_DEADBANDS = {  # Minimum change per finger before it is resent
+    'thumb_mcp': 4,
+    'thumb_ip': 4,
+    'index': 3,
+    'middle': 3,
+    'ring': 3,
+    'pinky': 3,
+}
+KEYFRAME_INTERVAL = 1.0  # Seconds between full-state resync commands
+
+# Gesture preset settings
+GESTURE_PRESETS = False  # Trigger the Arduino's preset motions for held gestures
+GESTURE_CONFIG = {
+    'enter_frames': 8,  # Frames a gesture must hold before the preset is sent
+    'exit_frames': 4,   # Frames without the gesture before streaming resumes
+}
@@ -1,4 +1,16 @@
-
 # hand_tracking/__init__.py
-from .hand_detector import HandDetector
-from .angle_calculator import AngleCalculator
\ No newline at end of file
+# Submodules are loaded on first access so that importing the package does not
+# pull in OpenCV/MediaPipe for tools that only need part of it.
+from utils.lazy_import import lazy_exports
+
+__all__ = ['HandDetector', 'AngleCalculator', 'GestureRecognizer', 'HybridHandTracker', 'PresenceGate', 'SyntheticHandGenerator', 'landmarks_to_array']
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'HandDetector': '.hand_detector',
+    'AngleCalculator': '.angle_calculator',
+    'GestureRecognizer': '.gesture_recognizer',
+    'HybridHandTracker': '.flow_tracker',
+    'PresenceGate': '.presence_gate',
+    'SyntheticHandGenerator': '.synthetic_hands',
+    'landmarks_to_array': '.landmarks',
+})
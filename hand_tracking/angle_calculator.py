@@ -84,6 +84,29 @@ class AngleCalculator:
         self.prev_angles = servo_angles.copy()
         return servo_angles
     
+    def map_to_servo_batch(self, raw_angles: np.ndarray, names: Tuple[str, ...]) -> np.ndarray:
+        """
+        Vectorized servo mapping of many frames, without smoothing.
+        
+        Gives the same values as calculate_servo_angles with smooth_factor 0.
+        
+        Args:
+            raw_angles: Raw angles of shape (N, len(names)), in degrees
+            names: Finger name of each column
+            
+        Returns:
+            Servo angles (0-180) of shape (N, len(names)), int16
+        """
+        raw_angles = np.asarray(raw_angles, dtype=np.float64)
+        servo = np.empty(raw_angles.shape, dtype=np.int16)
+        for column, finger in enumerate(names):
+            min_angle, max_angle = self.angle_ranges.get(finger, (120, 170))
+            # Thumb joints map in the opposite direction
+            target = [0, 180] if finger.startswith('thumb') else [180, 0]
+            mapped = np.interp(raw_angles[:, column], [min_angle, max_angle], target)
+            servo[:, column] = np.clip(mapped.astype(np.int64), 0, 180)
+        return servo
+    
     def _calculate_angle(self, a, b, c) -> float:
         """
         Calculate angle between three points.
@@ -0,0 +1,238 @@
+"""
+Hybrid hand tracking: MediaPipe inference every few frames, optical flow in between.
+
+Full inference runs every ``detect_interval`` frames, when MediaPipe's
+confidence is low, or when tracking drifts. In between, the previous 21
+landmarks are propagated with sparse pyramidal Lucas-Kanade optical flow
+(cv2.calcOpticalFlowPyrLK) on a small grayscale region of interest around
+the hand. Each point is tracked forwards and then backwards; points that do
+not return close to where they started are treated as drifting. If too many
+points drift, the detector runs on the same frame.
+
+HybridHandTracker.detect_hands() returns an object with the same
+``multi_hand_landmarks`` layout as MediaPipe's results, so AngleCalculator
+and the drawing code work unchanged.
+"""
+import copy
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .landmarks import NUM_LANDMARKS, HandLandmarks, array_to_landmarks
+
+DEFAULT_FLOW_CONFIG = {
+    'detect_interval': 3,    # Run MediaPipe every N frames (1 = every frame)
+    'min_confidence': 0.8,   # Re-detect on the next frame below this handedness score
+    'max_fb_error': 1.5,     # Forward-backward error (pixels) above which a point drifted
+    'min_valid_ratio': 0.8,  # Fraction of points that must track for propagation to be used
+    'roi_margin': 0.3,       # ROI padding around the landmarks, relative to hand size
+    'min_roi_size': 64,      # Minimum ROI side in pixels
+    'win_size': 15,          # Lucas-Kanade window size
+    'max_level': 2,          # Pyramid levels
+}
+
+_LK_CRITERIA = (cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 20, 0.03)
+
+
+class TrackingResult(NamedTuple):
+    """Detection result with MediaPipe's ``multi_hand_landmarks`` layout."""
+    multi_hand_landmarks: Optional[List]
+    multi_handedness: Optional[List] = None
+    propagated: bool = False  # Landmarks came from optical flow, not inference
+
+
+class HybridHandTracker:
+    """
+    Wraps a HandDetector and fills the frames between inferences with
+    optical-flow propagated landmarks.
+    """
+    def __init__(self, detector, config: Optional[Dict] = None):
+        """
+        Initialize the tracker.
+
+        Args:
+            detector: HandDetector (or any object with detect_hands(frame))
+            config: Overrides for DEFAULT_FLOW_CONFIG
+        """
+        self.detector = detector
+        self.config = dict(DEFAULT_FLOW_CONFIG, **(config or {}))
+        win = self.config['win_size']
+        self._lk_params = dict(winSize=(win, win), maxLevel=self.config['max_level'],
+                               criteria=_LK_CRITERIA)
+
+        self.detections = 0
+        self.propagations = 0
+        self.drift_resets = 0
+        self.reset()
+
+    def reset(self):
+        """
+        Forget the tracked hand; the next frame runs full inference.
+        """
+        self._points = None       # (21, 2) float32 pixel coordinates
+        self._z = None            # (21,) depth from the last inference
+        self._template = None     # Last detected landmark object, reused for output
+        self._handedness = None
+        self._roi = None          # (x0, y0, x1, y1) of the stored grayscale patch
+        self._prev_patch = None
+        self._since_detection = 0
+        self._force_detection = True
+
+    def detect_hands(self, frame) -> TrackingResult:
+        """
+        Detect or propagate the hand in a frame.
+
+        Args:
+            frame: Camera frame in BGR format
+
+        Returns:
+            TrackingResult with at most one hand
+        """
+        if (not self._force_detection and self._points is not None
+                and self._since_detection < self.config['detect_interval']):
+            result = self._propagate(frame)
+            if result is not None:
+                return result
+            self.drift_resets += 1
+        return self._detect(frame)
+
+    def _detect(self, frame) -> TrackingResult:
+        results = self.detector.detect_hands(frame)
+        self.detections += 1
+        if not results.multi_hand_landmarks:
+            self.reset()
+            return TrackingResult(None, None, False)
+
+        hand = results.multi_hand_landmarks[0]
+        handedness = results.multi_handedness[0] if getattr(results, 'multi_handedness', None) else None
+        height, width = frame.shape[:2]
+        landmarks = hand.landmark
+        self._points = np.array([(lm.x * width, lm.y * height) for lm in landmarks], dtype=np.float32)
+        self._z = np.array([lm.z for lm in landmarks], dtype=np.float32)
+        self._template = hand
+        self._handedness = handedness
+        self._since_detection = 1
+        self._force_detection = _score(handedness) < self.config['min_confidence']
+        self._store_patch(frame)
+        return TrackingResult([hand], [handedness] if handedness is not None else None, False)
+
+    def _propagate(self, frame) -> Optional[TrackingResult]:
+        """
+        Track the landmarks into ``frame``.
+
+        Returns:
+            TrackingResult, or None if tracking failed and inference is needed
+        """
+        x0, y0, x1, y1 = self._roi
+        patch = cv2.cvtColor(frame[y0:y1, x0:x1], cv2.COLOR_BGR2GRAY)
+        if patch.shape != self._prev_patch.shape:
+            return None
+
+        offset = np.array([x0, y0], dtype=np.float32)
+        start = (self._points - offset).reshape(-1, 1, 2)
+        forward, status, _ = cv2.calcOpticalFlowPyrLK(self._prev_patch, patch, start, None, **self._lk_params)
+        if forward is None:
+            return None
+        backward, back_status, _ = cv2.calcOpticalFlowPyrLK(patch, self._prev_patch, forward, None,
+                                                            **self._lk_params)
+        if backward is None:
+            return None
+
+        fb_error = np.linalg.norm((backward - start).reshape(-1, 2), axis=1)
+        valid = (status.ravel() == 1) & (back_status.ravel() == 1) & (fb_error < self.config['max_fb_error'])
+        if valid.sum() < self.config['min_valid_ratio'] * NUM_LANDMARKS:
+            return None
+
+        moved = forward.reshape(-1, 2) + offset
+        if not valid.all():
+            # Carry drifting points along with the hand's median motion
+            shift = np.median(moved[valid] - self._points[valid], axis=0)
+            moved[~valid] = self._points[~valid] + shift
+
+        height, width = frame.shape[:2]
+        if (moved < 0).any() or (moved[:, 0] >= width).any() or (moved[:, 1] >= height).any():
+            return None
+
+        self._points = moved.astype(np.float32)
+        self._since_detection += 1
+        self.propagations += 1
+        self._store_patch(frame, patch)
+        hand = self._hand_from_points(width, height)
+        return TrackingResult([hand], [self._handedness] if self._handedness is not None else None, True)
+
+    def _store_patch(self, frame, patch: Optional[np.ndarray] = None):
+        """
+        Store the grayscale ROI around the current points for the next frame.
+
+        Args:
+            frame: Current frame
+            patch: Grayscale crop of ``self._roi`` from this frame, if already computed
+        """
+        roi = self._roi_around(self._points, frame.shape[1], frame.shape[0])
+        if patch is None or roi != self._roi:
+            x0, y0, x1, y1 = roi
+            patch = cv2.cvtColor(frame[y0:y1, x0:x1], cv2.COLOR_BGR2GRAY)
+        self._roi = roi
+        self._prev_patch = patch
+
+    def _roi_around(self, points: np.ndarray, width: int, height: int) -> Tuple[int, int, int, int]:
+        low = points.min(axis=0)
+        high = points.max(axis=0)
+        size = max(float((high - low).max()), 1.0)
+        pad = max(size * self.config['roi_margin'], (self.config['min_roi_size'] - size) / 2, 0.0)
+        x0 = int(max(0, low[0] - pad))
+        y0 = int(max(0, low[1] - pad))
+        x1 = int(min(width, high[0] + pad + 1))
+        y1 = int(min(height, high[1] + pad + 1))
+        return x0, y0, x1, y1
+
+    def _hand_from_points(self, width: int, height: int):
+        """
+        Build a landmark object from the propagated points, keeping the type
+        of the detector's output so drawing utilities accept it.
+        """
+        normalized = self._points / np.array([width, height], dtype=np.float32)
+        try:
+            hand = copy.deepcopy(self._template)
+            for lm, (x, y) in zip(hand.landmark, normalized):
+                lm.x = float(x)
+                lm.y = float(y)
+            return hand
+        except (AttributeError, TypeError):
+            points = np.column_stack([normalized, self._z])
+            return HandLandmarks(array_to_landmarks(points))
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Returns:
+            Counts of inferences, propagated frames and drift resets, and the
+            fraction of frames that skipped inference
+        """
+        total = self.detections + self.propagations
+        return {
+            'detections': self.detections,
+            'propagations': self.propagations,
+            'drift_resets': self.drift_resets,
+            'skip_ratio': self.propagations / total if total else 0.0,
+        }
+
+    def draw_landmarks(self, frame, multi_hand_landmarks):
+        """
+        Draw landmarks with the wrapped detector.
+        """
+        return self.detector.draw_landmarks(frame, multi_hand_landmarks)
+
+    def close(self):
+        """
+        Release the wrapped detector.
+        """
+        self.detector.close()
+
+
+def _score(handedness) -> float:
+    """Handedness classification score of a MediaPipe result (1.0 if unknown)."""
+    try:
+        return float(handedness.classification[0].score)
+    except (AttributeError, IndexError, TypeError):
+        return 1.0
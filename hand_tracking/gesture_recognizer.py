@@ -0,0 +1,214 @@
+"""
+Static and dynamic gesture recognition from hand landmarks.
+
+Recognizes the poses that have a matching preset in the Arduino sketch
+(open, close, thumbsup, point, pinch, wave) from geometric features of the
+(21, 3) landmark array, with temporal hysteresis so a gesture only becomes
+active after it has been held for a number of frames.
+"""
+import numpy as np
+from collections import deque
+from typing import Dict, Optional
+
+from .landmarks import FINGER_PIPS, FINGER_TIPS, WRIST
+
+# Gesture labels, indexed by the codes returned from classify_batch
+GESTURES = ('open', 'close', 'thumbsup', 'point', 'pinch', 'wave')
+NO_GESTURE = -1
+
+_OPEN, _CLOSE, _THUMBSUP, _POINT, _PINCH, _WAVE = range(len(GESTURES))
+
+_INDEX_MCP = 5
+_MIDDLE_MCP = 9
+
+DEFAULT_GESTURE_CONFIG = {
+    'extend_ratio': 1.15,     # Tip/PIP distance ratio above which a finger is extended
+    'fold_ratio': 1.0,        # Tip/PIP distance ratio below which a finger is folded
+    'pinch_distance': 0.35,   # Thumb-index tip distance (in palm lengths) for a pinch
+    'enter_frames': 8,        # Frames a gesture must hold before it activates
+    'exit_frames': 4,         # Frames without the gesture before it deactivates
+    'wave_window': 30,        # Frames of wrist history used for wave detection
+    'wave_reversals': 3,      # Direction changes needed to count as a wave
+    'wave_amplitude': 0.25,   # Minimum swing between reversals (in palm lengths)
+}
+
+
+def _norm(vectors: np.ndarray) -> np.ndarray:
+    return np.sqrt(np.sum(vectors * vectors, axis=-1))
+
+
+def finger_features(points: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Compute geometric features for one or more hands.
+
+    Only x and y are used, matching AngleCalculator.
+
+    Args:
+        points: Landmark array of shape (21, 3) or (N, 21, 3)
+
+    Returns:
+        Dictionary with:
+            'ratios': (..., 5) tip-to-reference / PIP-to-reference distance per finger
+                      (reference is the wrist, or the index MCP for the thumb)
+            'pinch': (...) thumb-index tip distance in palm lengths
+            'thumb_up': (...) True if the thumb tip is above the wrist
+    """
+    xy = np.asarray(points, dtype=np.float32)[..., :2]
+    wrist = xy[..., WRIST, :]
+    palm = _norm(xy[..., _MIDDLE_MCP, :] - wrist)
+    palm = np.maximum(palm, 1e-6)
+
+    reference = np.repeat(wrist[..., None, :], len(FINGER_TIPS), axis=-2)
+    reference[..., 0, :] = xy[..., _INDEX_MCP, :]
+
+    tips = xy[..., list(FINGER_TIPS), :]
+    pips = xy[..., list(FINGER_PIPS), :]
+    ratios = _norm(tips - reference) / np.maximum(_norm(pips - reference), 1e-6)
+
+    pinch = _norm(xy[..., FINGER_TIPS[0], :] - xy[..., FINGER_TIPS[1], :]) / palm
+    thumb_up = xy[..., FINGER_TIPS[0], 1] < wrist[..., 1]
+    return {'ratios': ratios, 'pinch': pinch, 'thumb_up': thumb_up}
+
+
+def classify_batch(points: np.ndarray, config: Optional[Dict] = None) -> np.ndarray:
+    """
+    Classify static gestures for a batch of hands.
+
+    Args:
+        points: Landmark array of shape (N, 21, 3)
+        config: Recognizer configuration (defaults to DEFAULT_GESTURE_CONFIG)
+
+    Returns:
+        Array of shape (N,) with indices into GESTURES, or NO_GESTURE
+    """
+    cfg = dict(DEFAULT_GESTURE_CONFIG, **(config or {}))
+    features = finger_features(points)
+    ratios = features['ratios']
+    extended = ratios > cfg['extend_ratio']
+    folded = ratios < cfg['fold_ratio']
+
+    thumb_ext, index_ext = extended[..., 0], extended[..., 1]
+    index_fold = folded[..., 1]
+    others_fold = np.all(folded[..., 2:], axis=-1)
+
+    # In a pinch the index is half bent: neither extended nor curled into a fist
+    is_pinch = ((features['pinch'] < cfg['pinch_distance']) & others_fold &
+                ~index_ext & ~index_fold)
+    is_thumbsup = thumb_ext & features['thumb_up'] & index_fold & others_fold
+    is_point = index_ext & others_fold & ~thumb_ext
+    is_close = index_fold & others_fold & ~thumb_ext
+    is_open = np.all(extended, axis=-1)
+
+    # Later entries take priority when several conditions hold
+    labels = np.full(ratios.shape[:-1], NO_GESTURE, dtype=np.int8)
+    for code, mask in ((_OPEN, is_open), (_CLOSE, is_close), (_POINT, is_point),
+                       (_THUMBSUP, is_thumbsup), (_PINCH, is_pinch)):
+        labels[mask] = code
+    return labels
+
+
+class GestureRecognizer:
+    """
+    Frame-by-frame gesture recognizer with temporal hysteresis.
+    """
+    def __init__(self, config: Optional[Dict] = None):
+        """
+        Initialize the recognizer.
+
+        Args:
+            config: Overrides for DEFAULT_GESTURE_CONFIG
+        """
+        self.config = dict(DEFAULT_GESTURE_CONFIG, **(config or {}))
+        self.active_gesture = None
+        self._candidate = None
+        self._candidate_frames = 0
+        self._miss_frames = 0
+        self._wrist_history = deque(maxlen=self.config['wave_window'])
+
+    def reset(self):
+        """
+        Clear the active gesture and temporal history (e.g. when the hand is lost).
+        """
+        self.active_gesture = None
+        self._candidate = None
+        self._candidate_frames = 0
+        self._miss_frames = 0
+        self._wrist_history.clear()
+
+    def classify(self, points: np.ndarray) -> Optional[str]:
+        """
+        Classify a single frame, including the wave gesture.
+
+        Args:
+            points: Landmark array of shape (21, 3)
+
+        Returns:
+            Gesture name, or None
+        """
+        points = np.asarray(points, dtype=np.float32)
+        code = int(classify_batch(points[None], self.config)[0])
+
+        palm = float(np.linalg.norm(points[9, :2] - points[WRIST, :2])) or 1e-6
+        self._wrist_history.append(points[WRIST, 0] / palm)
+
+        if code == _OPEN and self._is_waving():
+            return 'wave'
+        return GESTURES[code] if code != NO_GESTURE else None
+
+    def _is_waving(self) -> bool:
+        """Count large direction reversals of the wrist in the recent history."""
+        if len(self._wrist_history) < 3:
+            return False
+        positions = np.fromiter(self._wrist_history, dtype=np.float32)
+        reversals = 0
+        direction = 0
+        extreme = positions[0]
+        for x in positions[1:]:
+            swing = x - extreme
+            if direction >= 0 and swing < -self.config['wave_amplitude']:
+                reversals += direction > 0
+                direction, extreme = -1, x
+            elif direction <= 0 and swing > self.config['wave_amplitude']:
+                reversals += direction < 0
+                direction, extreme = 1, x
+            elif (direction > 0 and x > extreme) or (direction < 0 and x < extreme):
+                extreme = x
+        return reversals >= self.config['wave_reversals']
+
+    def update(self, points: np.ndarray) -> Optional[str]:
+        """
+        Feed one frame and return the gesture that is currently held.
+
+        A gesture becomes active after ``enter_frames`` consecutive matching
+        frames and stays active until ``exit_frames`` consecutive frames no
+        longer match it.
+
+        Args:
+            points: Landmark array of shape (21, 3)
+
+        Returns:
+            Active gesture name, or None while the hand is moving freely
+        """
+        gesture = self.classify(points)
+
+        if gesture is not None and gesture == self._candidate:
+            self._candidate_frames += 1
+        else:
+            self._candidate = gesture
+            self._candidate_frames = 1
+
+        if self.active_gesture is not None:
+            if gesture == self.active_gesture:
+                self._miss_frames = 0
+            else:
+                self._miss_frames += 1
+                if self._miss_frames >= self.config['exit_frames']:
+                    self.active_gesture = None
+                    self._miss_frames = 0
+
+        if (gesture is not None and gesture != self.active_gesture and
+                self._candidate_frames >= self.config['enter_frames']):
+            self.active_gesture = gesture
+            self._miss_frames = 0
+
+        return self.active_gesture
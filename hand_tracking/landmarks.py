@@ -0,0 +1,85 @@
+"""
+Conversions between MediaPipe landmark objects and NumPy arrays.
+"""
+import numpy as np
+from typing import List, NamedTuple, Optional
+
+NUM_LANDMARKS = 21
+
+# MediaPipe hand landmark indices
+WRIST = 0
+FINGER_TIPS = (4, 8, 12, 16, 20)
+FINGER_PIPS = (3, 6, 10, 14, 18)
+FINGER_MCPS = (2, 5, 9, 13, 17)
+
+# Bones between landmarks (same topology as mp.solutions.hands.HAND_CONNECTIONS)
+HAND_CONNECTIONS = (
+    (0, 1), (1, 2), (2, 3), (3, 4),
+    (0, 5), (5, 6), (6, 7), (7, 8),
+    (5, 9), (9, 10), (10, 11), (11, 12),
+    (9, 13), (13, 14), (14, 15), (15, 16),
+    (13, 17), (0, 17), (17, 18), (18, 19), (19, 20),
+)
+
+
+class Landmark(NamedTuple):
+    """
+    Minimal stand-in for a MediaPipe ``NormalizedLandmark``.
+
+    Exposes ``x``, ``y`` and ``z`` so it can be passed to ``AngleCalculator``.
+    """
+    x: float
+    y: float
+    z: float = 0.0
+
+
+class HandLandmarks(NamedTuple):
+    """Stand-in for a MediaPipe ``NormalizedLandmarkList``."""
+    landmark: list
+
+
+class Category(NamedTuple):
+    """Stand-in for a MediaPipe ``Classification`` entry."""
+    label: str
+    score: float = 1.0
+    index: int = 0
+
+
+class Handedness(NamedTuple):
+    """Stand-in for a MediaPipe ``ClassificationList``."""
+    classification: list
+
+
+class DetectionResult(NamedTuple):
+    """Stand-in for the results of ``mp.solutions.hands.Hands.process``."""
+    multi_hand_landmarks: Optional[List[HandLandmarks]]
+    multi_handedness: Optional[List[Handedness]] = None
+
+
+def landmarks_to_array(landmarks) -> np.ndarray:
+    """
+    Convert a sequence of landmarks to an array.
+
+    Args:
+        landmarks: 21 objects with x, y, z attributes (e.g. hand_landmarks.landmark)
+
+    Returns:
+        Array of shape (21, 3)
+    """
+    return np.array([(lm.x, lm.y, lm.z) for lm in landmarks], dtype=np.float32)
+
+
+def array_to_landmarks(points: np.ndarray) -> List[Landmark]:
+    """
+    Convert an array of landmark positions to landmark objects.
+
+    Args:
+        points: Array of shape (21, 3) or (21, 2)
+
+    Returns:
+        List of Landmark objects
+    """
+    points = np.asarray(points, dtype=np.float64)
+    if points.shape[-1] == 2:
+        return [Landmark(float(x), float(y)) for x, y in points]
+    return [Landmark(float(x), float(y), float(z)) for x, y, z in points]
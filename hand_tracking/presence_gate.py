@@ -0,0 +1,147 @@
+"""
+Cheap hand-presence gate in front of the hand detector.
+
+After ``idle_after`` consecutive frames without a hand the gate switches to
+idle mode. There, each frame is only downsampled to a thumbnail and checked
+for two cues:
+
+  * motion energy: fraction of thumbnail pixels whose gray level changed
+    since the previous idle frame
+  * skin occupancy: increase of the skin-coloured (YCrCb) fraction over the
+    scene's baseline, which catches a hand that enters slowly
+
+If either cue passes its threshold, the gate wakes on that same frame and
+full tracking resumes. While idle the caller runs at ``idle_fps`` and skips
+MediaPipe entirely. Every ``recheck_frames`` idle frames the detector runs
+once anyway, as a safety net for a perfectly still hand.
+"""
+from typing import Dict, Optional
+
+import cv2
+import numpy as np
+
+DEFAULT_PRESENCE_CONFIG = {
+    'size': (64, 48),         # Thumbnail (width, height) the cues are computed on
+    'pixel_threshold': 25,    # Gray-level change that counts as motion
+    'motion_ratio': 0.02,     # Fraction of moving pixels that wakes the gate
+    'skin_ratio': 0.03,       # Skin fraction above the baseline that wakes the gate
+    'baseline_rate': 0.05,    # Adaptation rate of the skin baseline while idle
+    'idle_after': 30,         # Frames without a hand before going idle
+    'idle_fps': 10,           # Frame rate while idle
+    'recheck_frames': 50,     # Run the detector every N idle frames (0 = never)
+}
+
+# Skin range in YCrCb (Cr, Cb); Y is unconstrained
+_SKIN_LOW = np.array([0, 133, 77], dtype=np.uint8)
+_SKIN_HIGH = np.array([255, 173, 127], dtype=np.uint8)
+
+
+class PresenceGate:
+    """
+    Decides per frame whether the hand detector needs to run.
+    """
+    def __init__(self, config: Optional[Dict] = None):
+        """
+        Initialize the gate in active mode.
+
+        Args:
+            config: Overrides for DEFAULT_PRESENCE_CONFIG
+        """
+        self.config = dict(DEFAULT_PRESENCE_CONFIG, **(config or {}))
+        self.idle = False
+        self.wakeups = 0
+        self.frames_skipped = 0
+        self.motion = 0.0
+        self.skin = 0.0
+        self._misses = 0
+        self._idle_frames = 0
+        self._prev_gray = None
+        self._skin_baseline = None
+
+    @property
+    def idle_period(self) -> float:
+        """Seconds between frames while idle."""
+        return 1.0 / self.config['idle_fps']
+
+    def check(self, frame) -> bool:
+        """
+        Decide whether to run the detector on a frame.
+
+        Args:
+            frame: Camera frame in BGR format
+
+        Returns:
+            True if the detector should run
+        """
+        if not self.idle:
+            return True
+
+        small = cv2.resize(frame, self.config['size'], interpolation=cv2.INTER_NEAREST)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        skin = cv2.inRange(cv2.cvtColor(small, cv2.COLOR_BGR2YCrCb), _SKIN_LOW, _SKIN_HIGH)
+        self.skin = float(np.count_nonzero(skin)) / skin.size
+
+        if self._prev_gray is None:
+            self.motion = 0.0
+            self._skin_baseline = self.skin
+        else:
+            changed = cv2.absdiff(gray, self._prev_gray) > self.config['pixel_threshold']
+            self.motion = float(np.count_nonzero(changed)) / changed.size
+        self._prev_gray = gray
+
+        if (self.motion >= self.config['motion_ratio']
+                or self.skin - self._skin_baseline >= self.config['skin_ratio']):
+            self._wake()
+            return True
+
+        rate = self.config['baseline_rate']
+        self._skin_baseline += rate * (self.skin - self._skin_baseline)
+        self._idle_frames += 1
+        recheck = self.config['recheck_frames']
+        if recheck and self._idle_frames % recheck == 0:
+            return True
+        self.frames_skipped += 1
+        return False
+
+    def report(self, hand_detected: bool):
+        """
+        Feed back the detector's result for a frame that passed the gate.
+
+        Args:
+            hand_detected: Whether a hand was found
+        """
+        if hand_detected:
+            self._misses = 0
+            if self.idle:
+                # Found by a recheck
+                self._wake()
+            return
+        if self.idle:
+            return
+        self._misses += 1
+        if self._misses >= self.config['idle_after']:
+            self._enter_idle()
+
+    def _wake(self):
+        self.idle = False
+        self.wakeups += 1
+        self._misses = 0
+
+    def _enter_idle(self):
+        self.idle = True
+        self._idle_frames = 0
+        self._prev_gray = None
+        self._skin_baseline = None
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Returns:
+            Wake-ups, skipped frames and the latest cue values
+        """
+        return {
+            'idle': self.idle,
+            'wakeups': self.wakeups,
+            'frames_skipped': self.frames_skipped,
+            'motion': self.motion,
+            'skin': self.skin,
+        }
@@ -0,0 +1,298 @@
+"""
+Deterministic synthetic hand poses with ground truth.
+
+A simple kinematic hand model turns finger joint angles into the 21
+MediaPipe landmarks. The palm lies in the hand's x-y plane, facing the
+camera, with the fingers pointing along +y. Each finger is a chain of bones
+from its knuckle, and flexing a joint rotates the rest of the chain towards
+the camera (-z, which MediaPipe also uses for "closer"). The thumb curls
+across the palm instead. The posed hand is then mirrored for a left hand,
+rotated by a view rotation, scaled and placed in normalized image
+coordinates.
+
+SyntheticHandGenerator produces seedable batches of poses as (N, 21, 3)
+arrays together with their ground truth:
+  * joint_angles: (N, 5, 3) flexion of each finger's three joints, degrees
+  * raw_angles:   (N, 6) angles AngleCalculator.calculate_raw_angles measures
+                  on the noise-free landmarks, in ANGLE_NAMES order
+Optional landmark noise, whole-frame dropouts (NaN rows, like the
+batch_process.py output) and random handedness make the streams realistic.
+``to_results`` wraps poses in MediaPipe-compatible result objects.
+
+Usage:
+    generator = SyntheticHandGenerator(seed=1, noise=0.003, dropout=0.02)
+    poses = generator.generate(100000, stream=True)
+    for batch in generator.iter_batches(10_000_000):
+        ...
+"""
+from typing import Iterator, List, NamedTuple, Optional
+
+import numpy as np
+
+from .landmarks import (NUM_LANDMARKS, Category, DetectionResult, Handedness, HandLandmarks,
+                        array_to_landmarks)
+
+FINGERS = ('thumb', 'index', 'middle', 'ring', 'pinky')
+ANGLE_NAMES = ('thumb_mcp', 'thumb_ip', 'index', 'middle', 'ring', 'pinky')
+HANDEDNESS = ('Right', 'Left')
+
+# Landmark triplets (a, b, c) whose angle at b AngleCalculator measures, in ANGLE_NAMES order
+ANGLE_TRIPLETS = np.array([(1, 2, 3), (2, 3, 4), (5, 6, 8), (9, 10, 12), (13, 14, 16), (17, 18, 20)])
+
+# Right hand, palm towards the camera, in palm lengths (wrist to middle knuckle = 1).
+# Landmark 1 (thumb CMC) and the four knuckles are fixed on the palm.
+_THUMB_CMC = (0.25, 0.22, 0.0)
+_KNUCKLES = np.array([(0.32, 0.92, 0.0), (0.10, 1.0, 0.0), (-0.12, 0.95, 0.0), (-0.32, 0.84, 0.0)])
+# Bone lengths after the fixed base point (thumb: CMC-MCP, MCP-IP, IP-tip)
+_BONES = np.array([
+    (0.38, 0.30, 0.25),
+    (0.45, 0.27, 0.22),
+    (0.50, 0.30, 0.23),
+    (0.46, 0.28, 0.22),
+    (0.36, 0.21, 0.19),
+])
+# In-plane direction of each straight finger, degrees from +y towards +x
+_SPREAD = np.array([55.0, 8.0, 0.0, -8.0, -18.0])
+# Flexion of each joint at a full fist, degrees
+_MAX_FLEXION = np.array([
+    (35.0, 55.0, 75.0),
+    (85.0, 105.0, 65.0),
+    (85.0, 105.0, 65.0),
+    (85.0, 105.0, 65.0),
+    (85.0, 105.0, 65.0),
+])
+# Base point index of each finger chain; the chain adds the next three landmarks
+_BASES = (1, 5, 9, 13, 17)
+
+
+class SyntheticPoses(NamedTuple):
+    """A batch of synthetic poses and their ground truth."""
+    points: np.ndarray        # (N, 21, 3) float32 normalized landmarks, NaN where dropped
+    clean_points: np.ndarray  # (N, 21, 3) float32 landmarks without noise or dropouts
+    joint_angles: np.ndarray  # (N, 5, 3) float32 joint flexion in degrees, FINGERS order
+    raw_angles: np.ndarray    # (N, 6) float32 AngleCalculator raw angles of clean_points
+    detected: np.ndarray      # (N,) bool, False for dropped frames
+    handedness: np.ndarray    # (N,) int8 index into HANDEDNESS
+
+
+def raw_angles(points: np.ndarray) -> np.ndarray:
+    """
+    Vectorized AngleCalculator.calculate_raw_angles.
+
+    Args:
+        points: Landmarks of shape (..., 21, 3) or (..., 21, 2)
+
+    Returns:
+        Angles in degrees of shape (..., 6), in ANGLE_NAMES order
+    """
+    xy = np.asarray(points, dtype=np.float64)[..., :2]
+    a, b, c = (xy[..., ANGLE_TRIPLETS[:, i], :] for i in range(3))
+    ba = a - b
+    bc = c - b
+    cosine = np.sum(ba * bc, axis=-1) / (np.linalg.norm(ba, axis=-1) * np.linalg.norm(bc, axis=-1))
+    return np.degrees(np.arccos(np.clip(cosine, -1.0, 1.0)))
+
+
+def _rotation(yaw: np.ndarray, pitch: np.ndarray, roll: np.ndarray) -> np.ndarray:
+    """Rotation matrices (N, 3, 3) for angles in radians (pitch about x, yaw about y, roll about z)."""
+    cy, sy = np.cos(yaw), np.sin(yaw)
+    cp, sp = np.cos(pitch), np.sin(pitch)
+    cr, sr = np.cos(roll), np.sin(roll)
+    one, zero = np.ones_like(yaw), np.zeros_like(yaw)
+    rx = np.stack([one, zero, zero, zero, cp, -sp, zero, sp, cp], -1).reshape(-1, 3, 3)
+    ry = np.stack([cy, zero, sy, zero, one, zero, -sy, zero, cy], -1).reshape(-1, 3, 3)
+    rz = np.stack([cr, -sr, zero, sr, cr, zero, zero, zero, one], -1).reshape(-1, 3, 3)
+    return rz @ ry @ rx
+
+
+def pose_hands(joint_angles: np.ndarray) -> np.ndarray:
+    """
+    Forward kinematics of the right-hand model.
+
+    Args:
+        joint_angles: Joint flexion in degrees, shape (N, 5, 3)
+
+    Returns:
+        Landmarks in hand coordinates (palm lengths, wrist at the origin), shape (N, 21, 3)
+    """
+    joint_angles = np.asarray(joint_angles, dtype=np.float64)
+    n = len(joint_angles)
+    points = np.zeros((n, NUM_LANDMARKS, 3))
+    points[:, 1] = _THUMB_CMC
+    points[:, (5, 9, 13, 17)] = _KNUCKLES
+
+    spread = np.radians(_SPREAD)
+    straight = np.stack([np.sin(spread), np.cos(spread), np.zeros(5)], -1)  # (5, 3)
+    # Direction the chain turns towards when flexing
+    curl = np.tile([0.0, 0.0, -1.0], (5, 1))
+    curl[0] = (-0.55, 0.35, -0.75)  # Thumb folds across the palm
+    curl[0] /= np.linalg.norm(curl[0])
+
+    cumulative = np.radians(np.cumsum(joint_angles, axis=2))  # (N, 5, 3)
+    for finger, base in enumerate(_BASES):
+        position = points[:, base]
+        for joint in range(3):
+            theta = cumulative[:, finger, joint, None]
+            direction = np.cos(theta) * straight[finger] + np.sin(theta) * curl[finger]
+            position = position + _BONES[finger, joint] * direction
+            points[:, base + joint + 1] = position
+    return points
+
+
+class SyntheticHandGenerator:
+    """
+    Seedable generator of synthetic hand poses.
+    """
+    def __init__(self, seed: int = 0, noise: float = 0.0, dropout: float = 0.0,
+                 handedness: Optional[str] = 'Right', scale: float = 0.22,
+                 view_jitter: float = 20.0, pitch: float = 35.0, fps: float = 30.0):
+        """
+        Initialize the generator.
+
+        Args:
+            seed: Random seed; the same seed yields the same poses
+            noise: Standard deviation of landmark noise, in normalized image units
+            dropout: Probability that a frame has no detection
+            handedness: 'Right', 'Left' or None for a random hand per pose/stream
+            scale: Palm length in normalized image units
+            view_jitter: Standard deviation of the view rotation, degrees
+            pitch: Mean tilt of the palm away from the camera, degrees
+                (makes finger flexion visible in the image plane)
+            fps: Frame rate of generated streams
+        """
+        if handedness is not None and handedness not in HANDEDNESS:
+            raise ValueError(f"handedness must be one of {HANDEDNESS} or None")
+        self.rng = np.random.default_rng(seed)
+        self.noise = noise
+        self.dropout = dropout
+        self.handedness = handedness
+        self.scale = scale
+        self.view_jitter = view_jitter
+        self.pitch = pitch
+        self.fps = fps
+
+    def _curls(self, n: int, stream: bool) -> np.ndarray:
+        """Finger curl in [0, 1], shape (n, 5); smooth over time for streams."""
+        if not stream:
+            return self.rng.random((n, 5))
+        t = np.arange(n)[:, None, None] / self.fps
+        freqs = self.rng.uniform(0.05, 0.6, (1, 5, 3))
+        phases = self.rng.uniform(0, 2 * np.pi, (1, 5, 3))
+        waves = np.sin(2 * np.pi * freqs * t + phases).sum(axis=2) / 3
+        # Shared component: the whole hand tends to open and close together
+        shared = np.sin(2 * np.pi * self.rng.uniform(0.05, 0.3) * t[:, :, 0] + self.rng.uniform(0, 2 * np.pi))
+        return np.clip(0.5 + 0.6 * (0.6 * waves + 0.4 * shared), 0.0, 1.0)
+
+    def _views(self, n: int, stream: bool) -> np.ndarray:
+        """View angles in radians (yaw, pitch, roll), shape (n, 3)."""
+        mean = np.radians([0.0, self.pitch, 0.0])
+        jitter = np.radians(self.view_jitter)
+        if not stream:
+            return mean + self.rng.normal(0, jitter, (n, 3))
+        t = np.arange(n)[:, None] / self.fps
+        drift = np.sin(2 * np.pi * self.rng.uniform(0.02, 0.2, 3) * t + self.rng.uniform(0, 2 * np.pi, 3))
+        return mean + jitter * drift
+
+    def sample_joint_angles(self, n: int, stream: bool = False) -> np.ndarray:
+        """
+        Sample joint flexion angles.
+
+        Args:
+            n: Number of poses
+            stream: Smooth motion over time instead of independent poses
+
+        Returns:
+            Joint flexion in degrees, shape (n, 5, 3)
+        """
+        curls = self._curls(n, stream)
+        variation = 1.0 + self.rng.normal(0, 0.08, (n, 5, 3))
+        return np.clip(curls[:, :, None] * _MAX_FLEXION * variation, 0.0, None).astype(np.float32)
+
+    def generate(self, n: int, stream: bool = False) -> SyntheticPoses:
+        """
+        Generate a batch of poses.
+
+        Args:
+            n: Number of poses
+            stream: Consecutive frames of one smoothly moving hand (for
+                smoothing/streaming tests) instead of independent poses
+
+        Returns:
+            SyntheticPoses
+        """
+        joint_angles = self.sample_joint_angles(n, stream)
+        hand = pose_hands(joint_angles)
+
+        if self.handedness is not None:
+            handedness = np.full(n, HANDEDNESS.index(self.handedness), dtype=np.int8)
+        elif stream:
+            handedness = np.full(n, self.rng.integers(2), dtype=np.int8)
+        else:
+            handedness = self.rng.integers(0, 2, n).astype(np.int8)
+        hand[handedness == 1, :, 0] *= -1
+
+        yaw, pitch, roll = self._views(n, stream).T
+        hand = hand @ _rotation(yaw, pitch, roll).transpose(0, 2, 1)
+
+        # Image coordinates: y points down, wrist near the lower middle
+        if stream:
+            t = np.arange(n) / self.fps
+            center = 0.5 + 0.08 * np.sin(2 * np.pi * self.rng.uniform(0.05, 0.3, 2)[:, None] * t
+                                         + self.rng.uniform(0, 2 * np.pi, 2)[:, None])
+            center = center.T
+        else:
+            center = self.rng.uniform(0.4, 0.6, (n, 2))
+        clean = np.empty_like(hand)
+        clean[..., 0] = center[:, None, 0] + self.scale * hand[..., 0]
+        clean[..., 1] = center[:, None, 1] + 0.25 - self.scale * hand[..., 1]
+        clean[..., 2] = self.scale * hand[..., 2]
+        clean = clean.astype(np.float32)
+
+        points = clean
+        if self.noise:
+            points = clean + self.rng.normal(0, self.noise, clean.shape).astype(np.float32)
+        detected = self.rng.random(n) >= self.dropout if self.dropout else np.ones(n, dtype=bool)
+        if not detected.all():
+            points = points.copy() if points is clean else points
+            points[~detected] = np.nan
+
+        return SyntheticPoses(points, clean, joint_angles, raw_angles(clean).astype(np.float32),
+                              detected, handedness)
+
+    def iter_batches(self, total: int, batch_size: int = 100000, stream: bool = False) -> Iterator[SyntheticPoses]:
+        """
+        Generate a large number of poses in memory-bounded batches.
+
+        Args:
+            total: Total number of poses
+            batch_size: Poses per batch
+            stream: See generate(); each batch is a separate stream
+
+        Yields:
+            SyntheticPoses
+        """
+        for start in range(0, total, batch_size):
+            yield self.generate(min(batch_size, total - start), stream)
+
+
+def to_results(poses: SyntheticPoses) -> List[DetectionResult]:
+    """
+    Wrap poses in MediaPipe-compatible result objects, one per frame.
+
+    Dropped frames have ``multi_hand_landmarks`` set to None, like a frame
+    where MediaPipe found no hand.
+
+    Args:
+        poses: Output of SyntheticHandGenerator.generate()
+
+    Returns:
+        List of DetectionResult
+    """
+    results = []
+    for points, detected, hand in zip(poses.points, poses.detected, poses.handedness):
+        if not detected:
+            results.append(DetectionResult(None, None))
+            continue
+        handedness = Handedness([Category(HANDEDNESS[hand], 1.0, int(hand))])
+        results.append(DetectionResult([HandLandmarks(array_to_landmarks(points))], [handedness]))
+    return results
@@ -6,64 +6,205 @@ This program detects hand movements using a webcam and replicates them with
 a robotic hand connected to an Arduino.
 """
 import argparse
-import cv2
+import sys
 import time
 from typing import Dict, Optional, Tuple
 
 # Import project modules
+# Heavy dependencies (OpenCV, MediaPipe, PySerial) are imported by the
+# subsystems that use them, so --help and calibration start quickly.
 from config.settings import (
     MEDIAPIPE_CONFIG, 
+    FLOW_TRACKING,
+    FLOW_TRACKING_CONFIG,
+    PRESENCE_GATE,
+    PRESENCE_CONFIG,
+    CAMERA_SOURCE,
+    CAMERA_CONFIG,
     DEFAULT_SERIAL_PORT, 
     DEFAULT_BAUDRATE, 
     SERIAL_TIMEOUT,
+    TELEMETRY_INTERVAL_MS,
+    TELEMETRY_THROTTLE,
+    TELEMETRY_LIMITS,
+    FLOW_WINDOW,
+    FLOW_ACK_TIMEOUT,
+    STREAM_ADDRESS,
+    STREAM_CONFIG,
+    LANDMARK_SOURCE,
+    LANDMARK_INGEST_CONFIG,
     FINGER_ANGLE_RANGES, 
     SMOOTH_FACTOR, 
     UPDATE_INTERVAL, 
-    ANGLE_UPDATE_THRESHOLD
+    ANGLE_UPDATE_THRESHOLD,
+    TRAJECTORY_MODE,
+    TRAJECTORY_SEGMENT_MS,
+    DELTA_MODE,
+    FINGER_DEADBANDS,
+    KEYFRAME_INTERVAL,
+    GESTURE_PRESETS,
+    GESTURE_CONFIG
 )
-from hand_tracking import HandDetector, AngleCalculator
-from serial_comm import ArduinoInterface
-from utils import CalibrationSystem
-from visualization import Renderer
+from utils.import_profile import PROFILE_FLAG, run_with_import_profile
 
 class RealTimeHandMimicSystem:
     """
     Main class for the hand mimicking system.
     """
-    def __init__(self, port: str = DEFAULT_SERIAL_PORT, baudrate: int = DEFAULT_BAUDRATE):
+    def __init__(self, port: str = DEFAULT_SERIAL_PORT, baudrate: int = DEFAULT_BAUDRATE,
+                 trajectory_mode: bool = TRAJECTORY_MODE, delta_mode: bool = DELTA_MODE,
+                 gesture_presets: bool = GESTURE_PRESETS, source=CAMERA_SOURCE,
+                 trace_path: Optional[str] = None, flow_tracking: bool = FLOW_TRACKING,
+                 presence_gate: bool = PRESENCE_GATE, record_path: Optional[str] = None,
+                 telemetry_ms: int = TELEMETRY_INTERVAL_MS, flow_window: int = FLOW_WINDOW,
+                 stream_address: Optional[str] = STREAM_ADDRESS,
+                 landmark_source: Optional[str] = LANDMARK_SOURCE):
         """
         Initialize the hand mimicking system.
         
         Args:
             port: Serial port for Arduino
             baudrate: Baud rate for serial communication
+            trajectory_mode: Stream interpolated trajectory segments
+            delta_mode: Send only the fingers that changed
+            gesture_presets: Trigger Arduino presets for held gestures
+            source: Camera index, video file, image directory or 'synthetic'
+            trace_path: Record per-frame stage latencies and write a Chrome
+                trace JSON here on exit (enables command sequence numbers)
+            flow_tracking: Track landmarks with optical flow between MediaPipe inferences
+            presence_gate: Idle at a low frame rate without running MediaPipe
+                while no hand is present
+            record_path: Log every servo target sent to this motion recording
+            telemetry_ms: Board status frame period; updates are throttled
+                while the board falls behind (0 = off)
+            flow_window: Unacknowledged targets kept in flight, newest target
+                wins (0 = off)
+            stream_address: Publish per-frame angles and landmarks to local
+                subscribers on this 'tcp:HOST:PORT' or 'unix:PATH' address
+            landmark_source: Receive landmarks from a detector node on this
+                'udp:HOST:PORT' or 'tcp:HOST:PORT' address instead of running
+                MediaPipe on a local camera
         """
+        from hand_tracking import AngleCalculator, GestureRecognizer
+        
         # Initialize hand tracking components
-        self.hand_detector = HandDetector(MEDIAPIPE_CONFIG)
+        self.landmark_receiver = None
+        if landmark_source:
+            # A detector node supplies the landmarks; the receiver is both
+            # the frame source and the detector, and needs no MediaPipe
+            from streaming.landmark_ingest import LandmarkReceiver
+            self.landmark_receiver = LandmarkReceiver(landmark_source, LANDMARK_INGEST_CONFIG)
+            self.hand_detector = self.landmark_receiver
+        else:
+            from hand_tracking import HandDetector
+            self.hand_detector = HandDetector(MEDIAPIPE_CONFIG)
+        self.hand_tracker = self.hand_detector
+        if flow_tracking and self.landmark_receiver is None:
+            from hand_tracking import HybridHandTracker
+            self.hand_tracker = HybridHandTracker(self.hand_detector, FLOW_TRACKING_CONFIG)
+        self.presence_gate = None
+        if presence_gate and self.landmark_receiver is None:
+            from hand_tracking import PresenceGate
+            self.presence_gate = PresenceGate(PRESENCE_CONFIG)
         self.angle_calculator = AngleCalculator(FINGER_ANGLE_RANGES, SMOOTH_FACTOR)
         
-        # Initialize Arduino communication
-        self.arduino = ArduinoInterface(port, baudrate, SERIAL_TIMEOUT)
+        # Gesture presets pause angle streaming while a preset pose is held
+        self.gesture_recognizer = GestureRecognizer(GESTURE_CONFIG) if gesture_presets else None
+        self.active_preset = None
+        
+        # Arduino communication and visualization are created on first use;
+        # calibration mode needs neither
+        self.port = port
+        self.baudrate = baudrate
+        self.trajectory_mode = trajectory_mode
+        self.delta_mode = delta_mode
+        self.telemetry_ms = telemetry_ms
+        self.flow_window = flow_window
+        self._arduino = None
+        self._renderer = None
+        self.source = source
+        
+        # Motion recording, for playback with serial_comm.motion_recording
+        self.recorder = None
+        if record_path:
+            from serial_comm.motion_recording import MotionRecorder
+            self.recorder = MotionRecorder(record_path)
         
-        # Initialize visualization
-        self.renderer = Renderer()
+        # Angle/landmark stream for other local consumers
+        self.publisher = None
+        if stream_address:
+            from streaming import StreamPublisher
+            self.publisher = StreamPublisher(stream_address, STREAM_CONFIG)
+            try:
+                self.publisher.start()
+            except OSError as e:
+                print(f"Could not start the stream publisher on {stream_address}: {e}")
+                self.publisher = None
+        
+        # Latency tracing
+        self.trace_path = trace_path
+        self.tracer = None
+        if trace_path:
+            from utils.tracing import LatencyTracer
+            self.tracer = LatencyTracer()
         
         # Initialize frame counter
         self.frame_counter = 0
     
-    def process_frame(self, frame):
+    @property
+    def arduino(self):
+        """
+        Arduino interface, connected on first access.
+        """
+        if self._arduino is None:
+            from serial_comm import ArduinoInterface
+            self._arduino = ArduinoInterface(
+                self.port, self.baudrate, SERIAL_TIMEOUT,
+                trajectory_mode=self.trajectory_mode,
+                segment_ms=TRAJECTORY_SEGMENT_MS,
+                delta_mode=self.delta_mode,
+                deadbands=FINGER_DEADBANDS,
+                keyframe_interval=KEYFRAME_INTERVAL,
+                sequence_numbers=self.tracer is not None,
+                recorder=self.recorder,
+                telemetry_ms=self.telemetry_ms,
+                throttle=TELEMETRY_THROTTLE,
+                telemetry_limits=TELEMETRY_LIMITS,
+                flow_window=self.flow_window,
+                ack_timeout=FLOW_ACK_TIMEOUT
+            )
+        return self._arduino
+    
+    @property
+    def renderer(self):
+        """
+        Frame renderer, created on first access.
+        """
+        if self._renderer is None:
+            from visualization import Renderer
+            self._renderer = Renderer()
+        return self._renderer
+    
+    def process_frame(self, frame, trace=None, capture_time: Optional[float] = None):
         """
         Process a camera frame.
         
         Args:
             frame: Camera frame
+            trace: Optional FrameTrace to mark stage timestamps on
+            capture_time: time.monotonic() of the capture, for published records
             
         Returns:
             Processed frame
         """
         # Detect hands
-        results = self.hand_detector.detect_hands(frame)
+        results = self.hand_tracker.detect_hands(frame)
+        if trace is not None:
+            trace.mark('detect')
+        if self.presence_gate is not None:
+            self.presence_gate.report(bool(results.multi_hand_landmarks))
         
+        finger_angles = None
         # Check if hand was detected
         if results.multi_hand_landmarks:
             for hand_landmarks in results.multi_hand_landmarks:
@@ -73,30 +214,69 @@ class RealTimeHandMimicSystem:
                 # Calculate finger angles
                 landmarks = hand_landmarks.landmark
                 finger_angles = self.angle_calculator.calculate_servo_angles(landmarks)
+                if trace is not None:
+                    trace.mark('angles')
                 
-                # Send angles to Arduino
-                self.arduino.send_finger_angles(
-                    finger_angles, 
-                    UPDATE_INTERVAL, 
-                    ANGLE_UPDATE_THRESHOLD
-                )
+                # Send a preset for a held gesture, otherwise stream angles
+                if not self._update_gesture(landmarks, trace):
+                    self.arduino.send_finger_angles(
+                        finger_angles, 
+                        UPDATE_INTERVAL, 
+                        ANGLE_UPDATE_THRESHOLD,
+                        trace
+                    )
                 
                 # Render angles on frame
-                frame = self.renderer.render_frame(frame, finger_angles, True)
+                frame = self.renderer.render_frame(frame, finger_angles, True, self.active_preset)
                 
                 # Only process the first hand
                 break
         else:
             # No hand detected
+            if self.gesture_recognizer is not None:
+                self.gesture_recognizer.reset()
+                self.active_preset = None
             frame = self.renderer.render_frame(frame, None, False)
         
+        if self.publisher is not None:
+            from streaming.framing import hands_from_results
+            # Records carry wall-clock time so consumers can measure their latency
+            timestamp = time.time() - (time.monotonic() - capture_time) if capture_time is not None else None
+            self.publisher.publish(finger_angles, hands_from_results(results), timestamp)
+        
         return frame
     
+    def _update_gesture(self, landmarks, trace=None) -> bool:
+        """
+        Track preset gestures and trigger the matching Arduino preset.
+        
+        Args:
+            landmarks: Hand landmarks from MediaPipe
+            trace: Optional FrameTrace, so a triggered preset is traced to its ack
+            
+        Returns:
+            True while a preset gesture is held and angle streaming is paused
+        """
+        if self.gesture_recognizer is None:
+            return False
+        
+        from hand_tracking import landmarks_to_array
+        
+        gesture = self.gesture_recognizer.update(landmarks_to_array(landmarks))
+        if gesture != self.active_preset:
+            self.active_preset = gesture
+            if gesture is not None:
+                self.arduino.send_preset(gesture, trace)
+        
+        return self.active_preset is not None
+    
     def run_calibration_mode(self):
         """
         Run calibration mode.
         """
-        calibration_system = CalibrationSystem(self.hand_detector, self.angle_calculator)
+        from utils import CalibrationSystem
+        
+        calibration_system = CalibrationSystem(self.hand_detector, self.angle_calculator, self.source)
         min_angles, max_angles = calibration_system.run()
         
         # Print results
@@ -113,20 +293,47 @@ class RealTimeHandMimicSystem:
         print("\n=== REAL-TIME HAND MIMICKING SYSTEM ===")
         print("Press Q to quit")
         
+        from capture.frame_source import open_frame_source
+        
+        # Connect to Arduino and open the display before the camera starts
+        self.arduino
+        self.renderer
+        
         # Start camera
-        cap = cv2.VideoCapture(0)
+        if self.landmark_receiver is not None:
+            cap = self.landmark_receiver
+        else:
+            cap = open_frame_source(self.source, **CAMERA_CONFIG)
         if not cap.isOpened():
             print("Could not open camera!")
             return
         
         while True:
-            ret, frame = cap.read()
-            if not ret:
+            captured = cap.read_frame()
+            if captured is None:
                 print("Cannot capture frame!")
                 break
             
+            if self.presence_gate is not None and not self.presence_gate.check(captured.image):
+                # Idle: skip detection and refresh the display at the idle rate
+                self.renderer.display_frame(self.renderer.render_idle(captured.image))
+                remaining = self.presence_gate.idle_period - (time.monotonic() - captured.timestamp)
+                if self.renderer.get_key(max(1, int(remaining * 1000))) == ord('q'):
+                    break
+                continue
+            
+            trace = None
+            if self.tracer is not None:
+                trace = self.tracer.begin(captured.timestamp)
+                trace.mark('read')
+            
             # Process frame
-            processed_frame = self.process_frame(frame)
+            processed_frame = self.process_frame(captured.image, trace, captured.timestamp)
+            
+            if trace is not None:
+                self.tracer.finish(trace)
+                for seq, board_ms, read_time in self.arduino.poll_acks():
+                    self.tracer.ack(seq, board_ms, timestamp=read_time)
             
             # Display frame
             self.renderer.display_frame(processed_frame)
@@ -143,9 +350,53 @@ class RealTimeHandMimicSystem:
         """
         Clean up resources.
         """
+        if self.hand_tracker is not self.hand_detector:
+            stats = self.hand_tracker.stats()
+            print(f"Flow tracking: {stats['detections']} inferences, {stats['propagations']} propagated frames "
+                  f"({stats['skip_ratio']:.0%}), {stats['drift_resets']} drift resets")
+            self.hand_tracker = self.hand_detector
+        if self.presence_gate is not None:
+            stats = self.presence_gate.stats()
+            print(f"Presence gate: {stats['frames_skipped']} idle frames skipped, {stats['wakeups']} wake-ups")
+            self.presence_gate = None
+        if self.landmark_receiver is not None:
+            print(self.landmark_receiver.report())
+            self.landmark_receiver = None
         self.hand_detector.close()
-        self.arduino.close()
-        self.renderer.close()
+        if self.tracer is not None and self.tracer.traces:
+            if self._arduino is not None:
+                # Collect acks still in flight
+                time.sleep(0.1)
+                for seq, board_ms, read_time in self._arduino.poll_acks():
+                    self.tracer.ack(seq, board_ms, timestamp=read_time)
+            print(self.tracer.report())
+            self.tracer.export_chrome_trace(self.trace_path)
+            print(f"Trace written to {self.trace_path}")
+            self.tracer = None
+        if self._arduino is not None:
+            if self._arduino.monitor is not None:
+                print(self._arduino.monitor.summary())
+                print(f"Throttled updates: {self._arduino.throttled}")
+            if self._arduino.flow_window:
+                print(f"Flow control: {self._arduino.commands_sent} commands sent, "
+                      f"{self._arduino.coalesced} targets replaced by newer ones, "
+                      f"{self._arduino.ack_timeouts} ack timeouts")
+            self._arduino.close()
+            self._arduino = None
+        if self.recorder is not None:
+            self.recorder.close()
+            print(f"Recorded {self.recorder.count} targets to {self.recorder.path}")
+            self.recorder = None
+        if self.publisher is not None:
+            stats = self.publisher.stats()
+            print(f"Stream: {stats['published']} frames published, {stats['connections']} subscribers served, "
+                  f"{stats['records_sent']} records / {stats['bytes_sent']} bytes sent, "
+                  f"{stats['conflated']} conflated for slow subscribers")
+            self.publisher.close()
+            self.publisher = None
+        if self._renderer is not None:
+            self._renderer.close()
+            self._renderer = None
         print("System closed.")
 
 def main():
@@ -157,15 +408,66 @@ def main():
     # Parse arguments
     parser = argparse.ArgumentParser(description="Real-Time Hand Mimicking System")
     parser.add_argument('--port', type=str, default=DEFAULT_SERIAL_PORT, 
-                       help='Arduino serial port')
+                       help="Arduino serial port, or a backend: emulator[:MS], null, file:PATH, udp:HOST:PORT, tcp:HOST:PORT")
     parser.add_argument('--baudrate', type=int, default=DEFAULT_BAUDRATE, 
                        help='Serial port baudrate (bit/s)')
+    parser.add_argument('--source', type=str, default=str(CAMERA_SOURCE),
+                       help="Camera index, video file, image directory or 'synthetic'")
     parser.add_argument('--calibrate', action='store_true', 
                        help='Start calibration mode')
+    parser.add_argument('--trajectory', action='store_true', default=TRAJECTORY_MODE,
+                       help='Send timed trajectory segments interpolated by the Arduino')
+    parser.add_argument('--delta', action='store_true', default=DELTA_MODE,
+                       help='Send only changed fingers, with periodic full keyframes')
+    parser.add_argument('--gestures', action='store_true', default=GESTURE_PRESETS,
+                       help='Trigger Arduino preset motions for held gestures')
+    parser.add_argument('--flow-tracking', action='store_true', default=FLOW_TRACKING,
+                       help='Run MediaPipe every few frames and track landmarks with optical flow in between')
+    parser.add_argument('--presence-gate', action='store_true', default=PRESENCE_GATE,
+                       help='Idle at a low frame rate without running MediaPipe while no hand is present')
+    parser.add_argument('--record', type=str, metavar='FILE',
+                       help='Record every servo target sent, for later playback')
+    parser.add_argument('--telemetry', type=int, default=TELEMETRY_INTERVAL_MS, metavar='MS',
+                       help='Request board telemetry every MS ms and throttle updates while it falls behind')
+    parser.add_argument('--flow-window', type=int, default=FLOW_WINDOW, metavar='N',
+                       help='Keep at most N unacknowledged targets in flight; newer targets replace waiting ones')
+    parser.add_argument('--publish', type=str, default=STREAM_ADDRESS, metavar='ADDRESS',
+                       help='Stream angles and landmarks to local subscribers (tcp:HOST:PORT or unix:PATH)')
+    parser.add_argument('--landmarks', type=str, default=LANDMARK_SOURCE, metavar='ADDRESS',
+                       help='Receive landmarks from a detector node (udp:HOST:PORT or tcp:HOST:PORT) instead of the camera')
+    parser.add_argument('--detector-node', type=str, metavar='ADDRESS',
+                       help='Run as a detector node: capture from --source, detect hands and stream landmarks to ADDRESS')
+    parser.add_argument('--trace', type=str, metavar='FILE',
+                       help='Record per-frame stage latencies and write a Chrome/Perfetto trace JSON')
+    parser.add_argument(PROFILE_FLAG, action='store_true',
+                       help='Run with -X importtime and print an import-time report on exit')
     args = parser.parse_args()
     
+    if args.profile_imports:
+        sys.exit(run_with_import_profile())
+    
+    if args.detector_node:
+        from streaming.detector_node import run_detector_node
+        run_detector_node(args.detector_node, args.source, args.flow_tracking)
+        return
+    
     # Create system
-    mimic_system = RealTimeHandMimicSystem(port=args.port, baudrate=args.baudrate)
+    mimic_system = RealTimeHandMimicSystem(
+        port=args.port,
+        baudrate=args.baudrate,
+        trajectory_mode=args.trajectory,
+        delta_mode=args.delta,
+        gesture_presets=args.gestures,
+        source=args.source,
+        trace_path=args.trace,
+        flow_tracking=args.flow_tracking,
+        presence_gate=args.presence_gate,
+        record_path=args.record,
+        telemetry_ms=args.telemetry,
+        flow_window=args.flow_window,
+        stream_address=args.publish,
+        landmark_source=args.landmarks
+    )
     
     try:
         # Choose calibration or normal mode
@@ -0,0 +1,19 @@
+# memory_game/__init__.py
+# UI-independent building blocks of the board game (board_game.py).
+from utils.lazy_import import lazy_exports
+
+__all__ = ['MemoryGameEngine', 'PerfectMemoryPolicy', 'BoundedMemoryPolicy', 'RandomPolicy',
+           'make_policy', 'simulate', 'CardIndex', 'CellFlipTracker', 'cell_fill_ratios', 'open_cells']
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'MemoryGameEngine': '.engine',
+    'PerfectMemoryPolicy': '.policies',
+    'BoundedMemoryPolicy': '.policies',
+    'RandomPolicy': '.policies',
+    'make_policy': '.policies',
+    'simulate': '.simulator',
+    'CardIndex': '.card_index',
+    'CellFlipTracker': '.flip_tracker',
+    'cell_fill_ratios': '.vision',
+    'open_cells': '.vision',
+})
@@ -0,0 +1,141 @@
+"""
+Cached perspective rectification of the game board.
+
+The homography only changes when the calibration points change, so the
+per-pixel source coordinates are computed once and stored as a fixed-point
+``cv2.remap`` map pair (CV_16SC2). Each frame then costs one remap instead of
+a full warpPerspective, which also re-derives the mapping for every pixel.
+"""
+import cv2
+import numpy as np
+from typing import Optional, Sequence, Tuple
+
+# Above this (board bounding box / output) pixel ratio it is cheaper to
+# resample the colour image and convert the small result to grayscale
+GRAY_FIRST_MAX_RATIO = 4.0
+
+
+class BoardWarp:
+    """
+    Maps the four calibrated board corners to a square top-down view.
+    """
+    def __init__(self, size: Tuple[int, int] = (400, 400)):
+        """
+        Initialize the warp.
+
+        Args:
+            size: Output (width, height) of the rectified board
+        """
+        self.size = size
+        self._points = None
+        self._matrix = None
+        self._maps = None
+
+    @property
+    def matrix(self) -> Optional[np.ndarray]:
+        """
+        Returns:
+            3x3 homography from camera to board coordinates, or None
+        """
+        return self._matrix
+
+    @property
+    def is_ready(self) -> bool:
+        return self._maps is not None
+
+    def set_points(self, points: Sequence[Sequence[float]]) -> bool:
+        """
+        Set the board corners (top-left, top-right, bottom-left, bottom-right).
+
+        The homography and remap tables are only rebuilt if the points differ
+        from the cached ones.
+
+        Args:
+            points: Four (x, y) corner positions in the camera frame
+
+        Returns:
+            True if the cache was rebuilt
+        """
+        points = np.float32(points)
+        if self._points is not None and np.array_equal(points, self._points):
+            return False
+
+        width, height = self.size
+        target = np.float32([[0, 0], [width, 0], [0, height], [width, height]])
+        matrix = cv2.getPerspectiveTransform(points, target)
+
+        # Source position of every board pixel: inverse homography of the grid
+        xs, ys = np.meshgrid(np.arange(width, dtype=np.float32),
+                             np.arange(height, dtype=np.float32))
+        grid = np.dstack([xs, ys]).reshape(-1, 1, 2)
+        source = cv2.perspectiveTransform(grid, np.linalg.inv(matrix)).reshape(height, width, 2)
+
+        # Only the bounding box of the board is ever sampled; make the maps
+        # relative to it so per-frame work (e.g. colour conversion) skips the rest
+        x0 = max(0, int(np.floor(source[..., 0].min())))
+        y0 = max(0, int(np.floor(source[..., 1].min())))
+        x1 = max(x0 + 1, int(np.ceil(source[..., 0].max())) + 2)
+        y1 = max(y0 + 1, int(np.ceil(source[..., 1].max())) + 2)
+        source -= np.float32([x0, y0])
+        map1, map2 = cv2.convertMaps(source[..., 0], source[..., 1], cv2.CV_16SC2)
+
+        # Publish the new state in one assignment so a concurrent warp()
+        # never sees maps from one calibration and points from another
+        self._maps = (map1, map2, (slice(y0, y1), slice(x0, x1)))
+        self._matrix = matrix
+        self._points = points
+        return True
+
+    def invalidate(self):
+        """
+        Drop the cached homography and maps.
+        """
+        self._maps = None
+        self._matrix = None
+        self._points = None
+
+    def warp(self, image: np.ndarray) -> np.ndarray:
+        """
+        Rectify an image with the cached maps.
+
+        Args:
+            image: Camera frame (grayscale or BGR)
+
+        Returns:
+            Top-down board image of size ``self.size``
+        """
+        maps = self._maps
+        if maps is None:
+            raise RuntimeError("Board corners have not been set")
+        map1, map2, roi = maps
+        return cv2.remap(image[roi], map1, map2, cv2.INTER_LINEAR)
+
+    def warp_gray(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Convert the board region to grayscale and rectify it.
+
+        Normally only the board's bounding box is converted and a single
+        channel is resampled. When the board covers a much larger area of the
+        frame than the output, the colour image is resampled first instead,
+        since converting the large region would cost more.
+
+        Args:
+            frame: BGR camera frame
+
+        Returns:
+            Grayscale top-down board image of size ``self.size``
+        """
+        maps = self._maps
+        if maps is None:
+            raise RuntimeError("Board corners have not been set")
+        map1, map2, roi = maps
+        region = frame[roi]
+        if region.ndim == 2:
+            return cv2.remap(region, map1, map2, cv2.INTER_LINEAR)
+
+        region_pixels = region.shape[0] * region.shape[1]
+        if region_pixels > GRAY_FIRST_MAX_RATIO * map1.shape[0] * map1.shape[1]:
+            warped = cv2.remap(region, map1, map2, cv2.INTER_LINEAR)
+            return cv2.cvtColor(warped, cv2.COLOR_BGR2GRAY)
+        gray = cv2.cvtColor(region, cv2.COLOR_BGR2GRAY)
+        return cv2.remap(gray, map1, map2, cv2.INTER_LINEAR)
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Card-face recognition with a precomputed perceptual-hash index.
+
+Every known card face is reduced offline to DCT perceptual hashes (256 bits
+packed into 32 bytes by default) of the face and of slightly shifted and
+rotated copies, so camera views that are not perfectly centred still land
+close to one of the stored hashes. The hashes and face names are stored in a
+single structured ``.npy`` file that is memory-mapped at runtime, so loading
+is instant and the index is shared between processes by the page cache.
+A revealed cell is identified by the nearest face in Hamming distance,
+computed with XOR and a byte popcount table over the packed bits.
+
+Usage:
+    python -m memory_game.card_index synth cards/ --faces 8
+    python -m memory_game.card_index build cards/ cards.npy
+    python -m memory_game.card_index query cards.npy photo1.png photo2.png
+    python -m memory_game.card_index evaluate cards.npy cards/
+"""
+import argparse
+import os
+import time
+import cv2
+import numpy as np
+from typing import List, Optional, Sequence, Tuple
+
+HASH_SIZE = 16          # Hash is HASH_SIZE x HASH_SIZE bits
+DCT_SIZE = 32           # Images are resized to DCT_SIZE x DCT_SIZE before the DCT
+NAME_LENGTH = 32        # Bytes reserved for a face name in the index file
+MAX_DISTANCE = 80       # Matches further than this (of 256 bits) are rejected
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+# Number of set bits in every byte value
+POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint16)
+
+
+def card_hash(image: np.ndarray, hash_size: int = HASH_SIZE) -> np.ndarray:
+    """
+    Compute the perceptual hash of a card image.
+
+    The low-frequency block of the image's DCT is compared with its median,
+    which makes the hash robust to noise, blur, brightness and small shifts.
+
+    Args:
+        image: Grayscale or BGR card image
+        hash_size: Side of the low-frequency block (hash has hash_size² bits)
+
+    Returns:
+        Packed hash bits, uint8 array of hash_size² / 8 bytes
+    """
+    if image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    small = cv2.resize(image, (DCT_SIZE, DCT_SIZE), interpolation=cv2.INTER_AREA)
+    dct = cv2.dct(np.float32(small))[:hash_size, :hash_size].ravel()
+    # The DC term only encodes overall brightness
+    bits = dct > np.median(dct[1:])
+    return np.packbits(bits)
+
+
+def augmented_views(image: np.ndarray, angle: float = 3.0, shift: float = 0.03) -> List[np.ndarray]:
+    """
+    The image plus copies rotated by ±angle and shifted by ±shift (relative
+    to the image size) in x and y, 28 views in total.
+
+    Args:
+        image: Card image
+        angle: Rotation in degrees
+        shift: Shift as a fraction of the image size
+
+    Returns:
+        List of images
+    """
+    height, width = image.shape[:2]
+    views = [image]
+    for a in (-angle, 0.0, angle):
+        for dx in (-shift, 0.0, shift):
+            for dy in (-shift, 0.0, shift):
+                matrix = cv2.getRotationMatrix2D((width / 2, height / 2), a, 1.0)
+                matrix[:, 2] += (dx * width, dy * height)
+                views.append(cv2.warpAffine(image, matrix, (width, height),
+                                            borderMode=cv2.BORDER_REPLICATE))
+    return views
+
+
+def hamming_distances(hashes: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """
+    Hamming distance between one hash and every hash of an index.
+
+    Args:
+        hashes: Packed hashes, shape (N, bytes)
+        query: Packed hash, shape (bytes,)
+
+    Returns:
+        Distances in bits, shape (N,)
+    """
+    return POPCOUNT[np.bitwise_xor(hashes, query)].sum(axis=1)
+
+
+def _index_dtype(hash_bytes: int) -> np.dtype:
+    return np.dtype([('name', f'S{NAME_LENGTH}'), ('hash', np.uint8, (hash_bytes,))])
+
+
+def face_name(path: str) -> str:
+    """
+    Face name of an image file: the file name without extension and without
+    a trailing ``_<number>`` variant suffix (``star_2.png`` -> ``star``).
+    """
+    stem = os.path.splitext(os.path.basename(path))[0]
+    base, _, suffix = stem.rpartition('_')
+    return base if base and suffix.isdigit() else stem
+
+
+def list_images(folder: str) -> List[str]:
+    """
+    Returns:
+        Sorted paths of all images in a folder
+    """
+    return sorted(os.path.join(folder, name) for name in os.listdir(folder)
+                  if name.lower().endswith(IMAGE_EXTENSIONS))
+
+
+class CardIndex:
+    """
+    Nearest-neighbour lookup of card faces by perceptual hash.
+    """
+    def __init__(self, entries: np.ndarray):
+        """
+        Initialize the index.
+
+        Args:
+            entries: Structured array with 'name' and 'hash' fields (may be a memmap)
+        """
+        self.entries = entries
+        self.hashes = entries['hash']
+        self.names = [name.decode() for name in entries['name']]
+        # Distinct faces in first-seen order; a face's label is its position here
+        self.faces = list(dict.fromkeys(self.names))
+        face_labels = {name: label for label, name in enumerate(self.faces)}
+        self.labels = np.array([face_labels[name] for name in self.names], dtype=np.int32)
+
+    @classmethod
+    def build(cls, images: Sequence[Tuple[str, np.ndarray]], augment: bool = True) -> 'CardIndex':
+        """
+        Build an index in memory.
+
+        Args:
+            images: (face name, image) pairs; a face may have several images
+            augment: Also index shifted and rotated views (see augmented_views)
+
+        Returns:
+            CardIndex
+        """
+        records = []
+        for name, image in images:
+            encoded = name.encode()
+            if len(encoded) > NAME_LENGTH:
+                raise ValueError(f"Face name longer than {NAME_LENGTH} bytes: {name}")
+            for view in (augmented_views(image) if augment else [image]):
+                records.append((encoded, card_hash(view)))
+
+        entries = np.zeros(len(records), dtype=_index_dtype(HASH_SIZE * HASH_SIZE // 8))
+        for i, record in enumerate(records):
+            entries[i] = record
+        return cls(entries)
+
+    @classmethod
+    def from_folder(cls, folder: str, augment: bool = True) -> 'CardIndex':
+        """
+        Build an index from a folder of face images (see face_name).
+
+        Args:
+            folder: Directory with one or more images per face
+            augment: Also index shifted and rotated views
+
+        Returns:
+            CardIndex
+        """
+        images = []
+        for path in list_images(folder):
+            image = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+            if image is None:
+                print(f"Skipping unreadable image: {path}")
+                continue
+            images.append((face_name(path), image))
+        return cls.build(images, augment)
+
+    def save(self, path: str):
+        """
+        Write the index to a ``.npy`` file.
+
+        Args:
+            path: Output file path
+        """
+        np.save(path, np.asarray(self.entries))
+
+    @classmethod
+    def load(cls, path: str) -> 'CardIndex':
+        """
+        Memory-map an index file.
+
+        Args:
+            path: File written by save()
+
+        Returns:
+            CardIndex backed by the mapped file
+        """
+        return cls(np.load(path, mmap_mode='r'))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def face_label(self, name: str) -> Optional[int]:
+        """
+        Returns:
+            Label of a face name, or None if the face is not indexed
+        """
+        return self.faces.index(name) if name in self.faces else None
+
+    def match_hash(self, query: np.ndarray,
+                   max_distance: int = MAX_DISTANCE) -> Tuple[Optional[int], int]:
+        """
+        Find the nearest face to a hash.
+
+        Args:
+            query: Packed hash from card_hash
+            max_distance: Largest accepted Hamming distance
+
+        Returns:
+            Tuple of (face label or None, distance in bits)
+        """
+        if not len(self.names):
+            return None, max_distance + 1
+        distances = hamming_distances(self.hashes, query)
+        best = int(np.argmin(distances))
+        distance = int(distances[best])
+        if distance > max_distance:
+            return None, distance
+        return int(self.labels[best]), distance
+
+    def match(self, image: np.ndarray, max_distance: int = MAX_DISTANCE) -> Tuple[Optional[int], int]:
+        """
+        Identify the face shown in an image.
+
+        Args:
+            image: Grayscale or BGR image of one card
+            max_distance: Largest accepted Hamming distance
+
+        Returns:
+            Tuple of (face label or None, distance in bits)
+        """
+        return self.match_hash(card_hash(image), max_distance)
+
+
+def synthetic_face(index: int, size: int = 128) -> np.ndarray:
+    """
+    Draw a synthetic card face: a distinct symbol and letter per index.
+
+    Args:
+        index: Face number
+        size: Image side in pixels
+
+    Returns:
+        Grayscale image
+    """
+    image = np.full((size, size), 235, dtype=np.uint8)
+    rng = np.random.default_rng(index)
+    center = (size // 2, size // 2)
+    radius = size // 3
+    shape = index % 4
+    if shape == 0:
+        cv2.circle(image, center, radius, 40, -1)
+    elif shape == 1:
+        cv2.rectangle(image, (size // 5, size // 5), (size * 4 // 5, size * 4 // 5), 40, -1)
+    elif shape == 2:
+        points = np.int32([[size // 2, size // 8], [size // 8, size * 7 // 8], [size * 7 // 8, size * 7 // 8]])
+        cv2.fillPoly(image, [points], 40)
+    else:
+        cv2.ellipse(image, center, (radius, radius // 2), 45, 0, 360, 40, -1)
+    # Letter and a few random marks make faces with the same shape differ
+    cv2.putText(image, chr(ord('A') + index % 26), (size // 3, size * 2 // 3),
+                cv2.FONT_HERSHEY_SIMPLEX, size / 60, 220, max(2, size // 32))
+    for _ in range(3):
+        x, y = rng.integers(0, size, 2)
+        cv2.circle(image, (int(x), int(y)), size // 12, int(rng.integers(60, 200)), -1)
+    return image
+
+
+def perturb(image: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """
+    Simulate a camera view of a card: shift, scale, blur, brightness and noise.
+    """
+    size = image.shape[0]
+    scale = rng.uniform(0.92, 1.08)
+    angle = rng.uniform(-4, 4)
+    matrix = cv2.getRotationMatrix2D((size / 2, size / 2), angle, scale)
+    matrix[:, 2] += rng.uniform(-0.04, 0.04, 2) * size
+    view = cv2.warpAffine(image, matrix, (size, size), borderMode=cv2.BORDER_REPLICATE)
+    view = cv2.GaussianBlur(view, (5, 5), rng.uniform(0.3, 1.5))
+    view = view * rng.uniform(0.7, 1.2) + rng.uniform(-25, 25) + rng.normal(0, 6, view.shape)
+    return np.clip(view, 0, 255).astype(np.uint8)
+
+
+def _synth(args):
+    os.makedirs(args.folder, exist_ok=True)
+    for i in range(args.faces):
+        cv2.imwrite(os.path.join(args.folder, f"face{i:02d}.png"), synthetic_face(i))
+    print(f"Wrote {args.faces} faces to {args.folder}")
+
+
+def _build(args):
+    index = CardIndex.from_folder(args.folder, not args.no_augment)
+    index.save(args.index)
+    print(f"Indexed {len(index)} hashes of {len(index.faces)} faces -> {args.index}")
+
+
+def _query(args):
+    index = CardIndex.load(args.index)
+    for path in args.images:
+        image = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+        if image is None:
+            print(f"{path}: unreadable")
+            continue
+        label, distance = index.match(image)
+        name = index.faces[label] if label is not None else '?'
+        print(f"{path}: {name} (distance {distance})")
+
+
+def _evaluate(args):
+    index = CardIndex.load(args.index)
+    rng = np.random.default_rng(args.seed)
+    correct = rejected = total = 0
+    lookup_time = 0.0
+    for path in list_images(args.folder):
+        image = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+        expected = index.face_label(face_name(path))
+        for _ in range(args.views):
+            view = perturb(image, rng)
+            start = time.perf_counter()
+            label, _ = index.match(view)
+            lookup_time += time.perf_counter() - start
+            total += 1
+            correct += label == expected
+            rejected += label is None
+    print(f"{total} views: {correct / total:.1%} correct, {rejected / total:.1%} rejected, "
+          f"{lookup_time / total * 1e6:.0f} us per card (hash + lookup)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Card-face index tools")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    synth = commands.add_parser('synth', help='Write synthetic card faces')
+    synth.add_argument('folder')
+    synth.add_argument('--faces', type=int, default=8, help='Number of faces')
+    synth.set_defaults(func=_synth)
+
+    build = commands.add_parser('build', help='Build an index from a folder of faces')
+    build.add_argument('folder')
+    build.add_argument('index', help='Output .npy file')
+    build.add_argument('--no-augment', action='store_true', help='Index only the original images')
+    build.set_defaults(func=_build)
+
+    query = commands.add_parser('query', help='Identify card images')
+    query.add_argument('index')
+    query.add_argument('images', nargs='+')
+    query.set_defaults(func=_query)
+
+    evaluate = commands.add_parser('evaluate', help='Match perturbed views of a folder of faces')
+    evaluate.add_argument('index')
+    evaluate.add_argument('folder')
+    evaluate.add_argument('--views', type=int, default=20, help='Perturbed views per image')
+    evaluate.add_argument('--seed', type=int, default=0)
+    evaluate.set_defaults(func=_evaluate)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""
+UI-free rules engine for the memory game.
+
+Holds the complete game state in compact form: card labels in an
+``array('h')``, matched cards as a byte map and per-player scores. The
+remaining cards are also kept in a CellSet, so picking a random unmatched
+card never scans the board and large grids play as fast as 4x4.
+Turn handling follows board_game.py: a player reveals two cards, a match
+scores a point and keeps the turn, a mismatch passes it to the other player.
+"""
+import random
+from array import array
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Sequence
+
+PLAYER = 0
+AI = 1
+PLAYER_NAMES = ('player', 'ai')
+
+# Reveal outcomes
+FIRST = 'first'          # First card of a turn
+MATCH = 'match'          # Second card matched the first
+MISMATCH = 'mismatch'    # Second card did not match; turn passes
+IGNORED = 'ignored'      # Card already matched, already revealed, or game over
+
+
+class RevealResult(NamedTuple):
+    """Outcome of revealing one card."""
+    outcome: str
+    cell: int
+    label: int
+    player: int
+    first_cell: Optional[int] = None
+
+
+def shuffled_labels(num_cells: int, rng: Optional[random.Random] = None) -> List[int]:
+    """
+    Deal a random board with two cards per label.
+
+    Args:
+        num_cells: Number of cells (an odd cell is left without a card)
+        rng: Random number generator
+
+    Returns:
+        List of labels by cell, -1 for an empty cell
+    """
+    rng = rng or random
+    labels = [i // 2 for i in range(num_cells - num_cells % 2)]
+    rng.shuffle(labels)
+    if num_cells % 2:
+        labels.append(-1)
+    return labels
+
+
+class CellSet:
+    """
+    Set of cell indices with O(1) add, discard, membership and random choice.
+
+    Cells are kept in a list plus an index map; removal swaps the last cell
+    into the freed slot.
+    """
+    def __init__(self, cells: Iterable[int] = ()):
+        self._cells = []
+        self._index = {}
+        for cell in cells:
+            self.add(cell)
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def __contains__(self, cell: int) -> bool:
+        return cell in self._index
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._cells)
+
+    def add(self, cell: int):
+        if cell not in self._index:
+            self._index[cell] = len(self._cells)
+            self._cells.append(cell)
+
+    def discard(self, cell: int):
+        i = self._index.pop(cell, None)
+        if i is None:
+            return
+        last = self._cells.pop()
+        if i < len(self._cells):
+            self._cells[i] = last
+            self._index[last] = i
+
+    def clear(self):
+        self._cells.clear()
+        self._index.clear()
+
+    def choice(self, rng: random.Random, exclude: Optional[int] = None) -> Optional[int]:
+        """
+        Pick a random cell.
+
+        Args:
+            rng: Random number generator
+            exclude: Cell that must not be picked
+
+        Returns:
+            Cell index, or None if no other cell is available
+        """
+        n = len(self._cells)
+        if exclude in self._index:
+            if n < 2:
+                return None
+            # Draw from the n - 1 other slots without rebuilding a list
+            i = rng.randrange(n - 1)
+            if i >= self._index[exclude]:
+                i += 1
+            return self._cells[i]
+        return self._cells[rng.randrange(n)] if n else None
+
+
+class MemoryGameEngine:
+    """
+    Game state machine without any UI or timing.
+    """
+    def __init__(self, rows: int = 4, cols: int = 4, labels: Optional[Sequence[int]] = None,
+                 rng: Optional[random.Random] = None):
+        """
+        Initialize a game.
+
+        Args:
+            rows: Number of grid rows
+            cols: Number of grid columns
+            labels: Card label per cell (dealt randomly if not given)
+            rng: Random number generator used for dealing
+        """
+        self.rows = rows
+        self.cols = cols
+        self.num_cells = rows * cols
+        self.rng = rng or random.Random()
+        self.observers = []
+        self.reset(labels)
+
+    def reset(self, labels: Optional[Sequence[int]] = None):
+        """
+        Start a new game.
+
+        Args:
+            labels: Card label per cell (dealt randomly if not given)
+        """
+        if labels is None:
+            labels = shuffled_labels(self.num_cells, self.rng)
+        if len(labels) != self.num_cells:
+            raise ValueError(f"Expected {self.num_cells} labels, got {len(labels)}")
+        self.labels = array('h', labels)
+        self.num_pairs = sum(1 for label in self.labels if label >= 0) // 2
+        self.matched = bytearray(self.num_cells)  # 1 when the cell is matched
+        self.revealed = bytearray(self.num_cells)  # 1 once the card has been seen
+        self.unmatched = CellSet(cell for cell, label in enumerate(self.labels) if label >= 0)
+        self.matched_pairs = 0
+        self.scores = [0, 0]
+        self.current_player = PLAYER
+        self.first_cell = None
+        self.turns = 0
+        for observer in self.observers:
+            observer.reset(self.unmatched)
+
+    def is_matched(self, cell: int) -> bool:
+        return self.matched[cell] == 1
+
+    @property
+    def is_over(self) -> bool:
+        return self.matched_pairs == self.num_pairs
+
+    def unmatched_cells(self) -> List[int]:
+        """
+        Returns:
+            Cells that still hold a card, in index order
+        """
+        return sorted(self.unmatched)
+
+    def random_unmatched(self, rng: random.Random, exclude: Optional[int] = None) -> Optional[int]:
+        """
+        Pick a random cell that still holds a card, in O(1).
+
+        Args:
+            rng: Random number generator
+            exclude: Cell that must not be picked
+
+        Returns:
+            Cell index, or None if no other card is left
+        """
+        return self.unmatched.choice(rng, exclude)
+
+    def winner(self) -> Optional[int]:
+        """
+        Returns:
+            PLAYER or AI once the game is over, None for a draw or an unfinished game
+        """
+        if not self.is_over or self.scores[PLAYER] == self.scores[AI]:
+            return None
+        return PLAYER if self.scores[PLAYER] > self.scores[AI] else AI
+
+    def assign_label(self, cell: int, label: int) -> bool:
+        """
+        Correct the dealt label of a card with the face actually recognized.
+
+        The label is swapped with a card of that face that nobody has seen
+        yet, so every face still appears exactly twice and no player's memory
+        is invalidated.
+
+        Args:
+            cell: Cell about to be revealed
+            label: Recognized face label
+
+        Returns:
+            True if the cell now holds the label
+        """
+        if self.labels[cell] == label:
+            return True
+        if self.revealed[cell] or self.matched[cell] or self.labels[cell] < 0:
+            return False
+        for other in range(self.num_cells):
+            if (self.labels[other] == label and not self.revealed[other] and
+                    not self.matched[other]):
+                self.labels[other] = self.labels[cell]
+                self.labels[cell] = label
+                return True
+        return False
+
+    def reveal(self, cell: int) -> RevealResult:
+        """
+        Reveal a card for the current player.
+
+        Args:
+            cell: Cell index
+
+        Returns:
+            RevealResult describing what happened
+        """
+        player = self.current_player
+        label = self.labels[cell]
+        if self.is_over or label < 0 or self.matched[cell] or cell == self.first_cell:
+            return RevealResult(IGNORED, cell, label, player)
+
+        self.revealed[cell] = 1
+        for observer in self.observers:
+            observer.observe(cell, label)
+
+        first = self.first_cell
+        if first is None:
+            self.first_cell = cell
+            return RevealResult(FIRST, cell, label, player)
+
+        self.first_cell = None
+        self.turns += 1
+        if self.labels[first] == label:
+            self.matched[first] = self.matched[cell] = 1
+            self.unmatched.discard(first)
+            self.unmatched.discard(cell)
+            self.matched_pairs += 1
+            self.scores[player] += 1
+            for observer in self.observers:
+                observer.matched(first, cell)
+            return RevealResult(MATCH, cell, label, player, first)
+
+        self.current_player = 1 - player
+        return RevealResult(MISMATCH, cell, label, player, first)
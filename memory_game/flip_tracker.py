@@ -0,0 +1,113 @@
+"""
+Per-cell temporal model for card-flip detection.
+
+Every frame the rectified board is downsampled and compared with a
+per-cell reference; only cells that changed (or are still waiting for
+confirmation) are re-thresholded. A cell has to read differently from its
+stable state for ``confirm_frames`` consecutive evaluations before it flips,
+so a hand passing over the board or a lighting flicker does not count as a
+card being turned over.
+"""
+import cv2
+import numpy as np
+
+from .vision import cell_fill_ratios
+
+
+class CellFlipTracker:
+    """
+    Tracks the open/closed state of every grid cell with hysteresis.
+    """
+    def __init__(self, rows: int, cols: int, open_ratio: float = 0.1, confirm_frames: int = 5,
+                 diff_threshold: float = 6.0, sample: int = 6, threshold: int = 150):
+        """
+        Initialize the tracker.
+
+        Args:
+            rows: Number of grid rows
+            cols: Number of grid columns
+            open_ratio: Minimum fill ratio of an open card
+            confirm_frames: Consecutive evaluations needed to change a cell's state
+            diff_threshold: Mean absolute grey-level change (on the downsampled
+                board) that marks a cell for re-evaluation
+            sample: Downsampled pixels per cell side
+            threshold: Grey level below which a pixel counts as card ink
+        """
+        self.rows = rows
+        self.cols = cols
+        self.open_ratio = open_ratio
+        self.confirm_frames = confirm_frames
+        self.diff_threshold = diff_threshold
+        self.sample = sample
+        self.threshold = threshold
+        self.reset()
+
+    def reset(self):
+        """
+        Forget all cell states; the next frame evaluates every cell.
+        """
+        num_cells = self.rows * self.cols
+        self.open_mask = np.zeros(num_cells, dtype=bool)  # Stable state per cell
+        self.pending = np.zeros(num_cells, dtype=np.int32)  # Frames disagreeing with the state
+        self.evaluated_cells = 0
+        self._reference = None
+
+    def _fill_ratios(self, gray: np.ndarray, cells: np.ndarray) -> np.ndarray:
+        """Threshold only the given cells and return their fill ratios."""
+        cell_h = gray.shape[0] // self.rows
+        cell_w = gray.shape[1] // self.cols
+        if len(cells) * 2 > self.rows * self.cols:
+            # Most of the board changed: one pass over the whole board is cheaper
+            blurred = cv2.GaussianBlur(gray, (5, 5), 0)
+            _, thresh = cv2.threshold(blurred, self.threshold, 255, cv2.THRESH_BINARY_INV)
+            return cell_fill_ratios(thresh, self.rows, self.cols).ravel()[cells]
+
+        ratios = np.empty(len(cells))
+        for n, cell in enumerate(cells):
+            row, col = divmod(int(cell), self.cols)
+            region = gray[row * cell_h:(row + 1) * cell_h, col * cell_w:(col + 1) * cell_w]
+            blurred = cv2.GaussianBlur(region, (5, 5), 0)
+            _, thresh = cv2.threshold(blurred, self.threshold, 255, cv2.THRESH_BINARY_INV)
+            ratios[n] = cv2.countNonZero(thresh) / float(cell_h * cell_w)
+        return ratios
+
+    def update(self, gray: np.ndarray) -> np.ndarray:
+        """
+        Process one rectified grayscale board image.
+
+        Args:
+            gray: Warped board, single channel
+
+        Returns:
+            Flat indices of cells that were confirmed open in this frame
+        """
+        rows, cols, s = self.rows, self.cols, self.sample
+        board = gray[:gray.shape[0] // rows * rows, :gray.shape[1] // cols * cols]
+        small = cv2.resize(board, (cols * s, rows * s), interpolation=cv2.INTER_LINEAR)
+        blocks = small.reshape(rows, s, cols, s)
+
+        if self._reference is None:
+            self._reference = small.copy()
+            changed = np.ones(rows * cols, dtype=bool)
+        else:
+            diff = cv2.absdiff(small, self._reference).reshape(rows, s, cols, s)
+            changed = diff.mean(axis=(1, 3)).ravel() > self.diff_threshold
+        dirty = changed | (self.pending > 0)
+
+        cells = np.flatnonzero(dirty)
+        self.evaluated_cells = len(cells)
+        if not len(cells):
+            return cells
+
+        # Evaluated cells become the new reference for the change test
+        np.copyto(self._reference.reshape(rows, s, cols, s), blocks,
+                  where=dirty.reshape(rows, 1, cols, 1))
+
+        is_open = self._fill_ratios(gray, cells) > self.open_ratio
+        disagree = is_open != self.open_mask[cells]
+        self.pending[cells] = np.where(disagree, self.pending[cells] + 1, 0)
+
+        flipped = cells[self.pending[cells] >= self.confirm_frames]
+        self.open_mask[flipped] = ~self.open_mask[flipped]
+        self.pending[flipped] = 0
+        return flipped[self.open_mask[flipped]]
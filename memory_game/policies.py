@@ -0,0 +1,181 @@
+"""
+AI policies for the memory game engine.
+
+A policy is attached to the engine as an observer, so it sees every
+revealed card (from both players) and every match, and is asked to pick the
+first and second card of its turn.
+
+Memory-based policies index what they remember (label -> remembered cells,
+labels with both cards known, cells never seen) and update the index on each
+event, so every decision is O(1) regardless of board size.
+"""
+import random
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+from .engine import CellSet
+
+
+class Policy:
+    """
+    Base class: remembers nothing and picks cards at random.
+    """
+    name = 'random'
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        self.rng = rng or random.Random()
+
+    def reset(self, cells: Iterable[int]):
+        """
+        Forget everything at the start of a game.
+
+        Args:
+            cells: Cells that hold a card
+        """
+
+    def observe(self, cell: int, label: int):
+        """Called when any card is revealed."""
+
+    def matched(self, first: int, second: int):
+        """Called when a pair is matched."""
+
+    def choose_first(self, engine) -> int:
+        """
+        Pick the first card of a turn.
+
+        Args:
+            engine: MemoryGameEngine
+
+        Returns:
+            Cell index
+        """
+        return engine.random_unmatched(self.rng)
+
+    def choose_second(self, engine, first: int, label: int) -> int:
+        """
+        Pick the second card of a turn, after the first has been revealed.
+
+        Args:
+            engine: MemoryGameEngine
+            first: Cell revealed first
+            label: Label of the first card
+
+        Returns:
+            Cell index
+        """
+        return engine.random_unmatched(self.rng, exclude=first)
+
+
+class RandomPolicy(Policy):
+    """
+    Picks two unmatched cards at random.
+    """
+    name = 'random'
+
+
+class PerfectMemoryPolicy(Policy):
+    """
+    Remembers every card it has seen and plays known pairs first.
+    """
+    name = 'perfect'
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        super().__init__(rng)
+        self.memory = OrderedDict()  # cell -> label, oldest first
+        self.label_cells = {}        # label -> remembered unmatched cells
+        self.known_pairs = {}        # labels with both cards remembered, oldest first
+        self.unseen = CellSet()      # unmatched cells not in memory
+
+    def reset(self, cells: Iterable[int]):
+        self.memory.clear()
+        self.label_cells.clear()
+        self.known_pairs.clear()
+        self.unseen = CellSet(cells)
+
+    def observe(self, cell: int, label: int):
+        if cell in self.memory:
+            self.memory.move_to_end(cell)
+            return
+        self.memory[cell] = label
+        self.unseen.discard(cell)
+        cells = self.label_cells.setdefault(label, [])
+        cells.append(cell)
+        if len(cells) == 2:
+            self.known_pairs[label] = None
+
+    def matched(self, first: int, second: int):
+        for cell in (first, second):
+            if cell in self.memory:
+                self._forget(cell)
+            self.unseen.discard(cell)
+
+    def _forget(self, cell: int):
+        label = self.memory.pop(cell)
+        cells = self.label_cells[label]
+        cells.remove(cell)
+        if not cells:
+            del self.label_cells[label]
+        self.known_pairs.pop(label, None)
+
+    def _unknown_cell(self, engine, exclude: Optional[int] = None) -> int:
+        cell = self.unseen.choice(self.rng, exclude)
+        if cell is None:
+            cell = engine.random_unmatched(self.rng, exclude)
+        return cell
+
+    def choose_first(self, engine) -> int:
+        if self.known_pairs:
+            return self.label_cells[next(iter(self.known_pairs))][0]
+        return self._unknown_cell(engine)
+
+    def choose_second(self, engine, first: int, label: int) -> int:
+        for cell in self.label_cells.get(label, ()):
+            if cell != first:
+                return cell
+        return self._unknown_cell(engine, exclude=first)
+
+
+class BoundedMemoryPolicy(PerfectMemoryPolicy):
+    """
+    Like PerfectMemoryPolicy, but only remembers the most recent cards.
+    """
+    name = 'bounded'
+
+    def __init__(self, capacity: int = 4, rng: Optional[random.Random] = None):
+        """
+        Initialize the policy.
+
+        Args:
+            capacity: Number of cards remembered
+            rng: Random number generator
+        """
+        super().__init__(rng)
+        self.capacity = capacity
+
+    def observe(self, cell: int, label: int):
+        super().observe(cell, label)
+        while len(self.memory) > self.capacity:
+            oldest = next(iter(self.memory))
+            self._forget(oldest)
+            self.unseen.add(oldest)
+
+
+def make_policy(spec: str, rng: Optional[random.Random] = None) -> Policy:
+    """
+    Build a policy from a short name.
+
+    Args:
+        spec: 'random', 'perfect' or 'bounded[:capacity]'
+        rng: Random number generator
+
+    Returns:
+        Policy instance
+    """
+    name, _, arg = spec.partition(':')
+    if name == 'random':
+        return RandomPolicy(rng)
+    if name == 'perfect':
+        return PerfectMemoryPolicy(rng)
+    if name == 'bounded':
+        return BoundedMemoryPolicy(int(arg) if arg else 4, rng)
+    raise ValueError(f"Unknown policy: {spec}")
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+High-speed batch simulator for memory game AI policies.
+
+Plays many games between two policies on the headless engine, without any
+UI or delays, and reports win rates.
+
+Usage:
+    python -m memory_game.simulator --games 10000 --policies perfect bounded:4
+"""
+import argparse
+import random
+import time
+from typing import NamedTuple, Sequence
+
+from .engine import AI, PLAYER, MemoryGameEngine
+from .policies import make_policy
+
+
+class SimulationReport(NamedTuple):
+    """Aggregate results of a batch of games."""
+    policies: Sequence[str]
+    games: int
+    wins: Sequence[int]
+    draws: int
+    mean_turns: float
+    games_per_second: float
+
+
+def play_game(engine: MemoryGameEngine, policies, max_turns: int = 0) -> MemoryGameEngine:
+    """
+    Play one game to the end.
+
+    Args:
+        engine: Engine with a freshly dealt board; both policies must be observers
+        policies: Policy for PLAYER and policy for AI
+        max_turns: Stop after this many turns (default: 100 per cell)
+
+    Returns:
+        The engine in its final state
+    """
+    max_turns = max_turns or engine.num_cells * 100
+    while not engine.is_over and engine.turns < max_turns:
+        policy = policies[engine.current_player]
+        first = policy.choose_first(engine)
+        result = engine.reveal(first)
+        engine.reveal(policy.choose_second(engine, first, result.label))
+    return engine
+
+
+def simulate(policy_specs: Sequence[str], games: int = 1000, rows: int = 4, cols: int = 4,
+             seed: int = 0) -> SimulationReport:
+    """
+    Play a batch of games between two policies.
+
+    The starting player alternates between games.
+
+    Args:
+        policy_specs: Two policy names (see policies.make_policy)
+        games: Number of games
+        rows: Grid rows
+        cols: Grid columns
+        seed: Random seed for dealing and policies
+
+    Returns:
+        SimulationReport
+    """
+    rng = random.Random(seed)
+    policies = [make_policy(spec, random.Random(rng.random())) for spec in policy_specs]
+    engine = MemoryGameEngine(rows, cols, rng=rng)
+    engine.observers.extend(policies)
+
+    wins = [0, 0]
+    draws = 0
+    turns = 0
+    start = time.perf_counter()
+    for game in range(games):
+        engine.reset()
+        engine.current_player = PLAYER if game % 2 == 0 else AI
+        play_game(engine, policies)
+        winner = engine.winner()
+        if winner is None:
+            draws += 1
+        else:
+            wins[winner] += 1
+        turns += engine.turns
+    elapsed = time.perf_counter() - start
+
+    return SimulationReport(tuple(policy_specs), games, tuple(wins), draws,
+                            turns / max(games, 1), games / elapsed if elapsed > 0 else float('inf'))
+
+
+def format_report(report: SimulationReport) -> str:
+    """
+    Format a simulation report as text.
+
+    Args:
+        report: SimulationReport
+
+    Returns:
+        Multi-line report
+    """
+    lines = [f"{report.games} games, {report.mean_turns:.1f} turns/game, "
+             f"{report.games_per_second:,.0f} games/s"]
+    for spec, wins in zip(report.policies, report.wins):
+        lines.append(f"  {spec:<12} win rate {wins / report.games:6.1%}")
+    lines.append(f"  {'draw':<12}          {report.draws / report.games:6.1%}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory game policy simulator")
+    parser.add_argument('--policies', nargs=2, default=['perfect', 'random'],
+                        help="Two policies: random, perfect, bounded[:capacity]")
+    parser.add_argument('--games', type=int, default=10000, help='Number of games')
+    parser.add_argument('--rows', type=int, default=4, help='Grid rows')
+    parser.add_argument('--cols', type=int, default=4, help='Grid columns')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    args = parser.parse_args()
+
+    report = simulate(args.policies, args.games, args.rows, args.cols, args.seed)
+    print(format_report(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Board-level card detection helpers.
+
+All grid cells are evaluated at once from the warped threshold image instead
+of slicing and summing each cell separately.
+"""
+import cv2
+import numpy as np
+from typing import Optional
+
+
+def cell_fill_ratios(thresh: np.ndarray, rows: int, cols: int) -> np.ndarray:
+    """
+    Compute the fraction of non-zero pixels in every grid cell.
+
+    Uses an integral image of the non-zero mask, so every cell sum is four
+    lookups at the grid corners. Cells are ``height // rows`` by
+    ``width // cols`` pixels, as in finish_calibration.
+
+    Args:
+        thresh: Single-channel threshold image of the warped board
+        rows: Number of grid rows
+        cols: Number of grid columns
+
+    Returns:
+        Array of shape (rows, cols) with fill ratios in [0, 1]
+    """
+    cell_h = thresh.shape[0] // rows
+    cell_w = thresh.shape[1] // cols
+    mask = (thresh != 0).view(np.uint8)
+    integral = cv2.integral(mask)
+    corners = integral[np.ix_(np.arange(rows + 1) * cell_h, np.arange(cols + 1) * cell_w)]
+    counts = corners[1:, 1:] - corners[:-1, 1:] - corners[1:, :-1] + corners[:-1, :-1]
+    return counts / float(cell_h * cell_w)
+
+
+def open_cells(ratios: np.ndarray, threshold: float,
+               matched_mask: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Find cells that look face-up and are not already matched.
+
+    Args:
+        ratios: Fill ratios from cell_fill_ratios, shape (rows, cols)
+        threshold: Minimum fill ratio of an open card
+        matched_mask: Boolean array of matched cells (flat or (rows, cols))
+
+    Returns:
+        Flat cell indices in row-major order
+    """
+    is_open = ratios.ravel() > threshold
+    if matched_mask is not None:
+        is_open &= ~matched_mask.ravel()
+    return np.flatnonzero(is_open)
@@ -0,0 +1,98 @@
+"""
+Background camera and vision thread for the board game.
+
+The worker reads frames, runs a processing function on them and publishes
+the latest annotated frame plus any detection events. The Tk main loop only
+polls the worker, so slow frames never block the UI and processing overlaps
+with display.
+"""
+import queue
+import threading
+import time
+from typing import Any, Callable, List, Optional, Tuple
+
+
+class BoardVisionWorker(threading.Thread):
+    """
+    Thread that captures and processes frames until stopped.
+    """
+    def __init__(self, camera, process_frame: Callable[[Any], Tuple[Any, List[Any]]]):
+        """
+        Initialize the worker.
+
+        Args:
+            camera: Object with a cv2.VideoCapture-style read() method
+            process_frame: Function taking a BGR frame and returning
+                (annotated frame, list of detection events)
+        """
+        super().__init__(name="BoardVisionWorker", daemon=True)
+        self.camera = camera
+        self.process_frame = process_frame
+        self.events = queue.Queue()
+        self.frame_number = 0
+        self.processing_time = 0.0
+        self._latest = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            ret, frame = self.camera.read()
+            if not ret:
+                # Camera had no frame ready; back off briefly
+                time.sleep(0.01)
+                continue
+
+            start = time.perf_counter()
+            try:
+                annotated, events = self.process_frame(frame)
+            except Exception as e:
+                print(f"Frame processing error: {e}")
+                continue
+            self.processing_time = time.perf_counter() - start
+
+            with self._lock:
+                self.frame_number += 1
+                self._latest = (self.frame_number, annotated)
+            for event in events:
+                self.events.put(event)
+
+    def latest_frame(self, after: int = 0) -> Optional[Tuple[int, Any]]:
+        """
+        Get the most recent annotated frame.
+
+        Args:
+            after: Only return frames newer than this frame number
+
+        Returns:
+            Tuple of (frame number, frame), or None if there is no newer frame
+        """
+        with self._lock:
+            if self._latest is None or self._latest[0] <= after:
+                return None
+            return self._latest
+
+    def pending_events(self) -> List[Any]:
+        """
+        Take all detection events published since the last call.
+
+        Returns:
+            List of events in the order they were detected
+        """
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def stop(self, timeout: float = 1.0):
+        """
+        Ask the worker to stop and wait for it to finish.
+
+        Args:
+            timeout: Maximum time to wait in seconds
+        """
+        self._stop_event.set()
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join(timeout)
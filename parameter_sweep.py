@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Parameter sweep for SMOOTH_FACTOR, UPDATE_INTERVAL and ANGLE_UPDATE_THRESHOLD.
+
+Replays landmark streams through the angle pipeline
+(AngleCalculator smoothing + ArduinoInterface._should_update_angles) for a
+grid of configurations. The configurations are vectorized within each
+stream, and streams are spread over a process pool. Each configuration is
+scored on:
+
+    lag_ms       delay of the commanded angles behind the reference motion
+                 (shift that best aligns the two)
+    error        mean absolute difference commanded vs reference, degrees
+    jitter       mean absolute second difference of the tracking error
+                 (commanded minus reference), degrees: noise and update
+                 steps that reach the servos, and fast reference motion
+                 that smoothing misses
+    cmds_per_s   movefingers commands per second
+    bytes_per_s  serial bytes per second
+
+The reference motion is the ground truth for synthetic streams. For
+recordings it is the unsmoothed angle stream filtered with a centered
+moving average. The report lists the Pareto front over lag, jitter and
+bytes/s, and the cheapest configuration within a lag budget.
+
+Input is the .npz output of batch_process.py, or synthetic streams from
+hand_tracking.synthetic_hands:
+
+    python parameter_sweep.py batch_output/
+    python parameter_sweep.py --synthetic 8 --max-lag 120 --csv sweep.csv
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from multiprocessing import Pool
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from config.settings import ANGLE_UPDATE_THRESHOLD, FINGER_ANGLE_RANGES, SMOOTH_FACTOR, UPDATE_INTERVAL
+
+DEFAULT_SMOOTH_FACTORS = [0.0, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9]
+DEFAULT_UPDATE_INTERVALS = [1, 2, 3, 5, 8, 12, 20, 30]
+DEFAULT_THRESHOLDS = [1, 2, 3, 5, 8, 12]
+
+METRICS = ('lag_ms', 'error', 'jitter', 'cmds_per_s', 'bytes_per_s')
+PARETO_OBJECTIVES = ('lag_ms', 'jitter', 'bytes_per_s')
+
+# Fixed part of 'movefingers:a:b:c:d:e:f\n': prefix, five separators, newline
+_COMMAND_OVERHEAD = len('movefingers:') + 5 + 1
+# Configurations simulated together; bounds memory to frames x chunk x 6 values
+_CONFIG_CHUNK = 64
+
+
+class Stream(NamedTuple):
+    """An angle stream prepared for replay."""
+    name: str
+    servo: np.ndarray      # (T, 6) int16 unsmoothed servo angles, FINGER_ORDER
+    detected: np.ndarray   # (T,) bool
+    reference: np.ndarray  # (T, 6) float32 reference motion (valid where detected)
+    duration: float        # seconds
+    fps: float
+
+
+def config_grid(smooth_factors: List[float], update_intervals: List[int],
+                thresholds: List[int]) -> np.ndarray:
+    """
+    Build the configuration grid, always including the current settings.
+
+    Returns:
+        Array of shape (C, 3): smooth_factor, update_interval, angle_threshold
+    """
+    grid = {(float(s), int(i), int(t)) for s in smooth_factors for i in update_intervals for t in thresholds}
+    grid.add((float(SMOOTH_FACTOR), int(UPDATE_INTERVAL), int(ANGLE_UPDATE_THRESHOLD)))
+    return np.array(sorted(grid), dtype=np.float64)
+
+
+def _moving_average(values: np.ndarray, window: int) -> np.ndarray:
+    """Centered moving average along axis 0, normalized at the edges."""
+    if window <= 1 or len(values) == 0:
+        return values.astype(np.float32)
+    kernel = np.ones(window)
+    counts = np.convolve(np.ones(len(values)), kernel, mode='same')
+    smoothed = np.stack([np.convolve(values[:, j], kernel, mode='same') for j in range(values.shape[1])], 1)
+    return (smoothed / counts[:, None]).astype(np.float32)
+
+
+def _servo_from_points(points: np.ndarray, detected: np.ndarray) -> np.ndarray:
+    from hand_tracking.angle_calculator import AngleCalculator
+    from hand_tracking.synthetic_hands import ANGLE_NAMES, raw_angles
+
+    calculator = AngleCalculator(FINGER_ANGLE_RANGES, 0.0)
+    servo = np.zeros((len(points), len(ANGLE_NAMES)), dtype=np.int16)
+    if detected.any():
+        servo[detected] = calculator.map_to_servo_batch(raw_angles(points[detected]), ANGLE_NAMES)
+    return servo
+
+
+def load_recording(path: str, reference_window: int = 5) -> Stream:
+    """
+    Prepare a batch_process.py recording.
+
+    Args:
+        path: .npz file
+        reference_window: Frames in the reference moving average
+
+    Returns:
+        Stream
+    """
+    data = np.load(path)
+    detected = data['detected'].astype(bool)
+    servo = _servo_from_points(data['landmarks'], detected)
+    fps = float(data['fps']) or 30.0
+    timestamps = data['timestamp_ms']
+    duration = (timestamps[-1] - timestamps[0]) / 1000 + 1 / fps if len(timestamps) > 1 else len(detected) / fps
+
+    reference = np.zeros(servo.shape, dtype=np.float32)
+    reference[detected] = _moving_average(servo[detected], reference_window)
+    return Stream(os.path.basename(path), servo, detected, reference, duration, fps)
+
+
+def synthetic_stream(seed: int, frames: int, noise: float = 0.003, dropout: float = 0.02) -> Stream:
+    """
+    Generate a synthetic stream with ground-truth reference motion.
+
+    Args:
+        seed: Generator seed
+        frames: Stream length
+        noise: Landmark noise
+        dropout: Probability of a frame without detection
+
+    Returns:
+        Stream
+    """
+    from hand_tracking.synthetic_hands import SyntheticHandGenerator
+
+    generator = SyntheticHandGenerator(seed=seed, noise=noise, dropout=dropout)
+    poses = generator.generate(frames, stream=True)
+    servo = _servo_from_points(poses.points, poses.detected)
+    reference = _servo_from_points(poses.clean_points, np.ones(frames, dtype=bool)).astype(np.float32)
+    return Stream(f"synthetic-{seed}", servo, poses.detected, reference, frames / generator.fps, generator.fps)
+
+
+def simulate(servo: np.ndarray, detected: np.ndarray, configs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Replay one stream through many configurations at once.
+
+    Mirrors AngleCalculator.calculate_servo_angles smoothing (integer
+    truncation included) and ArduinoInterface._should_update_angles. Frames
+    without a hand are skipped, as in main.py.
+
+    Args:
+        servo: (T, 6) unsmoothed servo angles
+        detected: (T,) hand present
+        configs: (C, 3) smooth_factor, update_interval, angle_threshold
+
+    Returns:
+        held: (T, C, 6) int16 angles the board holds after each frame
+        sent: (T, C) bool, a command was sent on this frame
+    """
+    frames, fingers = servo.shape
+    count = len(configs)
+    smooth = configs[:, 0:1]
+    interval = configs[:, 1]
+    threshold = configs[:, 2:3]
+
+    held = np.zeros((frames, count, fingers), dtype=np.int16)
+    sent = np.zeros((frames, count), dtype=bool)
+    previous = None                     # Smoothed angles of the last hand frame
+    last = np.zeros((count, fingers))   # Last sent angles
+    counter = np.zeros(count)
+    started = False
+
+    for t in range(frames):
+        if not detected[t]:
+            held[t] = held[t - 1] if t else 0
+            continue
+        current = servo[t].astype(np.float64)
+        if previous is None:
+            smoothed = np.broadcast_to(current, (count, fingers)).copy()
+        else:
+            smoothed = np.trunc(smooth * previous + (1 - smooth) * current)
+        previous = smoothed
+
+        if not started:
+            send = np.ones(count, dtype=bool)
+            started = True
+        else:
+            send = (counter >= interval) | (np.abs(smoothed - last) > threshold).any(axis=1)
+        last[send] = smoothed[send]
+        counter = np.where(send, 0, counter + 1)
+        sent[t] = send
+        held[t] = last
+    return held, sent
+
+
+def _command_bytes(held: np.ndarray, sent: np.ndarray) -> np.ndarray:
+    """Serial bytes sent per configuration, shape (C,)."""
+    digits = 1 + (held >= 10) + (held >= 100)
+    per_command = _COMMAND_OVERHEAD + digits.sum(axis=2)
+    return (per_command * sent).sum(axis=0)
+
+
+def score_stream(stream: Stream, configs: np.ndarray, max_lag_frames: int = 30) -> Dict[str, np.ndarray]:
+    """
+    Score every configuration on one stream.
+
+    Args:
+        stream: Stream to replay
+        configs: (C, 3) configuration grid
+        max_lag_frames: Largest delay considered when estimating lag
+
+    Returns:
+        Dictionary of per-configuration arrays: METRICS plus 'duration'
+    """
+    detected = stream.detected
+    reference = stream.reference
+    frames = len(detected)
+    # Frames whose neighbours on both sides are detected (second differences)
+    inner = detected[2:] & detected[1:-1] & detected[:-2]
+
+    results = {name: np.zeros(len(configs)) for name in METRICS}
+    for start in range(0, len(configs), _CONFIG_CHUNK):
+        chunk = slice(start, start + _CONFIG_CHUNK)
+        held, sent = simulate(stream.servo, detected, configs[chunk])
+
+        errors = []
+        for shift in range(min(max_lag_frames, frames - 1) + 1):
+            mask = detected[shift:] & detected[:frames - shift]
+            diff = np.abs(held[shift:][mask] - reference[:frames - shift][mask][:, None, :])
+            errors.append(diff.mean(axis=(0, 2)))
+        errors = np.array(errors)  # (shifts, C)
+
+        # High-pass the tracking error: a smooth lag cancels out, while noise
+        # and the steps of held updates do not
+        tracking = held - reference[:, None, :]
+        roughness = np.abs(tracking[2:] - 2 * tracking[1:-1] + tracking[:-2])[inner]
+        results['lag_ms'][chunk] = errors.argmin(axis=0) * 1000 / stream.fps
+        results['error'][chunk] = errors[0]
+        results['jitter'][chunk] = roughness.mean(axis=(0, 2)) if inner.any() else 0.0
+        results['cmds_per_s'][chunk] = sent.sum(axis=0) / stream.duration
+        results['bytes_per_s'][chunk] = _command_bytes(held, sent) / stream.duration
+    results['duration'] = np.full(len(configs), stream.duration)
+    return results
+
+
+def _score_job(job) -> Tuple[str, Optional[Dict[str, np.ndarray]], Optional[str]]:
+    kind, source, configs, options = job
+    try:
+        if kind == 'file':
+            stream = load_recording(source, options['reference_window'])
+        else:
+            stream = synthetic_stream(source, options['frames'])
+        return stream.name, score_stream(stream, configs, options['max_lag_frames']), None
+    except Exception as e:
+        return str(source), None, str(e)
+
+
+def combine(scores: List[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    """
+    Combine per-stream scores, weighting each stream by its duration.
+
+    Returns:
+        Dictionary of per-configuration arrays for METRICS
+    """
+    durations = np.array([s['duration'][0] for s in scores])
+    weights = durations / durations.sum()
+    return {name: sum(w * s[name] for w, s in zip(weights, scores)) for name in METRICS}
+
+
+def pareto_front(metrics: Dict[str, np.ndarray], objectives=PARETO_OBJECTIVES) -> np.ndarray:
+    """
+    Find the configurations no other configuration beats on every objective.
+
+    Returns:
+        Boolean mask of shape (C,)
+    """
+    values = np.stack([metrics[name] for name in objectives], axis=1)
+    better_or_equal = (values[:, None, :] <= values[None, :, :]).all(axis=2)
+    strictly_better = (values[:, None, :] < values[None, :, :]).any(axis=2)
+    dominated = (better_or_equal & strictly_better).any(axis=0)
+    return ~dominated
+
+
+def format_row(config: np.ndarray, metrics: Dict[str, np.ndarray], index: int) -> str:
+    smooth, interval, threshold = config
+    return (f"{smooth:6.2f} {int(interval):8d} {int(threshold):9d} "
+            f"{metrics['lag_ms'][index]:8.1f} {metrics['error'][index]:7.2f} {metrics['jitter'][index]:8.3f} "
+            f"{metrics['cmds_per_s'][index]:7.2f} {metrics['bytes_per_s'][index]:8.1f}")
+
+
+HEADER = f"{'smooth':>6} {'interval':>8} {'threshold':>9} {'lag_ms':>8} {'error':>7} {'jitter':>8} {'cmds/s':>7} {'bytes/s':>8}"
+
+
+def report(configs: np.ndarray, metrics: Dict[str, np.ndarray], max_lag: Optional[float]) -> str:
+    """
+    Format the Pareto front, the current settings and the recommendation.
+
+    Returns:
+        Multi-line report
+    """
+    front = np.flatnonzero(pareto_front(metrics))
+    front = front[np.argsort(metrics['lag_ms'][front], kind='stable')]
+    lines = [f"Pareto front over {', '.join(PARETO_OBJECTIVES)} ({len(front)} of {len(configs)} configurations)",
+             HEADER]
+    lines += [format_row(configs[i], metrics, i) for i in front]
+
+    current = np.flatnonzero((configs == [SMOOTH_FACTOR, UPDATE_INTERVAL, ANGLE_UPDATE_THRESHOLD]).all(axis=1))
+    lines += ["", "Current settings (config/settings.py)", HEADER]
+    lines += [format_row(configs[i], metrics, i) for i in current]
+
+    if max_lag is not None:
+        allowed = np.flatnonzero(metrics['lag_ms'] <= max_lag)
+        lines.append("")
+        if len(allowed):
+            order = np.lexsort((metrics['jitter'][allowed], metrics['bytes_per_s'][allowed]))
+            best = allowed[order[0]]
+            lines += [f"Least serial traffic with lag <= {max_lag:g} ms", HEADER, format_row(configs[best], metrics, best)]
+        else:
+            lines.append(f"No configuration reaches lag <= {max_lag:g} ms")
+    return "\n".join(lines)
+
+
+def write_csv(path: str, configs: np.ndarray, metrics: Dict[str, np.ndarray]):
+    """
+    Write every configuration and its scores to a CSV file.
+    """
+    front = pareto_front(metrics)
+    with open(path, 'w') as f:
+        f.write('smooth_factor,update_interval,angle_threshold,' + ','.join(METRICS) + ',pareto\n')
+        for i, (smooth, interval, threshold) in enumerate(configs):
+            values = ','.join(f"{metrics[name][i]:.4f}" for name in METRICS)
+            f.write(f"{smooth:g},{int(interval)},{int(threshold)},{values},{int(front[i])}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Smoothing and update-threshold parameter sweep")
+    parser.add_argument('inputs', nargs='*', help='batch_process.py .npz files, directories or glob patterns')
+    parser.add_argument('--synthetic', type=int, default=0, metavar='N', help='Add N synthetic streams')
+    parser.add_argument('--frames', type=int, default=3000, help='Frames per synthetic stream')
+    parser.add_argument('--smooth', type=float, nargs='+', default=DEFAULT_SMOOTH_FACTORS, help='SMOOTH_FACTOR values')
+    parser.add_argument('--interval', type=int, nargs='+', default=DEFAULT_UPDATE_INTERVALS,
+                        help='UPDATE_INTERVAL values')
+    parser.add_argument('--threshold', type=int, nargs='+', default=DEFAULT_THRESHOLDS,
+                        help='ANGLE_UPDATE_THRESHOLD values')
+    parser.add_argument('--max-lag', type=float, help='Lag budget in ms for the recommendation')
+    parser.add_argument('--max-lag-frames', type=int, default=30, help='Largest delay searched, in frames')
+    parser.add_argument('--reference-window', type=int, default=5,
+                        help='Moving-average window of the reference motion for recordings')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Worker processes')
+    parser.add_argument('--csv', help='Write all configurations and scores to this CSV file')
+    args = parser.parse_args()
+
+    files = []
+    for item in args.inputs:
+        if os.path.isdir(item):
+            # batch_process.py mirrors the recordings' subfolders
+            files += sorted(os.path.join(root, name) for root, _, names in os.walk(item)
+                            for name in names if name.endswith('.npz'))
+        else:
+            files += sorted(path for path in glob.glob(item) if path.endswith('.npz'))
+    if not files and not args.synthetic:
+        print("No recordings found (pass .npz files or --synthetic N).")
+        sys.exit(1)
+
+    configs = config_grid(args.smooth, args.interval, args.threshold)
+    options = {'reference_window': args.reference_window, 'frames': args.frames,
+               'max_lag_frames': args.max_lag_frames}
+    jobs = [('file', path, configs, options) for path in files]
+    jobs += [('synthetic', seed, configs, options) for seed in range(args.synthetic)]
+    print(f"{len(configs)} configurations x {len(jobs)} streams on {max(1, args.workers)} workers")
+
+    start = time.perf_counter()
+    scores = []
+    with Pool(max(1, min(args.workers, len(jobs)))) as pool:
+        for name, score, error in pool.imap_unordered(_score_job, jobs):
+            if error:
+                print(f"  {name}: FAILED ({error})")
+            else:
+                scores.append(score)
+                print(f"  {name}: {score['duration'][0]:.1f} s")
+    if not scores:
+        sys.exit(1)
+    print(f"Swept in {time.perf_counter() - start:.1f} s\n")
+
+    metrics = combine(scores)
+    print(report(configs, metrics, args.max_lag))
+    if args.csv:
+        write_csv(args.csv, configs, metrics)
+        print(f"\nAll configurations written to {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,18 @@
 # serial_comm/__init__.py
-from .arduino_comm import ArduinoInterface
+from utils.lazy_import import lazy_exports
+
+__all__ = ['ArduinoInterface', 'ArduinoEmulator', 'TrajectoryInterpolator', 'MotionRecorder', 'MotionPlayer',
+           'NullTransport', 'CommandLogTransport', 'UdpTransport', 'TcpTransport', 'open_transport']
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'ArduinoInterface': '.arduino_comm',
+    'ArduinoEmulator': '.emulator',
+    'TrajectoryInterpolator': '.trajectory',
+    'MotionRecorder': '.motion_recording',
+    'MotionPlayer': '.motion_recording',
+    'NullTransport': '.transports',
+    'CommandLogTransport': '.transports',
+    'UdpTransport': '.transports',
+    'TcpTransport': '.transports',
+    'open_transport': '.transports',
+})
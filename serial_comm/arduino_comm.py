@@ -2,28 +2,102 @@
 Arduino communication module.
 """
 import serial
+import threading
 import time
-from typing import Dict, Optional
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from .delta_encoder import DeltaEncoder
+from .protocol import (PRESET_COMMANDS, format_move_fingers, format_telemetry_request, format_trajectory,
+                       parse_ack, parse_telemetry, tag_sequence)
+from .telemetry import BoardMonitor
+from .transports import open_transport
+
+# Port name that selects the software emulator instead of a real board
+EMULATOR_PORT = 'emulator'
+
+# Segments to wait before sending a change within the update threshold
+SETTLE_SEGMENTS = 5
+
+# Acks kept for poll_acks() when nobody collects them
+MAX_QUEUED_ACKS = 1024
+
+# Seconds without an ack after which a full flow-control window is assumed lost
+FLOW_ACK_TIMEOUT = 2.0
 
 class ArduinoInterface:
     """
     Class for communicating with Arduino.
     """
-    def __init__(self, port: str, baudrate: int, timeout: int = 1):
+    def __init__(self, port: str, baudrate: int, timeout: int = 1,
+                 trajectory_mode: bool = False, segment_ms: int = 100,
+                 delta_mode: bool = False, deadbands: Optional[Dict[str, int]] = None,
+                 keyframe_interval: float = 1.0, sequence_numbers: bool = False,
+                 recorder=None, telemetry_ms: int = 0, throttle: bool = True,
+                 telemetry_limits: Optional[Dict] = None, flow_window: int = 0,
+                 ack_timeout: float = FLOW_ACK_TIMEOUT):
         """
         Initialize the Arduino communication.
         
         Args:
-            port: Serial port for Arduino
+            port: Serial port for Arduino, or a backend name from transports.py
+                ('emulator', 'null', 'file:<path>', 'udp:<host>:<port>', 'tcp:<host>:<port>')
             baudrate: Baud rate for serial communication
             timeout: Serial timeout in seconds
+            trajectory_mode: Send timed trajectory segments that the board
+                interpolates, instead of absolute movefingers targets
+            segment_ms: Trajectory segment duration in milliseconds
+            delta_mode: Send only the fingers that changed beyond their dead-band
+            deadbands: Per-finger dead-bands for delta mode
+            keyframe_interval: Seconds between full-state keyframes in delta mode
+            sequence_numbers: Tag every command with a sequence number; the
+                board acknowledges each one (see poll_acks)
+            recorder: Optional MotionRecorder that logs every target sent
+            telemetry_ms: Ask the board for a status frame every N ms and read
+                its output on a background thread (0 = off; enables sequence numbers)
+            throttle: With telemetry, skip angle updates while the board is behind
+            telemetry_limits: Overrides for telemetry.DEFAULT_TELEMETRY_LIMITS
+            flow_window: Keep at most N unacknowledged targets in flight; a
+                newer target replaces one still waiting to be sent (0 = off;
+                enables sequence numbers)
+            ack_timeout: Seconds without an ack before a full window is
+                assumed lost and sending resumes; with telemetry, also the
+                silence after which a throttling board is resynced
         """
         self.port = port
         self.baudrate = baudrate
         self.timeout = timeout
+        self.trajectory_mode = trajectory_mode
+        self.segment_ms = segment_ms
+        self.delta_mode = delta_mode
+        self.delta_encoder = DeltaEncoder(deadbands or {}, keyframe_interval)
         self.ser = None
         self.last_angles = {}
+        self.last_segment_time = None
+        self.commands_sent = 0
+        self.bytes_sent = 0
+        self.sequence_numbers = sequence_numbers or telemetry_ms > 0 or flow_window > 0
+        self.next_sequence = 0
+        self.last_sequence = None
+        self._acks = deque(maxlen=MAX_QUEUED_ACKS)
+        self.recorder = recorder
+        self.monitor = BoardMonitor(telemetry_ms, telemetry_limits) if telemetry_ms > 0 else None
+        self.throttle = throttle
+        self.throttled = 0
+        self.flow_window = flow_window
+        self.ack_timeout = ack_timeout
+        self.acked_sequence = -1
+        self.coalesced = 0
+        self.ack_timeouts = 0
+        self._pending = None          # (command, trace) waiting for room in the window
+        self._last_write_time = None
+        self._write_lock = threading.RLock()  # Acks release pending targets from the reader thread
+        self._reader = None
+        self._reader_stop = threading.Event()
+        self._warned_disconnected = False
         self.connect()
+        if self.ser is not None and (self.monitor is not None or self.flow_window):
+            self.start_reader()
     
     def connect(self) -> bool:
         """
@@ -32,6 +106,21 @@ class ArduinoInterface:
         Returns:
             Success status
         """
+        # Emulator, null, file and network backends (see transports.py)
+        try:
+            transport = open_transport(self.port, self.timeout)
+        except (OSError, ValueError) as e:
+            print(f"Backend bağlantı hatası ({self.port}): {e}")
+            self.ser = None
+            return False
+        if transport is not None:
+            self.ser = transport
+            if self.port.startswith(EMULATOR_PORT):
+                print("Arduino emülatörü kullanılıyor")
+            else:
+                print(f"Backend kullanılıyor: {self.port}")
+            return True
+        
         try:
             print(f"Arduino'ya {self.port} portundan bağlanılıyor...")
             # Uncomment this for debugging without Arduino
@@ -55,7 +144,8 @@ class ArduinoInterface:
             print(f"Arduino bağlantı hatası: {e}")
             self.ser = None
             return False
-    def send_finger_angles(self, angles: Dict[str, int], update_interval: int, angle_threshold: int) -> bool:
+    def send_finger_angles(self, angles: Dict[str, int], update_interval: int, angle_threshold: int,
+                           trace=None) -> bool:
         """
         Send finger angles to Arduino.
         
@@ -63,41 +153,406 @@ class ArduinoInterface:
             angles: Dictionary of finger angles
             update_interval: Frame interval for updates
             angle_threshold: Minimum angle change to trigger update
+            trace: Optional FrameTrace (utils.tracing) to mark decide/write on
             
         Returns:
             Success status
         """
         if self.ser is None:
-            print("No Arduino connection!")
+            self._warn_disconnected()
             return False
         
+        # Hold back while the board is not keeping up; a later frame carries a newer target
+        if self.throttle and self.monitor is not None and self.monitor.is_behind(self.last_sequence):
+            if self.monitor.silence_s() < self.ack_timeout:
+                self.throttled += 1
+                return False
+            # Board silent (e.g. a reset): stop waiting for it and start over
+            self._resync_board()
+        
+        if self.trajectory_mode:
+            return self._send_trajectory_update(angles, angle_threshold, trace)
+        if self.delta_mode:
+            return self._send_delta_update(angles, trace)
+        
         # Check if update is needed
         should_update = self._should_update_angles(angles, update_interval, angle_threshold)
         
         if should_update:
             # Create unified command
-            unified_cmd = (
-                f"movefingers:{angles['thumb_mcp']}:{angles['thumb_ip']}:"
-                f"{angles['index']}:{angles['middle']}:{angles['ring']}:{angles['pinky']}\n"
-            )
+            unified_cmd = format_move_fingers(angles)
             
             print(f"Sending command to Arduino: {unified_cmd.strip()}")
-            self.ser.write(unified_cmd.encode())
+            self._submit(unified_cmd, trace)
             
-            # Try to get response
-            time.sleep(0.1)
-            if self.ser.in_waiting:
+            # Try to get response (the reader thread reads it otherwise;
+            # other backends answer at once)
+            if self._reader is None and isinstance(self.ser, serial.Serial):
+                time.sleep(0.1)
+            if self._reader is None and self.ser.in_waiting:
                 response = self.ser.readline().decode('utf-8').strip()
-                print(f"Arduino response: {response}")
+                self._handle_response(response)
             
             # Update last angles
             self.last_angles = angles.copy()
             self.frame_counter = 0
+            self._record(angles)
             return True
         
         self.frame_counter += 1
         return False
     
+    def send_preset(self, gesture: str, trace=None) -> bool:
+        """
+        Trigger one of the sketch's preset gestures.
+        
+        The next streamed update is sent in full, since the preset moves
+        every finger. A target still waiting in the flow-control window is
+        dropped, so it cannot override the preset once the preset is acked.
+        
+        Args:
+            gesture: Preset name ('open', 'close', 'thumbsup', 'point', 'pinch', 'wave')
+            trace: Optional FrameTrace to mark decide/write on
+            
+        Returns:
+            Success status
+        """
+        if self.ser is None:
+            self._warn_disconnected()
+            return False
+        if gesture not in PRESET_COMMANDS:
+            print(f"Unknown preset: {gesture}")
+            return False
+        
+        print(f"Sending preset to Arduino: {gesture}")
+        with self._write_lock:
+            if self._pending is not None:
+                self._pending = None
+                self.coalesced += 1
+            self._write(f"{gesture}\n", trace)
+        self.last_angles = {}
+        self.last_segment_time = None
+        self.delta_encoder.reset()
+        return True
+    
+    def _send_delta_update(self, angles: Dict[str, int], trace=None) -> bool:
+        """
+        Send only the fingers that moved beyond their dead-band.
+        
+        Every update that changes a finger is sent immediately, so response
+        time is the same as a full update, but a still hand produces no
+        traffic apart from the periodic keyframe.
+        
+        Args:
+            angles: Dictionary of finger angles
+            trace: Optional FrameTrace
+            
+        Returns:
+            True if a command was sent
+        """
+        command = self.delta_encoder.encode(angles)
+        if command is None:
+            return False
+        
+        # A delta only lists the fingers that moved, so it cannot replace
+        # another waiting one; the full target can
+        if self._pending is not None:
+            command = format_move_fingers(angles)
+        self._submit(command, trace)
+        self.last_angles = angles.copy()
+        self._record(angles)
+        return True
+    
+    def _send_trajectory_update(self, angles: Dict[str, int], angle_threshold: int, trace=None) -> bool:
+        """
+        Send the current target as a trajectory segment, at most once per segment.
+        
+        The board interpolates towards each target over ``segment_ms``, so motion
+        stays smooth while the host sends one message per segment instead of one
+        per frame. Small changes (within the threshold) are only sent after the
+        hand has been still for a few segments, so the final pose still settles.
+        
+        Args:
+            angles: Dictionary of finger angles
+            angle_threshold: Minimum angle change to trigger a new segment
+            trace: Optional FrameTrace
+            
+        Returns:
+            True if a segment was sent
+        """
+        now = time.monotonic()
+        if self.last_segment_time is not None:
+            elapsed_ms = (now - self.last_segment_time) * 1000
+            if elapsed_ms < self.segment_ms:
+                return False
+            
+            max_change = max(
+                (abs(value - self.last_angles.get(key, value)) for key, value in angles.items()),
+                default=0
+            )
+            if max_change == 0:
+                return False
+            if max_change <= angle_threshold and elapsed_ms < self.segment_ms * SETTLE_SEGMENTS:
+                return False
+        
+        return self.send_trajectory_segment(angles, self.segment_ms, trace)
+    
+    def send_trajectory_segment(self, angles: Dict[str, int], duration_ms: int, trace=None) -> bool:
+        """
+        Send a timed trajectory segment to Arduino.
+        
+        Args:
+            angles: Dictionary of target finger angles
+            duration_ms: Time for the board to reach the target, in milliseconds
+            trace: Optional FrameTrace
+            
+        Returns:
+            Success status
+        """
+        if self.ser is None:
+            self._warn_disconnected()
+            return False
+        
+        self._submit(format_trajectory(angles, duration_ms), trace)
+        self._record(angles)
+        self.last_angles = angles.copy()
+        self.last_segment_time = time.monotonic()
+        return True
+    
+    def send_move(self, angles: Dict[str, int]) -> bool:
+        """
+        Send an absolute target immediately, without the update decision or
+        waiting for a response (used for playback).
+        
+        Lines the board has sent are consumed without waiting, unless the
+        reader thread does it, so a long playback does not fill the host's
+        input buffer.
+        
+        Args:
+            angles: Dictionary of finger angles
+            
+        Returns:
+            Success status
+        """
+        if self.ser is None:
+            return False
+        self._submit(format_move_fingers(angles))
+        self.last_angles = angles.copy()
+        if self._reader is None:
+            self._read_responses()
+        return True
+    
+    def _warn_disconnected(self):
+        """
+        Report the missing connection once instead of on every frame.
+        """
+        if not self._warned_disconnected:
+            print("No Arduino connection! Commands are dropped (use --port null to run without a board).")
+            self._warned_disconnected = True
+    
+    def _record(self, angles: Dict[str, int]):
+        """
+        Log a sent target to the recorder, if one is attached.
+        """
+        if self.recorder is not None:
+            self.recorder.record(angles)
+    
+    def in_flight(self) -> int:
+        """
+        Returns:
+            Sequence-numbered commands written but not yet acknowledged
+        """
+        if self.last_sequence is None:
+            return 0
+        return max(0, self.last_sequence - self.acked_sequence)
+    
+    def _submit(self, command: str, trace=None):
+        """
+        Send a streamed target, subject to the flow-control window.
+        
+        Without a window the command is written immediately. With one, it
+        waits while ``flow_window`` commands are unacknowledged, and a newer
+        target replaces it (latest wins), so the board never has more than
+        the window of stale targets queued however slow it gets.
+        
+        Args:
+            command: Newline-terminated target command
+            trace: Optional FrameTrace, marked only if the command is written now
+        """
+        if not self.flow_window:
+            self._write(command, trace)
+            return
+        with self._write_lock:
+            if self._pending is not None:
+                self.coalesced += 1
+            self._pending = (command, trace)
+            self._flush_pending()
+    
+    def _flush_pending(self):
+        """
+        Write the waiting target if the window has room (call with _write_lock held).
+        """
+        if self._pending is None:
+            return
+        if self.in_flight() >= self.flow_window:
+            if time.monotonic() - self._last_write_time < self.ack_timeout:
+                return
+            # Acks lost (e.g. a board reset): stop waiting for them
+            self.ack_timeouts += 1
+            self.acked_sequence = self.last_sequence
+        command, trace = self._pending
+        self._pending = None
+        self._write(command, trace)
+    
+    def _write(self, command: str, trace=None):
+        """
+        Write a command line to the serial port and update traffic counters.
+        
+        With sequence numbers enabled the command is tagged with the next
+        sequence number, which is also recorded on the trace.
+        
+        Args:
+            command: Newline-terminated command
+            trace: Optional FrameTrace; 'decide' is marked before and 'write' after
+        """
+        if trace is not None:
+            trace.mark('decide')
+        with self._write_lock:
+            if self.sequence_numbers:
+                self.last_sequence = self.next_sequence
+                self.next_sequence += 1
+                command = tag_sequence(command, self.last_sequence)
+                if trace is not None:
+                    trace.seq = self.last_sequence
+            data = command.encode()
+            self.ser.write(data)
+            self._last_write_time = time.monotonic()
+            self.commands_sent += 1
+            self.bytes_sent += len(data)
+            if self.monitor is not None and self.sequence_numbers:
+                self.monitor.note_sent(self.last_sequence)
+            # Sinks that answer synchronously (null, file): take the ack now
+            # instead of waiting for the reader thread's next poll
+            if getattr(self.ser, 'immediate_acks', False):
+                self._read_responses()
+        if trace is not None:
+            trace.mark('write')
+    
+    def _resync_board(self):
+        """
+        Take everything written as applied and ask for telemetry again,
+        which a board that has reset no longer sends.
+        """
+        with self._write_lock:
+            self.monitor.resync(self.last_sequence)
+            if self.last_sequence is not None:
+                self.acked_sequence = max(self.acked_sequence, self.last_sequence)
+            self.ser.write(format_telemetry_request(self.monitor.interval_ms).encode())
+    
+    def _handle_response(self, line: str):
+        """
+        Handle a line received from the board: acks are queued for
+        poll_acks() with the time they were read, telemetry goes to the
+        monitor, anything else is printed.
+        
+        Args:
+            line: Line without the newline
+        """
+        ack = parse_ack(line)
+        if ack is not None:
+            now = time.monotonic()
+            self._acks.append((ack[0], ack[1], now))
+            if self.monitor is not None:
+                self.monitor.note_ack(ack[0], now)
+            self._release(ack[0])
+            return
+        telemetry = parse_telemetry(line)
+        if telemetry is not None:
+            if self.monitor is not None:
+                self.monitor.update(telemetry)
+            self._release(telemetry.sequence)
+        elif line:
+            print(f"Arduino response: {line}")
+    
+    def _release(self, applied_sequence: int):
+        """
+        Note that the board applied everything up to ``applied_sequence`` and
+        send the waiting target if that opened the window.
+        """
+        with self._write_lock:
+            self.acked_sequence = max(self.acked_sequence, applied_sequence)
+            if self.flow_window:
+                self._flush_pending()
+    
+    def start_reader(self):
+        """
+        Start the thread that reads acks and telemetry, and enable periodic
+        telemetry on the board if requested.
+        """
+        if self._reader is not None:
+            return
+        if self.monitor is not None:
+            self.ser.write(format_telemetry_request(self.monitor.interval_ms).encode())
+        self._reader_stop.clear()
+        self._reader = threading.Thread(target=self._read_loop, name="ArduinoReader", daemon=True)
+        self._reader.start()
+    
+    def stop_reader(self):
+        """
+        Stop the reader thread and the board's periodic telemetry.
+        """
+        if self._reader is None:
+            return
+        self._reader_stop.set()
+        self._reader.join(self.timeout + 0.5)
+        self._reader = None
+        if self.monitor is not None:
+            self.ser.write(format_telemetry_request(0).encode())
+    
+    def _read_loop(self):
+        """
+        Reader thread: handle every line the board sends.
+        """
+        while not self._reader_stop.is_set():
+            try:
+                line = self.ser.readline()
+            except Exception as e:
+                print(f"Arduino read error: {e}")
+                return
+            if not line:
+                self._reader_stop.wait(0.001)
+                continue
+            self._handle_response(line.decode('utf-8', errors='replace').strip())
+    
+    def queue_depth(self) -> int:
+        """
+        Returns:
+            Commands written but not yet applied by the board (needs telemetry)
+        """
+        return self.monitor.queue_depth(self.last_sequence) if self.monitor is not None else 0
+    
+    def poll_acks(self) -> List[Tuple[int, int, float]]:
+        """
+        Read pending lines from the board without blocking.
+        
+        Returns:
+            List of (sequence number, board millis, time.monotonic() the ack
+            was read) acks received since the last call
+        """
+        if self.ser is not None and self._reader is None:
+            self._read_responses()
+        acks = []
+        while self._acks:
+            acks.append(self._acks.popleft())
+        return acks
+    
+    def _read_responses(self):
+        """
+        Handle every line the board has already sent, without blocking.
+        """
+        while self.ser.in_waiting:
+            self._handle_response(self.ser.readline().decode('utf-8', errors='replace').strip())
+    
     def _should_update_angles(self, angles: Dict[str, int], update_interval: int, angle_threshold: int) -> bool:
         """
         Decide if angles should be updated.
@@ -133,6 +588,13 @@ class ArduinoInterface:
         Close Arduino connection.
         """
         if self.ser is not None:
+            # The last target may still be waiting for room in the window
+            with self._write_lock:
+                if self._pending is not None:
+                    command, trace = self._pending
+                    self._pending = None
+                    self._write(command, trace)
+            self.stop_reader()
             self.ser.write(b"stop\n")
             time.sleep(0.5)
             self.ser.close()
@@ -0,0 +1,78 @@
+"""
+Per-channel delta encoding of servo updates.
+"""
+import time
+from typing import Callable, Dict, Optional
+
+from .protocol import FINGER_ORDER, format_delta, format_move_fingers
+
+
+class DeltaEncoder:
+    """
+    Tracks the last commanded angle of every finger and encodes only the
+    fingers that moved beyond their dead-band, with periodic full keyframes
+    so the board resynchronizes after a lost or ignored command.
+    """
+    def __init__(self, deadbands: Dict[str, int], keyframe_interval: float = 1.0,
+                 clock: Optional[Callable[[], float]] = None):
+        """
+        Initialize the encoder.
+
+        Args:
+            deadbands: Minimum angle change per finger before it is resent
+            keyframe_interval: Seconds between full-state keyframes
+            clock: Function returning the current time in seconds
+        """
+        self.deadbands = deadbands
+        self.keyframe_interval = keyframe_interval
+        self.clock = clock or time.monotonic
+        self.commanded = {}
+        self.last_keyframe_time = None
+
+    def reset(self):
+        """
+        Forget the commanded state; the next update is a keyframe.
+        """
+        self.commanded = {}
+        self.last_keyframe_time = None
+
+    def changed_fingers(self, angles: Dict[str, int]) -> Dict[str, int]:
+        """
+        Find fingers whose target moved beyond their dead-band.
+
+        Args:
+            angles: Dictionary of finger angles
+
+        Returns:
+            Dictionary of changed finger angles
+        """
+        changed = {}
+        for finger in FINGER_ORDER:
+            value = int(angles[finger])
+            deadband = self.deadbands.get(finger, 0)
+            if abs(value - self.commanded.get(finger, value)) > deadband:
+                changed[finger] = value
+        return changed
+
+    def encode(self, angles: Dict[str, int]) -> Optional[str]:
+        """
+        Encode an update and record it as commanded.
+
+        Args:
+            angles: Dictionary of finger angles
+
+        Returns:
+            Command line to send, or None if nothing needs sending
+        """
+        now = self.clock()
+        if (not self.commanded or self.last_keyframe_time is None or
+                now - self.last_keyframe_time >= self.keyframe_interval):
+            self.commanded = {finger: int(angles[finger]) for finger in FINGER_ORDER}
+            self.last_keyframe_time = now
+            return format_move_fingers(self.commanded)
+
+        changed = self.changed_fingers(angles)
+        if not changed:
+            return None
+        self.commanded.update(changed)
+        return format_delta(changed)
@@ -0,0 +1,290 @@
+"""
+Software emulator of the hand_mimic_controller sketch.
+
+``ArduinoEmulator`` exposes the subset of the ``serial.Serial`` interface used
+by ``ArduinoInterface`` (``write``, ``readline``, ``in_waiting``, ``close``) and
+applies commands to a model of the servo state, so the host side can be run
+and measured without a board attached. ``command_ms`` models a board that
+blocks for a while on every command (like moveServoSmooth()): later commands
+wait in the receive buffer until it is free again, and, as in the sketch, a
+command's ack is sent only when that busy period ends.
+
+Output is a byte stream like the board's serial port: readline() returns one
+complete line, so text printed without a newline runs into the next line
+exactly as it does on the real board.
+"""
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from .protocol import ACK_PREFIX, SEQUENCE_SEPARATOR, SERVO_CHANNELS, TELEMETRY_COMMAND, format_telemetry
+from .trajectory import TrajectoryInterpolator
+
+# Same dead-band as setServo() in the sketch
+SERVO_DEADBAND = 3
+
+# Free RAM reported in telemetry frames (bytes)
+EMULATED_FREE_RAM = 1024
+
+# Final servo positions of the sketch's preset gestures, in SERVO_CHANNELS order
+PRESET_POSITIONS = {
+    'open': (0, 0, 0, 0, 0, 0),
+    'close': (180, 180, 180, 180, 180, 180),
+    'thumbsup': (0, 180, 180, 180, 180, 180),
+    'point': (180, 180, 0, 180, 180, 180),
+    'pinch': (90, 90, 90, 180, 180, 180),
+    'wave': (0, 0, 0, 0, 0, 0),
+}
+
+
+class ArduinoEmulator:
+    """
+    Serial-port stand-in that behaves like the Arduino sketch.
+    """
+    def __init__(self, clock: Optional[Callable[[], float]] = None, command_ms: float = 0,
+                 legacy_debug_output: bool = False):
+        """
+        Initialize the emulator.
+
+        Args:
+            clock: Function returning the current time in seconds
+                   (defaults to time.monotonic)
+            command_ms: Time the emulated board is busy after each command
+            legacy_debug_output: Print moveServoSmooth()'s debug values without
+                a newline, like sketches before the fix did
+        """
+        self.clock = clock or time.monotonic
+        self.epoch = self.clock()  # Clock value at millis() == 0
+        self.interpolator = TrajectoryInterpolator(SERVO_CHANNELS)
+        self.is_running = True
+        self.is_open = True
+        self.commands = []  # (time in seconds, command) tuples
+        self.bytes_received = 0
+        self._rx_buffer = b""
+        self._tx_buffer = b""
+        self.legacy_debug_output = legacy_debug_output
+        self.last_sequence = -1
+        self.telemetry_interval_ms = 0
+        self._last_telemetry_ms = 0
+        self._longest_apply_us = 0
+        self.command_ms = command_ms
+        self._busy_until = 0.0
+        self._deferred_ack = None  # Sequence number acknowledged when the busy period ends
+        self._rx_lock = threading.Lock()  # The host may write and read on different threads
+
+    # serial.Serial compatible interface
+
+    def write(self, data: bytes) -> int:
+        """
+        Receive bytes from the host.
+
+        Args:
+            data: Raw bytes (may contain several newline-terminated commands)
+
+        Returns:
+            Number of bytes accepted
+        """
+        self.bytes_received += len(data)
+        with self._rx_lock:
+            self._rx_buffer += data
+        self._process_rx()
+        return len(data)
+
+    @property
+    def in_waiting(self) -> int:
+        self._process_rx()
+        self._poll_telemetry()
+        return len(self._tx_buffer)
+
+    def readline(self) -> bytes:
+        self._process_rx()
+        self._poll_telemetry()
+        if b"\n" not in self._tx_buffer:
+            return b""
+        line, self._tx_buffer = self._tx_buffer.split(b"\n", 1)
+        return line + b"\n"
+
+    def close(self):
+        self.is_open = False
+
+    # Emulator helpers
+
+    def millis(self) -> int:
+        """
+        Returns:
+            Milliseconds since the emulator was created
+        """
+        return int((self.clock() - self.epoch) * 1000)
+
+    @property
+    def pending_commands(self) -> int:
+        """
+        Returns:
+            Complete commands received but not yet applied (busy board backlog)
+        """
+        return self._rx_buffer.count(b"\n")
+
+    def positions(self) -> Dict[int, int]:
+        """
+        Current servo positions, advanced to the present time.
+
+        Returns:
+            Dictionary of angles by servo channel
+        """
+        return self.interpolator.update(self.millis())
+
+    def print(self, text: str):
+        """
+        Queue text for the host to read, without a newline (Serial.print).
+
+        Args:
+            text: Text to send
+        """
+        self._tx_buffer += text.encode('utf-8')
+
+    def println(self, text: str):
+        """
+        Queue a line for the host to read (Serial.println).
+
+        Args:
+            text: Line contents without the newline
+        """
+        self.print(f"{text}\r\n")
+
+    def send_telemetry(self):
+        """
+        Queue a status frame, like telemetriGonder() in the sketch.
+        
+        The loop-time field reports the longest command application since
+        the previous frame.
+        """
+        positions = self.positions()
+        self.println(format_telemetry(self.millis(), self.last_sequence, self._longest_apply_us,
+                                      EMULATED_FREE_RAM, len(self._rx_buffer),
+                                      [positions[channel] for channel in SERVO_CHANNELS]))
+        self._last_telemetry_ms = self.millis()
+        self._longest_apply_us = 0
+
+    def _process_rx(self):
+        """Apply buffered commands, one per command_ms while the board is busy."""
+        with self._rx_lock:
+            while True:
+                now = self.clock()
+                if now < self._busy_until:
+                    return
+                if self._deferred_ack is not None:
+                    self._send_ack(self._deferred_ack, int((self._busy_until - self.epoch) * 1000))
+                    self._deferred_ack = None
+                if b"\n" not in self._rx_buffer:
+                    return
+                line, self._rx_buffer = self._rx_buffer.split(b"\n", 1)
+                seq = self._handle_command(line.decode('utf-8', errors='replace').strip())
+                if self.command_ms:
+                    # Like the sketch, acknowledge after the blocking move returns
+                    self._busy_until = now + self.command_ms / 1000
+                    self._deferred_ack = seq
+                elif seq is not None:
+                    self._send_ack(seq, self.millis())
+
+    def _send_ack(self, seq: str, millis: int):
+        """Acknowledge an applied command, like loop() in the sketch."""
+        try:
+            self.last_sequence = int(seq)
+        except ValueError:
+            pass
+        self.println(f"{ACK_PREFIX}{seq}:{millis}")
+
+    def _poll_telemetry(self):
+        """Emit the periodic telemetry frame when it is due."""
+        if self.telemetry_interval_ms and self.millis() - self._last_telemetry_ms >= self.telemetry_interval_ms:
+            self.send_telemetry()
+
+    def _set_servo(self, channel: int, angle: int):
+        """Equivalent of setServo(): ignores changes under the dead-band."""
+        angle = max(0, min(int(angle), 180))
+        if abs(self.interpolator.positions[channel] - angle) < SERVO_DEADBAND:
+            return
+        self.interpolator.set_position(channel, angle)
+
+    def _move_smooth(self, channel: int, angle: int):
+        """Equivalent of moveServoSmooth(), including its debug output."""
+        current = self.interpolator.positions[channel]
+        if self.legacy_debug_output:
+            self.print(f"{channel}{current}{angle}")
+        else:
+            self.println(f"{channel} {current} {angle}")
+        self.interpolator.set_position(channel, angle)
+
+    def _parse_values(self, command: str) -> List[int]:
+        values = []
+        for field in command.split(':')[1:]:
+            try:
+                values.append(int(field))
+            except ValueError:
+                values.append(0)
+        return values
+
+    def _handle_command(self, command: str) -> Optional[str]:
+        """Apply one command line; returns its sequence number, if tagged."""
+        now_ms = self.millis()
+        self.interpolator.update(now_ms)
+        self.commands.append((now_ms / 1000.0, command))
+
+        command, separator, seq = command.partition(SEQUENCE_SEPARATOR)
+        start = time.perf_counter()
+        self._apply_command(command)
+        self._longest_apply_us = max(self._longest_apply_us, int((time.perf_counter() - start) * 1e6))
+        return seq.strip() if separator else None
+
+    def _apply_command(self, command: str):
+        now_ms = self.millis()
+
+        if command == "stop":
+            self.is_running = False
+            self.interpolator.cancel()
+            return
+        if command == "start":
+            self.is_running = True
+            return
+        if command == "status":
+            self.send_telemetry()
+            return
+        if command.startswith(TELEMETRY_COMMAND):
+            values = self._parse_values(command)
+            self.telemetry_interval_ms = max(0, values[0]) if values else 0
+            return
+        if not self.is_running:
+            return
+
+        if not command.startswith("traj"):
+            self.interpolator.cancel()
+
+        if command.startswith("movefingers:"):
+            values = self._parse_values(command)
+            if len(values) >= 6:
+                for channel, angle in zip(SERVO_CHANNELS, values):
+                    self._set_servo(channel, angle)
+        elif command.startswith("delta:"):
+            values = self._parse_values(command)
+            for index, angle in zip(values[0::2], values[1::2]):
+                if 0 <= index < len(SERVO_CHANNELS):
+                    self._set_servo(SERVO_CHANNELS[index], angle)
+        elif command.startswith("trajv:"):
+            values = self._parse_values(command)
+            if len(values) >= 7:
+                for channel, angle in zip(SERVO_CHANNELS, values[1:]):
+                    self.interpolator.start_velocity_segment(channel, angle, values[0], now_ms)
+        elif command.startswith("traj:"):
+            values = self._parse_values(command)
+            if len(values) >= 7:
+                for channel, angle in zip(SERVO_CHANNELS, values[1:]):
+                    self.interpolator.start_segment(channel, angle, values[0], now_ms)
+        elif command.startswith("servo:"):
+            values = self._parse_values(command)
+            if len(values) >= 2 and values[0] in SERVO_CHANNELS:
+                self._set_servo(values[0], values[1])
+        elif command in PRESET_POSITIONS:
+            for channel, angle in zip(SERVO_CHANNELS, PRESET_POSITIONS[command]):
+                self._move_smooth(channel, angle)
+        elif command == "init":
+            self.println("Sistem başlatıldı")
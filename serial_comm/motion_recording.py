@@ -0,0 +1,343 @@
+"""
+Recording and time-accurate playback of servo target streams.
+
+MotionRecorder logs every target sent to the board with a ``time.monotonic()``
+timestamp. The file is compact: an 8-byte header followed by one 10-byte
+record per target (uint32 microseconds since the previous record, then six
+uint8 angles in FINGER_ORDER).
+
+MotionPlayer sends a recording as ``movefingers`` commands. The send times
+are scheduled by HybridScheduler, which sleeps until shortly before each
+deadline and then spins, for sub-millisecond precision without burning a
+core between commands. Playback supports:
+  * speed scaling
+  * looping
+  * keyframe decimation (minimum interval and/or minimum angle change)
+It works on the real port or the emulator, and reports how late each
+command was sent.
+
+Usage:
+    python -m serial_comm.motion_recording info demo.hmr
+    python -m serial_comm.motion_recording play demo.hmr --port emulator --speed 1.5 --loops 3
+    python -m serial_comm.motion_recording synth demo.hmr --seconds 30
+"""
+import argparse
+import time
+from typing import Dict, NamedTuple, Optional
+
+import numpy as np
+
+from .protocol import FINGER_ORDER
+
+MAGIC = b'HMR1'
+HEADER_SIZE = 8  # Magic, then four reserved bytes
+RECORD_DTYPE = np.dtype([('dt_us', '<u4'), ('angles', 'u1', (len(FINGER_ORDER),))])
+
+# Remaining wait below which the scheduler spins instead of sleeping
+SPIN_THRESHOLD = 0.002
+
+
+class MotionRecorder:
+    """
+    Appends timestamped servo targets to a recording file.
+    """
+    def __init__(self, path: str):
+        """
+        Create (or overwrite) a recording.
+
+        Args:
+            path: Output file
+        """
+        self.path = path
+        self.count = 0
+        self._file = open(path, 'wb')
+        self._file.write(MAGIC + bytes(HEADER_SIZE - len(MAGIC)))
+        self._last_time = None
+        self._record = np.zeros(1, dtype=RECORD_DTYPE)
+
+    def record(self, angles: Dict[str, int], timestamp: Optional[float] = None):
+        """
+        Append one target.
+
+        Args:
+            angles: Dictionary of finger angles
+            timestamp: time.monotonic() of the send (defaults to now)
+        """
+        now = time.monotonic() if timestamp is None else timestamp
+        dt_us = 0 if self._last_time is None else int(round((now - self._last_time) * 1e6))
+        self._last_time = now
+        self._record['dt_us'] = min(max(dt_us, 0), 0xFFFFFFFF)
+        self._record['angles'] = [min(max(int(angles[finger]), 0), 180) for finger in FINGER_ORDER]
+        self._file.write(self._record.tobytes())
+        self.count += 1
+
+    def close(self):
+        """
+        Flush and close the file.
+        """
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Recording(NamedTuple):
+    """A loaded recording."""
+    times: np.ndarray   # (N,) float64 seconds from the first target
+    angles: np.ndarray  # (N, 6) uint8 angles in FINGER_ORDER
+
+    @property
+    def duration(self) -> float:
+        return float(self.times[-1]) if len(self.times) else 0.0
+
+
+def load_recording(path: str) -> Recording:
+    """
+    Read a recording file.
+
+    Args:
+        path: File written by MotionRecorder
+
+    Returns:
+        Recording
+    """
+    with open(path, 'rb') as f:
+        header = f.read(HEADER_SIZE)
+        if header[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a motion recording")
+        data = f.read()
+    usable = len(data) - len(data) % RECORD_DTYPE.itemsize  # Ignore a truncated last record
+    records = np.frombuffer(data[:usable], dtype=RECORD_DTYPE)
+    times = np.cumsum(records['dt_us'], dtype=np.float64) / 1e6
+    return Recording(times, records['angles'].copy())
+
+
+def save_recording(path: str, recording: Recording):
+    """
+    Write a recording (e.g. after decimation or from synthetic data).
+
+    Args:
+        path: Output file
+        recording: Recording to write
+    """
+    records = np.zeros(len(recording.times), dtype=RECORD_DTYPE)
+    micros = np.round(np.asarray(recording.times) * 1e6).astype(np.int64)
+    records['dt_us'] = np.diff(micros, prepend=micros[:1]).clip(0, 0xFFFFFFFF)
+    records['angles'] = np.clip(recording.angles, 0, 180)
+    with open(path, 'wb') as f:
+        f.write(MAGIC + bytes(HEADER_SIZE - len(MAGIC)))
+        f.write(records.tobytes())
+
+
+def decimate(recording: Recording, min_interval: float = 0.0, min_change: int = 0) -> Recording:
+    """
+    Drop targets that come too soon or change too little after the last kept one.
+
+    The first and last targets are always kept, so playback starts and ends
+    in the recorded poses.
+
+    Args:
+        recording: Recording to thin out
+        min_interval: Minimum seconds between kept targets
+        min_change: Minimum change of any finger, in degrees, since the last kept target
+
+    Returns:
+        Decimated recording
+    """
+    count = len(recording.times)
+    if count <= 2 or (min_interval <= 0 and min_change <= 0):
+        return recording
+    angles = recording.angles.astype(np.int16)
+    keep = [0]
+    for i in range(1, count - 1):
+        last = keep[-1]
+        if recording.times[i] - recording.times[last] < min_interval:
+            continue
+        if np.abs(angles[i] - angles[last]).max() < min_change:
+            continue
+        keep.append(i)
+    keep.append(count - 1)
+    return Recording(recording.times[keep], recording.angles[keep])
+
+
+class HybridScheduler:
+    """
+    Waits for deadlines by sleeping most of the way and spinning the rest.
+    """
+    def __init__(self, spin_threshold: float = SPIN_THRESHOLD):
+        """
+        Initialize the scheduler.
+
+        Args:
+            spin_threshold: Seconds before the deadline at which sleeping stops
+        """
+        self.spin_threshold = spin_threshold
+
+    def wait_until(self, deadline: float) -> float:
+        """
+        Block until ``deadline`` (a time.perf_counter() value).
+
+        Returns:
+            The time the wait ended
+        """
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= self.spin_threshold:
+                break
+            time.sleep(remaining - self.spin_threshold)
+        now = time.perf_counter()
+        while now < deadline:
+            now = time.perf_counter()
+        return now
+
+
+class PlaybackReport(NamedTuple):
+    """Timing of a playback run."""
+    commands: int
+    duration: float          # Wall-clock seconds
+    lateness_us: np.ndarray  # Send time minus scheduled time, per command
+
+    def format(self) -> str:
+        if not self.commands:
+            return "No commands sent"
+        late = self.lateness_us
+        p50, p95, p99 = np.percentile(late, (50, 95, 99))
+        return (f"{self.commands} commands in {self.duration:.2f} s\n"
+                f"Lateness [us]: mean {late.mean():.1f}, p50 {p50:.1f}, p95 {p95:.1f}, "
+                f"p99 {p99:.1f}, max {late.max():.1f}")
+
+
+class MotionPlayer:
+    """
+    Plays a recording through an ArduinoInterface.
+    """
+    def __init__(self, arduino, scheduler: Optional[HybridScheduler] = None):
+        """
+        Initialize the player.
+
+        Args:
+            arduino: Connected ArduinoInterface (real port or emulator)
+            scheduler: Deadline scheduler (defaults to HybridScheduler())
+        """
+        self.arduino = arduino
+        self.scheduler = scheduler or HybridScheduler()
+
+    def play(self, recording: Recording, speed: float = 1.0, loops: int = 1,
+             loop_gap: Optional[float] = None) -> PlaybackReport:
+        """
+        Send every target of a recording at its scheduled time.
+
+        Args:
+            recording: Recording to play
+            speed: Playback rate (2.0 = twice as fast)
+            loops: Number of repetitions (0 = until interrupted)
+            loop_gap: Seconds between the last target and the next loop's
+                first one (defaults to the median recorded interval)
+
+        Returns:
+            PlaybackReport
+        """
+        if not len(recording.times):
+            return PlaybackReport(0, 0.0, np.zeros(0))
+        if loop_gap is None:
+            intervals = np.diff(recording.times)
+            loop_gap = float(np.median(intervals)) if len(intervals) else 0.0
+        period = recording.duration + loop_gap
+        messages = [{finger: int(value) for finger, value in zip(FINGER_ORDER, row)}
+                    for row in recording.angles]
+
+        lateness = []
+        start = time.perf_counter()
+        loop = 0
+        try:
+            while not loops or loop < loops:
+                offset = loop * period
+                for scheduled, angles in zip(recording.times, messages):
+                    deadline = start + (offset + scheduled) / speed
+                    sent_at = self.scheduler.wait_until(deadline)
+                    self.arduino.send_move(angles)
+                    lateness.append(sent_at - deadline)
+                loop += 1
+        except KeyboardInterrupt:
+            print("\nPlayback interrupted.")
+        duration = time.perf_counter() - start
+        return PlaybackReport(len(lateness), duration, np.array(lateness) * 1e6)
+
+
+def _info(args):
+    recording = load_recording(args.file)
+    intervals = np.diff(recording.times) * 1000
+    print(f"{args.file}: {len(recording.times)} targets over {recording.duration:.2f} s")
+    if len(intervals):
+        print(f"Interval [ms]: median {np.median(intervals):.1f}, min {intervals.min():.1f}, "
+              f"max {intervals.max():.1f}")
+
+
+def _play(args):
+    from .arduino_comm import ArduinoInterface
+
+    recording = decimate(load_recording(args.file), args.min_interval, args.min_change)
+    print(f"Playing {len(recording.times)} targets ({recording.duration:.2f} s) at {args.speed:g}x, "
+          f"{'endless' if not args.loops else f'{args.loops} loop(s)'}")
+    arduino = ArduinoInterface(args.port, args.baudrate)
+    try:
+        report = MotionPlayer(arduino, HybridScheduler(args.spin_ms / 1000)).play(
+            recording, args.speed, args.loops)
+        print(report.format())
+    finally:
+        arduino.close()
+
+
+def _synth(args):
+    from hand_tracking.angle_calculator import AngleCalculator
+    from hand_tracking.synthetic_hands import ANGLE_NAMES, SyntheticHandGenerator, raw_angles
+    from config.settings import FINGER_ANGLE_RANGES
+
+    generator = SyntheticHandGenerator(seed=args.seed, fps=args.fps)
+    poses = generator.generate(int(args.seconds * args.fps), stream=True)
+    servo = AngleCalculator(FINGER_ANGLE_RANGES).map_to_servo_batch(raw_angles(poses.clean_points), ANGLE_NAMES)
+    order = [ANGLE_NAMES.index(finger) for finger in FINGER_ORDER]
+    times = np.arange(len(servo)) / args.fps
+    save_recording(args.file, Recording(times, servo[:, order].astype(np.uint8)))
+    print(f"Wrote {len(times)} targets ({args.seconds:g} s) to {args.file}")
+
+
+def main():
+    from config.settings import DEFAULT_BAUDRATE, DEFAULT_SERIAL_PORT
+
+    parser = argparse.ArgumentParser(description="Servo motion recordings")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    info = commands.add_parser('info', help='Describe a recording')
+    info.add_argument('file')
+    info.set_defaults(func=_info)
+
+    play = commands.add_parser('play', help='Play a recording on the board or the emulator')
+    play.add_argument('file')
+    play.add_argument('--port', default=DEFAULT_SERIAL_PORT, help="Serial port or 'emulator'")
+    play.add_argument('--baudrate', type=int, default=DEFAULT_BAUDRATE)
+    play.add_argument('--speed', type=float, default=1.0, help='Playback rate')
+    play.add_argument('--loops', type=int, default=1, help='Repetitions (0 = endless)')
+    play.add_argument('--min-interval', type=float, default=0.0, help='Keyframe decimation: minimum seconds apart')
+    play.add_argument('--min-change', type=int, default=0, help='Keyframe decimation: minimum degrees changed')
+    play.add_argument('--spin-ms', type=float, default=SPIN_THRESHOLD * 1000,
+                      help='Spin instead of sleeping for the last N ms before each command')
+    play.set_defaults(func=_play)
+
+    synth = commands.add_parser('synth', help='Write a recording of a synthetic hand')
+    synth.add_argument('file')
+    synth.add_argument('--seconds', type=float, default=10.0)
+    synth.add_argument('--fps', type=float, default=30.0)
+    synth.add_argument('--seed', type=int, default=0)
+    synth.set_defaults(func=_synth)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Serial command formats shared by the host and the Arduino sketch.
+"""
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# Order of the finger values in multi-finger commands
+FINGER_ORDER = ('thumb_mcp', 'thumb_ip', 'index', 'middle', 'ring', 'pinky')
+
+# PCA9685 channels driven by the sketch, in FINGER_ORDER
+SERVO_CHANNELS = (10, 11, 12, 13, 14, 15)
+
+# Single-word preset gestures implemented by the sketch
+PRESET_COMMANDS = ('open', 'close', 'thumbsup', 'point', 'pinch', 'wave')
+
+# A command may end in '#<seq>'; the sketch then replies 'ack:<seq>:<millis>'
+SEQUENCE_SEPARATOR = '#'
+ACK_PREFIX = 'ack:'
+
+# 'telemetry:<ms>' sets the board's status period (0 = off), 'status' asks for one frame
+TELEMETRY_COMMAND = 'telemetry:'
+TELEMETRY_PREFIX = 'tlm:'
+
+
+class Telemetry(NamedTuple):
+    """A status frame from the board."""
+    board_ms: int          # millis() when the frame was sent
+    sequence: int          # Last applied sequence number (-1 = none yet)
+    loop_us: int           # Longest loop iteration since the previous frame
+    free_ram: int          # Free RAM in bytes (-1 = unknown)
+    rx_pending: int        # Bytes waiting in the board's serial receive buffer
+    positions: Tuple[int, ...]  # Servo angles in FINGER_ORDER
+
+
+def format_move_fingers(angles: Dict[str, int]) -> str:
+    """
+    Build an absolute six-finger move command.
+
+    Args:
+        angles: Dictionary of finger angles
+
+    Returns:
+        Command line, e.g. 'movefingers:90:120:45:30:50:60\\n'
+    """
+    values = ':'.join(str(int(angles[finger])) for finger in FINGER_ORDER)
+    return f"movefingers:{values}\n"
+
+
+def format_trajectory(angles: Dict[str, int], duration_ms: int) -> str:
+    """
+    Build a timed trajectory segment command.
+
+    The board interpolates every finger from its current position to the
+    target over ``duration_ms`` milliseconds without blocking its loop.
+
+    Args:
+        angles: Dictionary of target finger angles
+        duration_ms: Segment duration in milliseconds
+
+    Returns:
+        Command line, e.g. 'traj:100:90:120:45:30:50:60\\n'
+    """
+    values = ':'.join(str(int(angles[finger])) for finger in FINGER_ORDER)
+    return f"traj:{int(duration_ms)}:{values}\n"
+
+
+def format_velocity_trajectory(angles: Dict[str, int], velocity: int) -> str:
+    """
+    Build a constant-velocity trajectory segment command.
+
+    Args:
+        angles: Dictionary of target finger angles
+        velocity: Servo speed in degrees per second
+
+    Returns:
+        Command line, e.g. 'trajv:200:90:120:45:30:50:60\\n'
+    """
+    values = ':'.join(str(int(angles[finger])) for finger in FINGER_ORDER)
+    return f"trajv:{int(velocity)}:{values}\n"
+
+
+def format_delta(angles: Dict[str, int]) -> str:
+    """
+    Build a sparse update for a subset of fingers.
+
+    Each changed finger is sent as its index in FINGER_ORDER followed by its
+    angle; fingers that are not listed keep their current position.
+
+    Args:
+        angles: Dictionary of changed finger angles
+
+    Returns:
+        Command line, e.g. 'delta:2:45:4:90\\n'
+    """
+    fields = []
+    for index, finger in enumerate(FINGER_ORDER):
+        if finger in angles:
+            fields.append(f"{index}:{int(angles[finger])}")
+    return f"delta:{':'.join(fields)}\n"
+
+
+def tag_sequence(command: str, seq: int) -> str:
+    """
+    Append a sequence number to a command so the board acknowledges it.
+
+    Args:
+        command: Newline-terminated command
+        seq: Sequence number
+
+    Returns:
+        Command line, e.g. 'movefingers:90:120:45:30:50:60#42\n'
+    """
+    return f"{command.rstrip()}{SEQUENCE_SEPARATOR}{int(seq)}\n"
+
+
+def parse_ack(line: str) -> Optional[Tuple[int, int]]:
+    """
+    Parse an acknowledgement line from the board.
+
+    The ack may follow other output on the same line: older sketches printed
+    moveServoSmooth()'s debug values without a newline, e.g.
+    '10001011000ack:5:1234'.
+
+    Args:
+        line: Line read from the serial port
+
+    Returns:
+        Tuple of (sequence number, board millis), or None if not an ack
+    """
+    start = line.find(ACK_PREFIX)
+    if start < 0:
+        return None
+    fields = line[start + len(ACK_PREFIX):].split(':')
+    try:
+        return int(fields[0]), int(fields[1]) if len(fields) > 1 else 0
+    except ValueError:
+        return None
+
+
+def format_telemetry_request(interval_ms: int) -> str:
+    """
+    Build the command that sets the board's telemetry period.
+
+    Args:
+        interval_ms: Milliseconds between status frames (0 = off)
+
+    Returns:
+        Command line, e.g. 'telemetry:100\n'
+    """
+    return f"{TELEMETRY_COMMAND}{int(interval_ms)}\n"
+
+
+def format_telemetry(board_ms: int, sequence: int, loop_us: int, free_ram: int, rx_pending: int,
+                     positions: List[int]) -> str:
+    """
+    Build a status frame as sent by the board.
+
+    Returns:
+        Line without the newline, e.g. 'tlm:52310:17:840:1203:0:90:120:45:30:50:60'
+    """
+    fields = [board_ms, sequence, loop_us, free_ram, rx_pending] + list(positions)
+    return TELEMETRY_PREFIX + ':'.join(str(int(value)) for value in fields)
+
+
+def parse_telemetry(line: str) -> Optional[Telemetry]:
+    """
+    Parse a status frame from the board.
+
+    Args:
+        line: Line read from the serial port
+
+    Returns:
+        Telemetry, or None if the line is not a complete status frame
+    """
+    if not line.startswith(TELEMETRY_PREFIX):
+        return None
+    try:
+        values = [int(field) for field in line[len(TELEMETRY_PREFIX):].split(':')]
+    except ValueError:
+        return None
+    if len(values) != 5 + len(FINGER_ORDER):
+        return None
+    return Telemetry(values[0], values[1], values[2], values[3], values[4], tuple(values[5:]))
@@ -0,0 +1,192 @@
+"""
+Host-side view of the board's state, built from telemetry frames and acks.
+
+With telemetry enabled the sketch sends a status frame every few
+milliseconds (see protocol.Telemetry). The frame carries:
+  * servo positions
+  * last applied sequence number
+  * longest loop iteration
+  * free RAM
+  * bytes waiting in its receive buffer
+Together with the sequence-number acks, BoardMonitor derives:
+
+  * queue depth:   commands written but not yet applied by the board
+  * apply latency: time from writing a command to its ack
+  * behind:        the board is not keeping up (deep queue, long or blocked
+                   loop, full receive buffer, or telemetry gone silent), so
+                   the host should hold back updates
+  * silence:       time since the last frame or ack; after a board reset
+                   neither comes back, and the host resyncs (see resync())
+"""
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Dict, Optional
+
+import numpy as np
+
+from .protocol import Telemetry
+
+DEFAULT_TELEMETRY_LIMITS = {
+    'max_queue_depth': 4,    # Commands in flight before the board counts as behind
+    'max_loop_ms': 50,       # Loop iteration that indicates a blocking move
+    'max_rx_pending': 32,    # Receive-buffer bytes (the AVR buffer holds 64)
+    'stale_intervals': 3,    # Missing frames before telemetry counts as silent
+}
+
+# Sent-command timestamps kept for matching acks
+MAX_TRACKED_COMMANDS = 1024
+# Recent apply latencies used for the statistics
+LATENCY_WINDOW = 256
+
+
+class BoardMonitor:
+    """
+    Thread-safe telemetry and ack bookkeeping for one board.
+    """
+    def __init__(self, interval_ms: int, limits: Optional[Dict] = None):
+        """
+        Initialize the monitor.
+
+        Args:
+            interval_ms: Telemetry period requested from the board
+            limits: Overrides for DEFAULT_TELEMETRY_LIMITS
+        """
+        self.interval_ms = interval_ms
+        self.limits = dict(DEFAULT_TELEMETRY_LIMITS, **(limits or {}))
+        self.latest = None           # Most recent Telemetry
+        self.latest_time = None      # time.monotonic() it arrived
+        self.applied_sequence = -1
+        self.frames = 0
+        self.max_queue_depth = 0
+        self.max_loop_us = 0
+        self.min_free_ram = None
+        self.last_heard = time.monotonic()  # Last telemetry frame or ack (or resync)
+        self.resyncs = 0
+        self._sent = OrderedDict()   # seq -> time.monotonic() of the write
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+    def note_sent(self, seq: int, timestamp: Optional[float] = None):
+        """
+        Record that a sequence-numbered command was written.
+        """
+        with self._lock:
+            self._sent[seq] = time.monotonic() if timestamp is None else timestamp
+            while len(self._sent) > MAX_TRACKED_COMMANDS:
+                self._sent.popitem(last=False)
+
+    def note_ack(self, seq: int, timestamp: Optional[float] = None):
+        """
+        Record the board's ack of a command.
+        """
+        now = time.monotonic() if timestamp is None else timestamp
+        with self._lock:
+            sent = self._sent.pop(seq, None)
+            if sent is not None:
+                self._latencies.append((now - sent) * 1000)
+            self.applied_sequence = max(self.applied_sequence, seq)
+            self.last_heard = now
+
+    def update(self, telemetry: Telemetry, timestamp: Optional[float] = None):
+        """
+        Store a telemetry frame.
+        """
+        with self._lock:
+            # Time first: is_behind() reads latest_time once latest is set
+            self.latest_time = time.monotonic() if timestamp is None else timestamp
+            self.latest = telemetry
+            self.last_heard = self.latest_time
+            self.frames += 1
+            self.applied_sequence = max(self.applied_sequence, telemetry.sequence)
+            self.max_loop_us = max(self.max_loop_us, telemetry.loop_us)
+            if telemetry.free_ram >= 0:
+                self.min_free_ram = (telemetry.free_ram if self.min_free_ram is None
+                                     else min(self.min_free_ram, telemetry.free_ram))
+
+    def queue_depth(self, last_sequence: Optional[int]) -> int:
+        """
+        Args:
+            last_sequence: Sequence number of the last command written
+
+        Returns:
+            Commands written but not yet applied
+        """
+        if last_sequence is None:
+            return 0
+        depth = max(0, last_sequence - self.applied_sequence)
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+        return depth
+
+    def apply_latency_ms(self, percentile: float = 50) -> Optional[float]:
+        """
+        Returns:
+            Percentile of recent write-to-ack latencies, or None before the first ack
+        """
+        with self._lock:
+            if not self._latencies:
+                return None
+            return float(np.percentile(self._latencies, percentile))
+
+    def is_behind(self, last_sequence: Optional[int], now: Optional[float] = None) -> bool:
+        """
+        Decide whether the board is falling behind.
+
+        Args:
+            last_sequence: Sequence number of the last command written
+            now: time.monotonic() (defaults to now)
+
+        Returns:
+            True if the host should hold back updates
+        """
+        limits = self.limits
+        if self.queue_depth(last_sequence) > limits['max_queue_depth']:
+            return True
+        latest = self.latest
+        if latest is None:
+            return False
+        now = time.monotonic() if now is None else now
+        if (now - self.latest_time) * 1000 > self.interval_ms * limits['stale_intervals']:
+            # No frames: the loop is stuck in a blocking move
+            return True
+        return latest.loop_us > limits['max_loop_ms'] * 1000 or latest.rx_pending > limits['max_rx_pending']
+
+    def silence_s(self, now: Optional[float] = None) -> float:
+        """
+        Returns:
+            Seconds since the board last sent a telemetry frame or an ack
+        """
+        now = time.monotonic() if now is None else now
+        return now - self.last_heard
+
+    def resync(self, last_sequence: Optional[int], now: Optional[float] = None):
+        """
+        Forget the board's state after it went silent (e.g. a reset or
+        brown-out): the acks of commands in flight will never come, and the
+        last telemetry frame describes a board that no longer exists.
+
+        Args:
+            last_sequence: Sequence number of the last command written,
+                taken as applied
+            now: time.monotonic() (defaults to now)
+        """
+        with self._lock:
+            if last_sequence is not None:
+                self.applied_sequence = max(self.applied_sequence, last_sequence)
+            self._sent.clear()
+            self.latest = None
+            self.latest_time = None
+            self.last_heard = time.monotonic() if now is None else now
+            self.resyncs += 1
+
+    def summary(self) -> str:
+        """
+        Returns:
+            One-line summary for the end of a run
+        """
+        p50, p95 = self.apply_latency_ms(50), self.apply_latency_ms(95)
+        latency = f"{p50:.1f}/{p95:.1f} ms" if p50 is not None else "n/a"
+        free_ram = f"{self.min_free_ram} B" if self.min_free_ram is not None else "n/a"
+        return (f"Board telemetry: {self.frames} frames, apply latency p50/p95 {latency}, "
+                f"max queue depth {self.max_queue_depth}, max loop {self.max_loop_us / 1000:.1f} ms, "
+                f"min free RAM {free_ram}, {self.resyncs} resyncs")
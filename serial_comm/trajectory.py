@@ -0,0 +1,138 @@
+"""
+Reference implementation of the sketch's trajectory interpolator.
+
+Mirrors ``startSegment``/``updateTrajectories`` in hand_mimic_controller.ino,
+including its integer arithmetic, so host-side behaviour can be checked
+without hardware.
+"""
+from typing import Dict, Iterable, List
+
+from .protocol import SERVO_CHANNELS
+
+
+def _clamp_angle(angle: int) -> int:
+    return max(0, min(int(angle), 180))
+
+
+def _interpolate(start: int, target: int, elapsed: int, duration: int) -> int:
+    """Linear interpolation with C-style truncation towards zero."""
+    delta = target - start
+    step = abs(delta) * elapsed // duration
+    return start + (step if delta >= 0 else -step)
+
+
+class TrajectoryInterpolator:
+    """
+    Non-blocking per-servo linear interpolator driven by a millisecond clock.
+    """
+    def __init__(self, channels: Iterable[int] = SERVO_CHANNELS):
+        """
+        Initialize the interpolator.
+
+        Args:
+            channels: Servo channel numbers to track
+        """
+        self.channels = tuple(channels)
+        self.positions = {ch: 0 for ch in self.channels}
+        self._start = dict(self.positions)
+        self._target = dict(self.positions)
+        self._start_time = {ch: 0 for ch in self.channels}
+        self._duration = {ch: 0 for ch in self.channels}
+        self._active = {ch: False for ch in self.channels}
+
+    def start_segment(self, channel: int, target: int, duration_ms: int, now_ms: int):
+        """
+        Start moving one servo towards a target over a fixed duration.
+
+        Args:
+            channel: Servo channel
+            target: Target angle (clamped to 0-180)
+            duration_ms: Segment duration in milliseconds
+            now_ms: Current clock value in milliseconds
+        """
+        if channel not in self._active:
+            return
+        self._start[channel] = self.positions[channel]
+        self._target[channel] = _clamp_angle(target)
+        self._start_time[channel] = int(now_ms)
+        self._duration[channel] = max(0, int(duration_ms))
+        self._active[channel] = True
+
+    def start_velocity_segment(self, channel: int, target: int, velocity: int, now_ms: int):
+        """
+        Start moving one servo towards a target at a constant speed.
+
+        Args:
+            channel: Servo channel
+            target: Target angle (clamped to 0-180)
+            velocity: Speed in degrees per second (<= 0 jumps immediately)
+            now_ms: Current clock value in milliseconds
+        """
+        if channel not in self._active:
+            return
+        target = _clamp_angle(target)
+        duration = 0
+        if velocity > 0:
+            duration = abs(target - self.positions[channel]) * 1000 // int(velocity)
+        self.start_segment(channel, target, duration, now_ms)
+
+    def cancel(self):
+        """
+        Stop all active segments at their current positions.
+        """
+        for channel in self.channels:
+            self._active[channel] = False
+
+    def set_position(self, channel: int, angle: int):
+        """
+        Record a position written outside the interpolator.
+
+        Args:
+            channel: Servo channel
+            angle: Angle the servo was moved to
+        """
+        if channel in self.positions:
+            self.positions[channel] = _clamp_angle(angle)
+
+    def is_active(self) -> bool:
+        """
+        Returns:
+            True if any servo is still moving along a segment
+        """
+        return any(self._active.values())
+
+    def update(self, now_ms: int) -> Dict[int, int]:
+        """
+        Advance all active segments to the given time.
+
+        Args:
+            now_ms: Current clock value in milliseconds
+
+        Returns:
+            Dictionary of servo positions by channel
+        """
+        for channel in self.channels:
+            if not self._active[channel]:
+                continue
+            elapsed = int(now_ms) - self._start_time[channel]
+            if elapsed >= self._duration[channel]:
+                self.positions[channel] = self._target[channel]
+                self._active[channel] = False
+            else:
+                self.positions[channel] = _interpolate(
+                    self._start[channel], self._target[channel],
+                    max(0, elapsed), self._duration[channel]
+                )
+        return dict(self.positions)
+
+    def sample(self, times_ms: Iterable[int]) -> List[Dict[int, int]]:
+        """
+        Advance through a sequence of clock values and record the positions.
+
+        Args:
+            times_ms: Increasing clock values in milliseconds
+
+        Returns:
+            List of position dictionaries, one per time
+        """
+        return [self.update(t) for t in times_ms]
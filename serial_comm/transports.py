@@ -0,0 +1,356 @@
+"""
+Actuator backends other than the serial port.
+
+ArduinoInterface talks to its board through a ``serial.Serial``-like object
+(``write``, ``readline``, ``in_waiting``, ``close``). The classes here provide
+that interface for other sinks. All of them reuse ArduinoInterface's logic:
+  * update suppression
+  * trajectory and delta modes
+  * flow-control coalescing
+  * recording
+They are selected by the port name:
+
+    emulator[:<ms>]        ArduinoEmulator (optionally busy <ms> per command)
+    null                   Discards commands (benchmarks, CI)
+    file:<path>            Timestamped binary log of the command stream
+    udp:<host>:<port>      One datagram per command (remote robot or simulator)
+    tcp:<host>:<port>      Newline-delimited commands over a TCP connection
+
+The null and file sinks acknowledge sequence-numbered commands at once, like
+an infinitely fast board. They set ``immediate_acks``, so ArduinoInterface
+reads the ack right after the write and flow control never waits on them. Network sinks
+pass through whatever acks the remote end sends. A TCP sink whose peer goes
+away drops commands and reconnects, instead of failing the tracking loop.
+"""
+import select
+import socket
+from abc import ABC, abstractmethod
+import struct
+import threading
+import time
+from typing import List, Tuple
+
+from .protocol import ACK_PREFIX, SEQUENCE_SEPARATOR
+
+NULL_PORT = 'null'
+FILE_PREFIX = 'file:'
+UDP_PREFIX = 'udp:'
+TCP_PREFIX = 'tcp:'
+
+COMMAND_LOG_MAGIC = b'HMC1'
+COMMAND_LOG_HEADER = 8                 # Magic, then four reserved bytes
+COMMAND_RECORD = struct.Struct('<IH')  # Microseconds since the previous command, length
+
+# Largest command accepted from a network peer before the line is dropped
+MAX_LINE = 4096
+
+# Seconds between TCP reconnection attempts
+RECONNECT_INTERVAL = 1.0
+
+
+class NullTransport:
+    """
+    Sink that discards every command and acknowledges tagged ones.
+    """
+    # The ack of a command is readable as soon as write() returns
+    immediate_acks = True
+
+    def __init__(self):
+        self.is_open = True
+        self.bytes_received = 0
+        self.commands = 0
+        self._epoch = time.monotonic()
+        self._tx_lines = []
+        self._rx_buffer = b""
+
+    def write(self, data: bytes) -> int:
+        self.bytes_received += len(data)
+        self._rx_buffer += data
+        while b"\n" in self._rx_buffer:
+            line, self._rx_buffer = self._rx_buffer.split(b"\n", 1)
+            self._handle_command(line.decode('utf-8', errors='replace').strip())
+        return len(data)
+
+    @property
+    def in_waiting(self) -> int:
+        return sum(len(line) for line in self._tx_lines)
+
+    def readline(self) -> bytes:
+        return self._tx_lines.pop(0) if self._tx_lines else b""
+
+    def close(self):
+        self.is_open = False
+
+    def _handle_command(self, command: str):
+        self.commands += 1
+        _, separator, seq = command.partition(SEQUENCE_SEPARATOR)
+        if separator:
+            millis = int((time.monotonic() - self._epoch) * 1000)
+            self._tx_lines.append(f"{ACK_PREFIX}{seq.strip()}:{millis}\r\n".encode())
+
+
+class CommandLogTransport(NullTransport):
+    """
+    Sink that writes every command, with its send time, to a binary log.
+
+    The file has an 8-byte header. Each command follows as a 6-byte record
+    (uint32 microseconds since the previous command, uint16 length) and
+    then its bytes, without the newline. load_command_log() reads it back.
+    """
+    def __init__(self, path: str):
+        """
+        Create (or overwrite) a command log.
+
+        Args:
+            path: Output file
+        """
+        super().__init__()
+        self.path = path
+        self._file = open(path, 'wb')
+        self._file.write(COMMAND_LOG_MAGIC + bytes(COMMAND_LOG_HEADER - len(COMMAND_LOG_MAGIC)))
+        self._last_time = None
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+        super().close()
+
+    def _handle_command(self, command: str):
+        now = time.monotonic()
+        dt_us = 0 if self._last_time is None else int(round((now - self._last_time) * 1e6))
+        self._last_time = now
+        data = command.encode()[:0xFFFF]
+        self._file.write(COMMAND_RECORD.pack(min(dt_us, 0xFFFFFFFF), len(data)) + data)
+        super()._handle_command(command)
+
+
+def load_command_log(path: str) -> List[Tuple[float, str]]:
+    """
+    Read a command log.
+
+    Args:
+        path: File written by CommandLogTransport
+
+    Returns:
+        (seconds from the first command, command) tuples
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data[:len(COMMAND_LOG_MAGIC)] != COMMAND_LOG_MAGIC:
+        raise ValueError(f"{path} is not a command log")
+    commands = []
+    elapsed_us = 0
+    offset = COMMAND_LOG_HEADER
+    while offset + COMMAND_RECORD.size <= len(data):
+        dt_us, length = COMMAND_RECORD.unpack_from(data, offset)
+        offset += COMMAND_RECORD.size
+        if offset + length > len(data):
+            break  # Truncated last record
+        elapsed_us += dt_us
+        commands.append((elapsed_us / 1e6, data[offset:offset + length].decode('utf-8', errors='replace')))
+        offset += length
+    return commands
+
+
+class SocketTransport(ABC):
+    """
+    Base for network sinks: buffers whatever the peer sends back into lines.
+
+    Subclasses implement write() and _receive(), which moves everything the
+    peer has sent so far into ``_rx_buffer`` without blocking.
+    """
+    def __init__(self, sock: socket.socket):
+        sock.setblocking(False)
+        self.sock = sock
+        self.is_open = True
+        self.bytes_received = 0  # Bytes written by the host, as on the other sinks
+        self.send_errors = 0
+        self._rx_buffer = b""
+
+    @property
+    def in_waiting(self) -> int:
+        self._receive()
+        return len(self._rx_buffer)
+
+    def readline(self) -> bytes:
+        self._receive()
+        if b"\n" not in self._rx_buffer:
+            if len(self._rx_buffer) > MAX_LINE:
+                self._rx_buffer = b""
+            return b""
+        line, self._rx_buffer = self._rx_buffer.split(b"\n", 1)
+        return line + b"\n"
+
+    def close(self):
+        if self.is_open:
+            if self.sock is not None:
+                self.sock.close()
+            self.is_open = False
+
+    @abstractmethod
+    def write(self, data: bytes) -> int:
+        """Send commands to the peer; returns the number of bytes accepted."""
+
+    @abstractmethod
+    def _receive(self):
+        """Append whatever the peer has sent to ``_rx_buffer``, without blocking."""
+
+
+class UdpTransport(SocketTransport):
+    """
+    Sends each command as one datagram.
+
+    Datagrams may be lost, which suits a stream of absolute targets where
+    the next one supersedes a missing one.
+    """
+    def __init__(self, host: str, port: int):
+        """
+        Args:
+            host: Receiver address
+            port: Receiver UDP port
+        """
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.connect((host, port))
+        super().__init__(sock)
+
+    def write(self, data: bytes) -> int:
+        self.bytes_received += len(data)
+        for line in data.splitlines(keepends=True):
+            try:
+                self.sock.send(line)
+            except OSError:
+                # Nobody listening yet (ICMP port unreachable) or buffer full
+                self.send_errors += 1
+        return len(data)
+
+    def _receive(self):
+        while True:
+            try:
+                self._rx_buffer += self.sock.recv(65536)
+            except (BlockingIOError, ConnectionRefusedError):
+                return
+
+
+class TcpTransport(SocketTransport):
+    """
+    Sends newline-delimited commands over a TCP connection.
+
+    If the peer closes the connection or a send fails, the transport
+    disconnects and counts the failure in ``send_errors``. Later writes are
+    dropped, also counted, until a reconnection attempt (at most one per
+    RECONNECT_INTERVAL) succeeds.
+    """
+    def __init__(self, host: str, port: int, timeout: float = 1.0):
+        """
+        Args:
+            host: Server address
+            port: Server TCP port
+            timeout: Connection timeout in seconds
+
+        Raises:
+            OSError: If the first connection fails
+        """
+        self.address = (host, port)
+        self.timeout = timeout
+        self.disconnects = 0
+        self._next_attempt = 0.0
+        self._lock = threading.Lock()  # The reader thread may disconnect while the host writes
+        super().__init__(self._open_socket())
+
+    def write(self, data: bytes) -> int:
+        self.bytes_received += len(data)
+        sock = self.sock or self._reconnect()
+        if sock is None:
+            self.send_errors += 1
+            return len(data)
+        # The socket stays non-blocking because a reader thread may be receiving
+        view = memoryview(data)
+        try:
+            while view:
+                try:
+                    view = view[sock.send(view):]
+                except BlockingIOError:
+                    select.select([], [sock], [], 0.1)
+        except OSError as e:
+            self.send_errors += 1
+            self._disconnect(sock, e)
+        return len(data)
+
+    def _receive(self):
+        sock = self.sock
+        if sock is None:
+            return
+        while True:
+            try:
+                chunk = sock.recv(65536)
+            except BlockingIOError:
+                return
+            except OSError as e:
+                self._disconnect(sock, e)
+                return
+            if not chunk:
+                self._disconnect(sock, "closed by peer")
+                return
+            self._rx_buffer += chunk
+
+    def _open_socket(self) -> socket.socket:
+        sock = socket.create_connection(self.address, timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setblocking(False)
+        return sock
+
+    def _disconnect(self, sock: socket.socket, reason):
+        with self._lock:
+            if self.sock is not sock:
+                return  # Already handled by the other thread
+            sock.close()
+            self.sock = None
+            self._rx_buffer = b""
+            self.disconnects += 1
+            self._next_attempt = time.monotonic() + RECONNECT_INTERVAL
+        print(f"TCP connection to {self.address[0]}:{self.address[1]} lost ({reason}); reconnecting")
+
+    def _reconnect(self):
+        with self._lock:
+            if self.sock is not None or not self.is_open:
+                return self.sock
+            now = time.monotonic()
+            if now < self._next_attempt:
+                return None
+            self._next_attempt = now + RECONNECT_INTERVAL
+            try:
+                self.sock = self._open_socket()
+            except OSError:
+                return None
+        print(f"Reconnected to {self.address[0]}:{self.address[1]}")
+        return self.sock
+
+
+def _host_port(address: str) -> Tuple[str, int]:
+    host, _, port = address.rpartition(':')
+    return host or 'localhost', int(port)
+
+
+def open_transport(port: str, timeout: float = 1.0):
+    """
+    Create the backend selected by a port name.
+
+    Args:
+        port: Port name (see the module docstring)
+        timeout: Connection timeout for TCP
+
+    Returns:
+        Serial-like transport, or None if ``port`` names a real serial port
+    """
+    if port == 'emulator' or port.startswith('emulator:'):
+        from .emulator import ArduinoEmulator
+        return ArduinoEmulator(command_ms=float(port.partition(':')[2] or 0))
+    if port == NULL_PORT:
+        return NullTransport()
+    if port.startswith(FILE_PREFIX):
+        return CommandLogTransport(port[len(FILE_PREFIX):])
+    if port.startswith(UDP_PREFIX):
+        return UdpTransport(*_host_port(port[len(UDP_PREFIX):]))
+    if port.startswith(TCP_PREFIX):
+        return TcpTransport(*_host_port(port[len(TCP_PREFIX):]), timeout=timeout)
+    return None
@@ -9,8 +9,10 @@ import serial
 import time
 import argparse
 
+from capture.frame_source import open_frame_source
+
 class SimpleHandMimicSystem:
-    def __init__(self, port='/dev/ttyUSB0', baudrate=115200):
+    def __init__(self, port='/dev/ttyUSB0', baudrate=115200, source=0):
         # MediaPipe el tespit modülünü başlat
         print("MediaPipe Hands başlatılıyor...")
         self.mp_hands = mp.solutions.hands
@@ -23,6 +25,9 @@ class SimpleHandMimicSystem:
         self.mp_drawing = mp.solutions.drawing_utils
         self.mp_drawing_styles = mp.solutions.drawing_styles
         
+        # Görüntü kaynağı (kamera, video, klasör veya sentetik)
+        self.source = source
+        
         # Arduino bağlantısı
         self.ser = None
         try:
@@ -146,7 +151,8 @@ class SimpleHandMimicSystem:
         
         # Kamerayı başlat
         print("Kamera açılıyor...")
-        cap = cv2.VideoCapture(0)
+        # Sürücü tamponu 1 kare; arka plan iş parçacığı her zaman en yeni kareyi verir
+        cap = open_frame_source(self.source)
         if not cap.isOpened():
             print("Kamera açılamadı!")
             return
@@ -253,10 +259,12 @@ def main():
     parser = argparse.ArgumentParser(description="Basit El Takip Sistemi")
     parser.add_argument('--port', type=str, default='/dev/ttyUSB0', help='Arduino seri port adresi')
     parser.add_argument('--baudrate', type=int, default=115200, help='Seri port baudrate (bit/s)')
+    parser.add_argument('--source', type=str, default='0',
+                        help="Kamera indeksi, video dosyası, görüntü klasörü veya 'synthetic'")
     args = parser.parse_args()
     
     # Basit sistem nesnesi oluştur
-    system = SimpleHandMimicSystem(port=args.port, baudrate=args.baudrate)
+    system = SimpleHandMimicSystem(port=args.port, baudrate=args.baudrate, source=args.source)
     
     try:
         # Sistemi çalıştır
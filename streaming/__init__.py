@@ -0,0 +1,12 @@
+# streaming/__init__.py
+from utils.lazy_import import lazy_exports
+
+__all__ = ['StreamPublisher', 'StreamSubscriber', 'FrameDecoder', 'LandmarkReceiver', 'LandmarkSender']
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'StreamPublisher': '.publisher',
+    'StreamSubscriber': '.subscriber',
+    'FrameDecoder': '.framing',
+    'LandmarkReceiver': '.landmark_ingest',
+    'LandmarkSender': '.detector_node',
+})
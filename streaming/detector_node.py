@@ -0,0 +1,219 @@
+"""
+Detector node: captures frames, runs hand detection and streams landmarks.
+
+Runs on the machine next to the camera that can afford MediaPipe. It sends
+one landmark record per frame (see framing.py) to a robot host running
+``main.py --landmarks ADDRESS``. Each record carries:
+  * a sequence number
+  * the capture time, as wall-clock time
+  * the hands found, possibly none
+  * the send time, so the host can tell network latency from the time
+    spent capturing and detecting on the node
+UDP suits a stream where the next frame supersedes a lost one. TCP
+reconnects whenever the host restarts.
+
+``--synthetic`` replaces the camera and MediaPipe with SyntheticHandGenerator,
+so the link can be tested over localhost without either. ``--loss`` and
+``--reorder`` impair the sent stream to exercise the receiver's drop and
+reorder handling.
+
+Usage:
+    python -m streaming.detector_node --send udp:192.168.1.20:9000 --source 0
+    python -m streaming.detector_node --send udp:127.0.0.1:9000 --synthetic --loss 0.05 --reorder 0.05
+    python main.py --detector-node udp:192.168.1.20:9000
+"""
+import argparse
+import socket
+import time
+from typing import Optional
+
+import numpy as np
+
+from .framing import encode_landmarks, hands_from_results, parse_address
+
+# Seconds between TCP reconnection attempts
+RECONNECT_INTERVAL = 1.0
+
+
+class LandmarkSender:
+    """
+    Sends encoded records over UDP, or TCP with automatic reconnection.
+    """
+    def __init__(self, address: str):
+        """
+        Args:
+            address: 'udp:HOST:PORT' or 'tcp:HOST:PORT' of the robot host
+        """
+        self.scheme, self.target = parse_address(address)
+        if self.scheme not in ('udp', 'tcp'):
+            raise ValueError(f"Detector node needs a udp: or tcp: address, got {address}")
+        self.sent = 0
+        self.bytes_sent = 0
+        self.failed = 0
+        self._sock = None
+        self._next_attempt = 0.0
+        if self.scheme == 'udp':
+            self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def send(self, data: bytes) -> bool:
+        """
+        Send one record; records are dropped while the host is unreachable.
+
+        Returns:
+            True if the record was sent
+        """
+        try:
+            if self.scheme == 'udp':
+                self._sock.sendto(data, self.target)
+            else:
+                if self._sock is None and not self._connect():
+                    self.failed += 1
+                    return False
+                self._sock.sendall(data)
+        except OSError:
+            self.failed += 1
+            if self.scheme == 'tcp':
+                self._sock.close()
+                self._sock = None
+            return False
+        self.sent += 1
+        self.bytes_sent += len(data)
+        return True
+
+    def _connect(self) -> bool:
+        now = time.monotonic()
+        if now < self._next_attempt:
+            return False
+        self._next_attempt = now + RECONNECT_INTERVAL
+        try:
+            self._sock = socket.create_connection(self.target, timeout=RECONNECT_INTERVAL)
+        except OSError:
+            return False
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        print(f"Connected to {self.target[0]}:{self.target[1]}")
+        return True
+
+    def close(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+
+def _send_frame(sender: LandmarkSender, frame) -> bool:
+    """Encode a (seq, capture time, hands) frame, stamped with the send time, and send it."""
+    seq, capture_time, hands = frame
+    return sender.send(encode_landmarks(seq, capture_time, hands, time.time()))
+
+
+def _synthetic_frames(fps: float, seed: int):
+    """Endless (results, capture time) stream from SyntheticHandGenerator, paced at ``fps``."""
+    from hand_tracking.synthetic_hands import SyntheticHandGenerator, to_results
+
+    generator = SyntheticHandGenerator(seed=seed, noise=0.002, dropout=0.02, fps=fps)
+    start = time.monotonic()
+    index = 0
+    while True:
+        for result in to_results(generator.generate(int(fps * 10), stream=True)):
+            delay = start + index / fps - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            index += 1
+            yield result, time.time()
+
+
+def _camera_frames(source, flow_tracking: bool):
+    """(results, capture time) stream from a frame source and MediaPipe."""
+    from capture.frame_source import open_frame_source
+    from config.settings import CAMERA_CONFIG, FLOW_TRACKING_CONFIG, MEDIAPIPE_CONFIG
+    from hand_tracking import HandDetector
+
+    detector = HandDetector(MEDIAPIPE_CONFIG)
+    tracker = detector
+    if flow_tracking:
+        from hand_tracking import HybridHandTracker
+        tracker = HybridHandTracker(detector, FLOW_TRACKING_CONFIG)
+    cap = open_frame_source(source, **CAMERA_CONFIG)
+    if not cap.isOpened():
+        print("Could not open camera!")
+        return
+    try:
+        for frame in cap:
+            # Wall-clock capture time, for latency measurement on the host
+            yield tracker.detect_hands(frame.image), time.time() - (time.monotonic() - frame.timestamp)
+    finally:
+        cap.release()
+        detector.close()
+
+
+def run_detector_node(address: str, source=0, flow_tracking: bool = False, synthetic: bool = False,
+                      fps: float = 30.0, seed: int = 0, loss: float = 0.0, reorder: float = 0.0,
+                      frames: int = 0):
+    """
+    Stream landmark records until interrupted.
+
+    Args:
+        address: Robot host address ('udp:HOST:PORT' or 'tcp:HOST:PORT')
+        source: Frame source (camera index, video file, ...)
+        flow_tracking: Track with optical flow between MediaPipe inferences
+        synthetic: Send synthetic hands instead of camera detections
+        fps: Frame rate of the synthetic stream
+        seed: Random seed of the synthetic stream and the impairments
+        loss: Probability of dropping a record (testing)
+        reorder: Probability of delaying a record behind the next one (testing)
+        frames: Stop after this many frames (0 = endless)
+    """
+    sender = LandmarkSender(address)
+    stream = _synthetic_frames(fps, seed) if synthetic else _camera_frames(source, flow_tracking)
+    rng = np.random.default_rng(seed)
+    held: Optional[tuple] = None
+    dropped = 0
+    seq = 0
+    start = time.monotonic()
+    report_time = start
+    print(f"Streaming landmarks to {address}")
+    try:
+        for results, capture_time in stream:
+            frame = (seq, capture_time, hands_from_results(results))
+            seq += 1
+            if loss and rng.random() < loss:
+                dropped += 1
+            elif reorder and held is None and rng.random() < reorder:
+                held = frame  # Sent after the next frame
+            else:
+                _send_frame(sender, frame)
+                if held is not None:
+                    _send_frame(sender, held)
+                    held = None
+            now = time.monotonic()
+            if now - report_time >= 5.0:
+                print(f"{seq} frames, {seq / (now - start):.1f} fps, {sender.bytes_sent / (now - start):.0f} B/s")
+                report_time = now
+            if frames and seq >= frames:
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sender.close()
+    print(f"Detector node: {seq} frames, {sender.sent} records sent ({sender.bytes_sent} bytes), "
+          f"{sender.failed} failed, {dropped} dropped on purpose")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream hand landmarks to a robot host")
+    parser.add_argument('--send', required=True, metavar='ADDRESS', help='udp:HOST:PORT or tcp:HOST:PORT')
+    parser.add_argument('--source', type=str, default='0', help='Camera index, video file or image directory')
+    parser.add_argument('--flow-tracking', action='store_true',
+                        help='Run MediaPipe every few frames and track with optical flow in between')
+    parser.add_argument('--synthetic', action='store_true', help='Send synthetic hands (no camera or MediaPipe)')
+    parser.add_argument('--fps', type=float, default=30.0, help='Synthetic frame rate')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--frames', type=int, default=0, help='Stop after N frames (0 = endless)')
+    parser.add_argument('--loss', type=float, default=0.0, help='Drop this fraction of records (testing)')
+    parser.add_argument('--reorder', type=float, default=0.0, help='Swap this fraction of records (testing)')
+    args = parser.parse_args()
+    run_detector_node(args.send, args.source, args.flow_tracking, args.synthetic, args.fps,
+                      args.seed, args.loss, args.reorder, args.frames)
+
+
+if __name__ == "__main__":
+    main()
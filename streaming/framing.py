@@ -0,0 +1,253 @@
+"""
+Binary framing for streamed angle and landmark records.
+
+Every record is an 18-byte little-endian header followed by its payload:
+
+    magic 'HM' | version u8 | kind u8 | seq u32 | timestamp f64 | length u16
+
+``seq`` numbers the source frame (the angle and landmark records of one
+frame share it). ``timestamp`` is the capture time in seconds since the
+epoch (time.time()), so latency can be measured across hosts with
+synchronized clocks. Payloads:
+
+    KIND_ANGLES     six uint8 servo angles in FINGER_ORDER
+    KIND_LANDMARKS  uint8 hand count, then per hand:
+                    handedness u8 (0 right, 1 left, 255 unknown) | score f32 |
+                    21 x 3 float32 normalized landmarks
+                    then optionally a f64 send time (time.time() when a
+                    detector node sent the record; see decode_sent_time)
+
+The same records travel over stream sockets (FrameDecoder reassembles them)
+and as single UDP datagrams (decode_frame).
+"""
+import socket
+import struct
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from hand_tracking.landmarks import (NUM_LANDMARKS, Category, DetectionResult, Handedness, HandLandmarks,
+                                     array_to_landmarks, landmarks_to_array)
+from serial_comm.protocol import FINGER_ORDER
+
+MAGIC = b'HM'
+VERSION = 1
+HEADER = struct.Struct('<2sBBIdH')
+
+KIND_ANGLES = 1
+KIND_LANDMARKS = 2
+
+HANDEDNESS_LABELS = ('Right', 'Left')
+UNKNOWN_HANDEDNESS = 255
+HAND_HEADER = struct.Struct('<Bf')
+HAND_SIZE = HAND_HEADER.size + NUM_LANDMARKS * 3 * 4
+SENT_TIME = struct.Struct('<d')
+
+TCP_PREFIX = 'tcp:'
+UDP_PREFIX = 'udp:'
+UNIX_PREFIX = 'unix:'
+
+
+class Frame(NamedTuple):
+    """A decoded record header and its raw payload."""
+    kind: int
+    seq: int
+    timestamp: float
+    payload: bytes
+
+
+class Hand(NamedTuple):
+    """One hand of a landmark record."""
+    points: np.ndarray  # (21, 3) float32 normalized landmarks
+    handedness: Optional[str] = None
+    score: float = 1.0
+
+
+def encode_frame(kind: int, seq: int, timestamp: float, payload: bytes) -> bytes:
+    """
+    Returns:
+        Header and payload of one record
+    """
+    return HEADER.pack(MAGIC, VERSION, kind, seq & 0xFFFFFFFF, timestamp, len(payload)) + payload
+
+
+def encode_angles(seq: int, timestamp: float, angles: Dict[str, int]) -> bytes:
+    """
+    Args:
+        seq: Source frame number
+        timestamp: Capture time (time.time())
+        angles: Servo angles by finger
+
+    Returns:
+        Encoded angle record
+    """
+    payload = bytes(min(max(int(angles[finger]), 0), 180) for finger in FINGER_ORDER)
+    return encode_frame(KIND_ANGLES, seq, timestamp, payload)
+
+
+def encode_landmarks(seq: int, timestamp: float, hands: List[Hand], sent_time: Optional[float] = None) -> bytes:
+    """
+    Args:
+        seq: Source frame number
+        timestamp: Capture time (time.time())
+        hands: Detected hands (an empty list reports that no hand is present)
+        sent_time: Time the record is sent (time.time()), appended so the
+            receiver can tell network latency from time spent on the sender
+
+    Returns:
+        Encoded landmark record
+    """
+    parts = [bytes([len(hands)])]
+    for hand in hands:
+        code = (HANDEDNESS_LABELS.index(hand.handedness) if hand.handedness in HANDEDNESS_LABELS
+                else UNKNOWN_HANDEDNESS)
+        parts.append(HAND_HEADER.pack(code, hand.score))
+        parts.append(np.ascontiguousarray(hand.points, dtype='<f4').reshape(NUM_LANDMARKS, 3).tobytes())
+    if sent_time is not None:
+        parts.append(SENT_TIME.pack(sent_time))
+    return encode_frame(KIND_LANDMARKS, seq, timestamp, b''.join(parts))
+
+
+def decode_angles(payload: bytes) -> Dict[str, int]:
+    """
+    Returns:
+        Servo angles by finger
+    """
+    return dict(zip(FINGER_ORDER, payload))
+
+
+def decode_landmarks(payload: bytes) -> List[Hand]:
+    """
+    Returns:
+        Hands of a landmark record
+
+    Raises:
+        ValueError: If the payload is truncated
+    """
+    count = payload[0] if payload else 0
+    if len(payload) < 1 + count * HAND_SIZE:
+        raise ValueError("truncated landmark record")
+    hands = []
+    for i in range(count):
+        offset = 1 + i * HAND_SIZE
+        code, score = HAND_HEADER.unpack_from(payload, offset)
+        points = np.frombuffer(payload, dtype='<f4', count=NUM_LANDMARKS * 3,
+                               offset=offset + HAND_HEADER.size).reshape(NUM_LANDMARKS, 3)
+        label = HANDEDNESS_LABELS[code] if code < len(HANDEDNESS_LABELS) else None
+        hands.append(Hand(points, label, score))
+    return hands
+
+
+def decode_sent_time(payload: bytes) -> Optional[float]:
+    """
+    Returns:
+        Send time of a landmark record, or None if the sender did not add one
+    """
+    end = 1 + (payload[0] if payload else 0) * HAND_SIZE
+    if len(payload) < end + SENT_TIME.size:
+        return None
+    return SENT_TIME.unpack_from(payload, end)[0]
+
+
+def hands_from_results(results) -> List[Hand]:
+    """
+    Convert MediaPipe (or compatible) results to hands for a landmark record.
+    """
+    if not results.multi_hand_landmarks:
+        return []
+    handedness = getattr(results, 'multi_handedness', None) or []
+    hands = []
+    for i, hand_landmarks in enumerate(results.multi_hand_landmarks):
+        label, score = None, 1.0
+        if i < len(handedness) and handedness[i].classification:
+            category = handedness[i].classification[0]
+            label, score = category.label, float(category.score)
+        hands.append(Hand(landmarks_to_array(hand_landmarks.landmark), label, score))
+    return hands
+
+
+def hands_to_results(hands: List[Hand]) -> DetectionResult:
+    """
+    Wrap the hands of a landmark record in a MediaPipe-compatible result.
+    """
+    if not hands:
+        return DetectionResult(None, None)
+    return DetectionResult(
+        [HandLandmarks(array_to_landmarks(hand.points)) for hand in hands],
+        [Handedness([Category(hand.handedness or '', hand.score, i)]) for i, hand in enumerate(hands)])
+
+
+def decode_frame(data: bytes) -> Optional[Frame]:
+    """
+    Decode a single complete record, e.g. one UDP datagram.
+
+    Returns:
+        Frame, or None if the data is not a valid record
+    """
+    if len(data) < HEADER.size:
+        return None
+    magic, version, kind, seq, timestamp, length = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION or len(data) < HEADER.size + length:
+        return None
+    return Frame(kind, seq, timestamp, data[HEADER.size:HEADER.size + length])
+
+
+class FrameDecoder:
+    """
+    Reassembles records from a byte stream.
+
+    Garbage before a record (e.g. after joining a stream mid-record) is
+    skipped up to the next valid header and counted in ``skipped_bytes``.
+    """
+    def __init__(self):
+        self._buffer = bytearray()
+        self.skipped_bytes = 0
+
+    def feed(self, data: bytes) -> List[Frame]:
+        """
+        Args:
+            data: Bytes received from the stream
+
+        Returns:
+            Records completed by ``data``
+        """
+        self._buffer += data
+        frames = []
+        while len(self._buffer) >= HEADER.size:
+            magic, version, kind, seq, timestamp, length = HEADER.unpack_from(self._buffer)
+            if magic != MAGIC or version != VERSION:
+                start = self._buffer.find(MAGIC, 1)
+                skip = start if start > 0 else len(self._buffer) - 1
+                del self._buffer[:skip]
+                self.skipped_bytes += skip
+                continue
+            end = HEADER.size + length
+            if len(self._buffer) < end:
+                break
+            frames.append(Frame(kind, seq, timestamp, bytes(self._buffer[HEADER.size:end])))
+            del self._buffer[:end]
+        return frames
+
+
+def parse_address(address: str) -> Tuple[str, object]:
+    """
+    Split a stream address into its scheme and target.
+
+    Args:
+        address: 'tcp:HOST:PORT', 'udp:HOST:PORT' or 'unix:PATH'
+
+    Returns:
+        ('tcp' | 'udp', (host, port)) or ('unix', path)
+
+    Raises:
+        ValueError: For an unknown scheme
+    """
+    if address.startswith(UNIX_PREFIX):
+        if not hasattr(socket, 'AF_UNIX'):
+            raise ValueError("Unix sockets are not available on this platform")
+        return 'unix', address[len(UNIX_PREFIX):]
+    for prefix in (TCP_PREFIX, UDP_PREFIX):
+        if address.startswith(prefix):
+            host, _, port = address[len(prefix):].rpartition(':')
+            return prefix[:-1], (host or '127.0.0.1', int(port))
+    raise ValueError(f"Unknown stream address: {address} (use tcp:HOST:PORT, udp:HOST:PORT or unix:PATH)")
@@ -0,0 +1,327 @@
+"""
+Hand landmarks received from a remote detector node.
+
+A weak robot host can leave MediaPipe to a stronger machine. That machine
+runs streaming/detector_node.py and sends one landmark record per frame
+(see framing.py), with the frame's sequence number and capture timestamp.
+The host keeps angle calculation and actuation.
+
+LandmarkReceiver listens on UDP or TCP. It serves as both the frame source
+and the hand detector of the main loop:
+  * read_frame() blocks until a newer landmark frame arrives. It returns a
+    blank canvas stamped with the frame's capture time, converted to this
+    host's monotonic clock.
+  * detect_hands() returns that frame's landmarks as a MediaPipe-compatible
+    result.
+  * draw_landmarks() draws them without MediaPipe.
+
+Only the newest frame matters for control, so ordering is latest-wins:
+  * a gap in sequence numbers counts as lost
+  * a frame from such a gap arrives late: it is dropped and moves from lost
+    to late
+  * any other frame not newer than the last accepted one is a duplicate
+  * a large backwards jump means the node restarted, and numbering restarts
+If the node goes silent for ``hand_timeout``, the hand counts as lost.
+
+Three latencies are measured from the record's timestamps:
+  * network: receive time minus the node's send time
+  * node: send time minus capture time (capture and inference on the node)
+  * capture to receive: the sum of both
+Across hosts the network and end-to-end figures need synchronized clocks
+(NTP/PTP); over localhost they are exact. Records without a send time only
+give the capture-to-receive latency.
+"""
+import socket
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from capture.frame_source import FrameSource
+from hand_tracking.landmarks import HAND_CONNECTIONS, DetectionResult
+from .framing import (KIND_LANDMARKS, FrameDecoder, decode_frame, decode_landmarks, decode_sent_time,
+                      hands_to_results, parse_address)
+
+DEFAULT_INGEST_CONFIG = {
+    'width': 640,           # Canvas the received landmarks are drawn on
+    'height': 480,
+    'hand_timeout': 0.5,    # Seconds without a frame before the hand counts as lost
+    'restart_gap': 1000,    # Backwards sequence jump that means the node restarted
+}
+
+# Recent latencies and arrival intervals kept for the statistics
+METRICS_WINDOW = 1024
+
+
+class LandmarkReceiver(FrameSource):
+    """
+    Frame source and hand detector backed by a remote detector node.
+    """
+    def __init__(self, address: str, config: Optional[Dict] = None):
+        """
+        Start listening for landmark frames.
+
+        Args:
+            address: 'udp:HOST:PORT' or 'tcp:HOST:PORT' to listen on
+            config: Overrides for DEFAULT_INGEST_CONFIG
+
+        Raises:
+            OSError: If the address cannot be bound
+        """
+        super().__init__()
+        self.scheme, target = parse_address(address)
+        if self.scheme not in ('udp', 'tcp'):
+            raise ValueError(f"Landmark ingest needs a udp: or tcp: address, got {address}")
+        self.address = address
+        self.config = dict(DEFAULT_INGEST_CONFIG, **(config or {}))
+        self.received = 0
+        self.accepted = 0
+        self.late = 0
+        self.duplicates = 0
+        self.lost = 0
+        self.restarts = 0
+        self.invalid = 0
+        self.skipped = 0      # Accepted but replaced by a newer frame before it was processed
+        self.connections = 0
+        self.last_seq = None
+        self._missing = set()  # Sequence numbers counted as lost that may still arrive late
+        self._network = deque(maxlen=METRICS_WINDOW)
+        self._node = deque(maxlen=METRICS_WINDOW)
+        self._ages = deque(maxlen=METRICS_WINDOW)
+        self._intervals = deque(maxlen=METRICS_WINDOW)
+        self._last_arrival = None
+        self._latest = None   # (seq, timestamp, hands) of the newest accepted frame
+        self._fresh = False
+        self._results = DetectionResult(None, None)
+        self._canvas = np.zeros((self.config['height'], self.config['width'], 3), dtype=np.uint8)
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+
+        if self.scheme == 'udp':
+            self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        else:
+            self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            self._sock.bind(target)
+            if self.scheme == 'tcp':
+                self._sock.listen(1)
+        except OSError:
+            self._sock.close()
+            raise
+        self._sock.settimeout(0.2)
+        self._thread = threading.Thread(target=self._receive_loop, name="LandmarkReceiver", daemon=True)
+        self._thread.start()
+        print(f"Waiting for landmark frames on {address}")
+
+    # FrameSource interface
+
+    def isOpened(self) -> bool:
+        return not self._stop.is_set()
+
+    def _grab(self) -> Optional[Tuple[np.ndarray, float]]:
+        deadline = time.monotonic() + self.config['hand_timeout']
+        with self._cond:
+            while not self._fresh:
+                if self._stop.is_set():
+                    return None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(min(remaining, 0.1))
+            if self._fresh:
+                _, timestamp, hands = self._latest
+                self._fresh = False
+                self._results = hands_to_results(hands)
+                # Capture time on this host's monotonic clock
+                capture_time = time.monotonic() - max(0.0, time.time() - timestamp)
+            else:
+                # Node silent: report no hand so gestures and smoothing reset
+                self._results = DetectionResult(None, None)
+                capture_time = time.monotonic()
+        return self._canvas.copy(), capture_time
+
+    def release(self):
+        self.close()
+
+    # HandDetector interface
+
+    def detect_hands(self, frame) -> DetectionResult:
+        """
+        Returns:
+            Landmarks of the frame last returned by read_frame()
+        """
+        return self._results
+
+    def draw_landmarks(self, frame, multi_hand_landmarks):
+        """
+        Draw hand landmarks on the frame (without MediaPipe's drawing utils).
+        """
+        height, width = frame.shape[:2]
+        for hand_landmarks in multi_hand_landmarks:
+            points = [(int(lm.x * width), int(lm.y * height)) for lm in hand_landmarks.landmark]
+            for a, b in HAND_CONNECTIONS:
+                cv2.line(frame, points[a], points[b], (255, 255, 255), 2)
+            for point in points:
+                cv2.circle(frame, point, 4, (0, 0, 255), -1)
+        return frame
+
+    def close(self):
+        """
+        Stop receiving and close the socket.
+        """
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        self._thread.join()
+        self._sock.close()
+
+    # Statistics
+
+    def stats(self) -> Dict:
+        """
+        Returns:
+            Counters and latency statistics (milliseconds)
+        """
+        intervals = np.array(self._intervals)
+        stats = {
+            'received': self.received, 'accepted': self.accepted, 'late': self.late,
+            'duplicates': self.duplicates, 'lost': self.lost, 'restarts': self.restarts,
+            'invalid': self.invalid, 'skipped': self.skipped, 'connections': self.connections,
+        }
+        for name, samples in (('network', self._network), ('node', self._node), ('age', self._ages)):
+            if samples:
+                values = np.array(samples)
+                stats.update({f'{name}_p50': float(np.percentile(values, 50)),
+                              f'{name}_p95': float(np.percentile(values, 95)),
+                              f'{name}_max': float(values.max())})
+        if len(intervals) > 1:
+            stats.update(jitter=float(intervals.std()))
+        return stats
+
+    def report(self) -> str:
+        """
+        Returns:
+            One-line summary for the end of a run
+        """
+        s = self.stats()
+        latencies = [f"{label} p50/p95/max {s[name + '_p50']:.1f}/{s[name + '_p95']:.1f}/{s[name + '_max']:.1f} ms"
+                     for name, label in (('network', 'network'), ('node', 'node'), ('age', 'capture to receive'))
+                     if name + '_p50' in s]
+        latency = ", ".join(latencies) or "no latency samples"
+        jitter = f", arrival jitter {s['jitter']:.1f} ms" if 'jitter' in s else ""
+        return (f"Landmark ingest: {s['accepted']}/{s['received']} frames accepted, {s['lost']} lost, "
+                f"{s['late']} late, {s['duplicates']} duplicates, {s['restarts']} restarts, "
+                f"{s['invalid']} invalid, {s['skipped']} skipped; {latency}{jitter}")
+
+    # Receiver thread
+
+    def _receive_loop(self):
+        if self.scheme == 'udp':
+            self._receive_datagrams()
+        else:
+            self._receive_streams()
+
+    def _receive_datagrams(self):
+        while not self._stop.is_set():
+            try:
+                data = self._sock.recv(65536)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            frame = decode_frame(data)
+            if frame is None:
+                self.invalid += 1
+                continue
+            self._accept(frame, time.time())
+
+    def _receive_streams(self):
+        while not self._stop.is_set():
+            try:
+                conn, _ = self._sock.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            # A new connection is a new node run with its own numbering
+            self.connections += 1
+            self.last_seq = None
+            self._missing.clear()
+            conn.settimeout(0.2)
+            decoder = FrameDecoder()
+            with conn:
+                while not self._stop.is_set():
+                    try:
+                        data = conn.recv(65536)
+                    except socket.timeout:
+                        continue
+                    except OSError:
+                        break
+                    if not data:
+                        break
+                    now = time.time()
+                    for frame in decoder.feed(data):
+                        self._accept(frame, now)
+            if decoder.skipped_bytes:
+                self.invalid += 1
+
+    def _accept(self, frame, received_at: float):
+        """
+        Apply the ordering rules to a received record and keep it if it is the newest.
+        """
+        if frame.kind != KIND_LANDMARKS:
+            return
+        try:
+            hands = decode_landmarks(frame.payload)
+        except ValueError:
+            self.invalid += 1
+            return
+        self.received += 1
+        if self._last_arrival is not None:
+            self._intervals.append((received_at - self._last_arrival) * 1000)
+        self._last_arrival = received_at
+
+        restart_gap = self.config['restart_gap']
+        if self.last_seq is not None:
+            if frame.seq == self.last_seq:
+                self.duplicates += 1
+                return
+            if frame.seq < self.last_seq:
+                if self.last_seq - frame.seq < restart_gap:
+                    if frame.seq in self._missing:
+                        # Overtaken by a newer frame: counted as lost when the
+                        # gap opened, so move it to late
+                        self._missing.discard(frame.seq)
+                        self.late += 1
+                        self.lost -= 1
+                    else:
+                        # Another copy of a frame already accepted or already late
+                        self.duplicates += 1
+                    return
+                self.restarts += 1
+                self._missing.clear()
+            elif frame.seq > self.last_seq + 1:
+                self.lost += frame.seq - self.last_seq - 1
+                # Frames further back than restart_gap would read as a restart
+                self._missing.update(range(max(self.last_seq + 1, frame.seq - restart_gap + 1), frame.seq))
+                if len(self._missing) > restart_gap:
+                    self._missing = {seq for seq in self._missing if frame.seq - seq < restart_gap}
+        self.last_seq = frame.seq
+        self.accepted += 1
+        self._ages.append((received_at - frame.timestamp) * 1000)
+        sent_time = decode_sent_time(frame.payload)
+        if sent_time is not None:
+            self._network.append((received_at - sent_time) * 1000)
+            self._node.append((sent_time - frame.timestamp) * 1000)
+        with self._cond:
+            if self._fresh:
+                self.skipped += 1
+            self._latest = (frame.seq, frame.timestamp, hands)
+            self._fresh = True
+            self._cond.notify_all()
@@ -0,0 +1,262 @@
+"""
+Publishes the live angle and landmark stream to any number of local clients.
+
+StreamPublisher runs an asyncio server on its own thread, on TCP or a Unix
+socket. The tracker calls publish() once per frame. That call encodes the
+records (see framing.py) and hands them to the event loop, so it never
+waits on a client.
+
+Every subscriber keeps only the newest unsent record of each kind. Records
+are written only while at most ``write_buffer`` bytes (a few records) are
+queued for the client, and the kernel's send buffers are kept as small, so
+a client that reads too slowly holds its writer back almost at once.
+Meanwhile newer records replace the waiting ones (conflation). That client
+sees fewer, but always current, updates, while faster clients and the
+tracker are unaffected. The client's own receive buffer still adds its
+share; StreamSubscriber keeps it small.
+
+Usage:
+    publisher = StreamPublisher('tcp:127.0.0.1:8765')
+    publisher.start()
+    publisher.publish(angles, hands, timestamp)
+    ...
+    publisher.close()
+
+    python -m streaming.subscriber tcp:127.0.0.1:8765
+"""
+import asyncio
+import os
+import socket
+import threading
+import time
+from typing import Dict, List, Optional
+
+from .framing import KIND_ANGLES, KIND_LANDMARKS, Hand, encode_angles, encode_landmarks, parse_address
+
+DEFAULT_PUBLISHER_CONFIG = {
+    'max_subscribers': 16,        # Further connections are refused
+    'write_buffer': 1024,         # Bytes queued per subscriber before conflation starts
+}
+
+# TCP option that reports a socket writable only while its unsent data is
+# below the given size (Linux, macOS); None where Python does not expose it
+TCP_NOTSENT_LOWAT = getattr(socket, 'TCP_NOTSENT_LOWAT', None)
+
+
+class _Subscriber:
+    """Per-client state: the newest unsent record of each kind."""
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.peer = writer.get_extra_info('peername')
+        self.pending = {}  # kind -> encoded record
+        self.ready = asyncio.Event()
+        self.records_sent = 0
+        self.bytes_sent = 0
+        self.conflated = 0
+
+
+class StreamPublisher:
+    """
+    Broadcasts per-frame angle and landmark records to stream subscribers.
+    """
+    def __init__(self, address: str, config: Optional[Dict] = None):
+        """
+        Initialize the publisher (call start() to listen).
+
+        Args:
+            address: 'tcp:HOST:PORT' or 'unix:PATH'
+            config: Overrides for DEFAULT_PUBLISHER_CONFIG
+        """
+        self.scheme, self.target = parse_address(address)
+        if self.scheme not in ('tcp', 'unix'):
+            raise ValueError(f"Publisher needs a tcp: or unix: address, got {address}")
+        self.address = address
+        self.config = dict(DEFAULT_PUBLISHER_CONFIG, **(config or {}))
+        self.published = 0
+        self.connections = 0
+        self.refused = 0
+        self._subscribers = set()
+        self._departed = {'records_sent': 0, 'bytes_sent': 0, 'conflated': 0}
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._started = threading.Event()
+        self._error = None
+        self._start_time = None
+
+    def start(self):
+        """
+        Start listening on a background thread.
+
+        Raises:
+            OSError: If the address cannot be bound
+        """
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="StreamPublisher", daemon=True)
+        self._thread.start()
+        self._started.wait()
+        if self._error is not None:
+            self._thread = None
+            raise self._error
+        self._start_time = time.monotonic()
+        print(f"Streaming angles and landmarks on {self.address}")
+
+    def publish(self, angles: Optional[Dict[str, int]], hands: Optional[List[Hand]],
+                timestamp: Optional[float] = None):
+        """
+        Send one frame's records to every subscriber (thread-safe, non-blocking).
+
+        Args:
+            angles: Servo angles, or None when no hand was found
+            hands: Detected hands (empty when none), or None to skip the landmark record
+            timestamp: Capture time, time.time() (defaults to now)
+        """
+        if self._loop is None:
+            return
+        seq = self.published
+        self.published += 1
+        timestamp = time.time() if timestamp is None else timestamp
+        records = []
+        if hands is not None:
+            records.append((KIND_LANDMARKS, encode_landmarks(seq, timestamp, hands)))
+        if angles:
+            records.append((KIND_ANGLES, encode_angles(seq, timestamp, angles)))
+        if records:
+            self._loop.call_soon_threadsafe(self._broadcast, records)
+
+    def stats(self) -> Dict:
+        """
+        Returns:
+            Subscriber count and throughput totals
+        """
+        totals = dict(self._departed)
+        subscribers = list(self._subscribers)
+        for sub in subscribers:
+            totals['records_sent'] += sub.records_sent
+            totals['bytes_sent'] += sub.bytes_sent
+            totals['conflated'] += sub.conflated
+        elapsed = time.monotonic() - self._start_time if self._start_time is not None else 0.0
+        totals.update(
+            subscribers=len(subscribers),
+            connections=self.connections,
+            refused=self.refused,
+            published=self.published,
+            publish_rate=self.published / elapsed if elapsed > 0 else 0.0,
+            send_rate=totals['bytes_sent'] / elapsed if elapsed > 0 else 0.0,
+        )
+        return totals
+
+    def close(self):
+        """
+        Disconnect all subscribers and stop the server thread.
+        """
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._thread = None
+        self._loop = None
+        if self.scheme == 'unix' and os.path.exists(self.target):
+            os.unlink(self.target)
+
+    # Event loop thread
+
+    def _run(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            if self.scheme == 'unix':
+                if os.path.exists(self.target):
+                    os.unlink(self.target)  # Left over from a previous run
+                self._server = loop.run_until_complete(asyncio.start_unix_server(self._serve, self.target))
+            else:
+                host, port = self.target
+                self._server = loop.run_until_complete(asyncio.start_server(self._serve, host, port))
+        except OSError as e:
+            self._error = e
+            self._started.set()
+            loop.close()
+            return
+        self._loop = loop
+        self._started.set()
+        try:
+            loop.run_forever()
+        finally:
+            self._server.close()
+            # Drop unsent data: a plain close would wait for slow clients to read it
+            for sub in self._subscribers:
+                sub.writer.transport.abort()
+            tasks = asyncio.all_tasks(loop)
+            for task in tasks:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            loop.run_until_complete(asyncio.sleep(0))  # Let the closed transports shut their sockets
+            loop.close()
+
+    def _broadcast(self, records):
+        for sub in self._subscribers:
+            for kind, data in records:
+                if kind in sub.pending:
+                    sub.conflated += 1
+                sub.pending[kind] = data
+            sub.ready.set()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        if len(self._subscribers) >= self.config['max_subscribers']:
+            self.refused += 1
+            writer.close()
+            return
+        # Keep the kernel from buffering seconds of stale records for a slow client
+        limit = self.config['write_buffer']
+        sock = writer.get_extra_info('socket')
+        if sock is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, limit)
+            if self.scheme == 'tcp' and TCP_NOTSENT_LOWAT is not None:
+                try:
+                    sock.setsockopt(socket.IPPROTO_TCP, TCP_NOTSENT_LOWAT, limit)
+                except OSError:
+                    pass  # Older kernel: SO_SNDBUF alone bounds the unsent data
+        # drain() waits while more than ``limit`` bytes are queued, until none are
+        writer.transport.set_write_buffer_limits(high=limit, low=0)
+        sub = _Subscriber(writer)
+        self._subscribers.add(sub)
+        self.connections += 1
+        # Subscribers only listen; reading completes when they disconnect
+        closed = asyncio.ensure_future(reader.read())
+        try:
+            while True:
+                ready = asyncio.ensure_future(sub.ready.wait())
+                await asyncio.wait({ready, closed}, return_when=asyncio.FIRST_COMPLETED)
+                if closed.done():
+                    ready.cancel()
+                    break
+                # Write only once the client has taken what was queued; until
+                # then newer records replace the ones in pending
+                drained = asyncio.ensure_future(writer.drain())
+                await asyncio.wait({drained, closed}, return_when=asyncio.FIRST_COMPLETED)
+                if closed.done():
+                    drained.cancel()
+                    break
+                drained.result()
+                sub.ready.clear()
+                data = b''.join(sub.pending.values())
+                sub.records_sent += len(sub.pending)
+                sub.pending.clear()
+                writer.write(data)
+                sub.bytes_sent += len(data)
+        except (ConnectionError, OSError, asyncio.CancelledError):
+            pass  # Client gone, or the publisher is closing
+        finally:
+            closed.cancel()
+            self._subscribers.discard(sub)
+            for key in self._departed:
+                self._departed[key] += getattr(sub, key)
+            writer.close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,123 @@
+"""
+Blocking client for a StreamPublisher.
+
+Usage:
+    subscriber = StreamSubscriber('tcp:127.0.0.1:8765')
+    for frame in subscriber:
+        if frame.kind == KIND_ANGLES:
+            print(decode_angles(frame.payload))
+
+    python -m streaming.subscriber tcp:127.0.0.1:8765 [--slow MS]
+"""
+import argparse
+import socket
+import time
+from typing import Iterator, List, Optional
+
+from .framing import KIND_ANGLES, KIND_LANDMARKS, Frame, FrameDecoder, decode_angles, decode_landmarks, parse_address
+
+
+class StreamSubscriber:
+    """
+    Connects to a publisher and yields its records.
+    """
+    def __init__(self, address: str, timeout: Optional[float] = 5.0, receive_buffer: int = 2048):
+        """
+        Connect to a publisher.
+
+        Args:
+            address: 'tcp:HOST:PORT' or 'unix:PATH'
+            timeout: Connection and receive timeout in seconds (None = block)
+            receive_buffer: Socket receive buffer; a small one keeps a slow
+                reader from falling far behind, since the publisher then
+                conflates instead of queueing
+
+        Raises:
+            OSError: If the connection fails
+        """
+        scheme, target = parse_address(address)
+        if scheme not in ('tcp', 'unix'):
+            raise ValueError(f"Subscriber needs a tcp: or unix: address, got {address}")
+        self.sock = socket.socket(socket.AF_UNIX if scheme == 'unix' else socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, receive_buffer)
+        self.sock.settimeout(timeout)
+        try:
+            self.sock.connect(target)
+        except OSError:
+            self.sock.close()
+            raise
+        self.receive_buffer = receive_buffer
+        self.decoder = FrameDecoder()
+        self.bytes_received = 0
+
+    def receive(self) -> List[Frame]:
+        """
+        Block until data arrives.
+
+        Returns:
+            Completed records (empty once the publisher has closed)
+        """
+        while True:
+            data = self.sock.recv(self.receive_buffer)
+            if not data:
+                return []
+            self.bytes_received += len(data)
+            frames = self.decoder.feed(data)
+            if frames:
+                return frames
+
+    def __iter__(self) -> Iterator[Frame]:
+        while True:
+            frames = self.receive()
+            if not frames:
+                return
+            yield from frames
+
+    def close(self):
+        self.sock.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print a StreamPublisher's records")
+    parser.add_argument('address', help='tcp:HOST:PORT or unix:PATH')
+    parser.add_argument('--slow', type=float, default=0.0, metavar='MS',
+                        help='Sleep after every record to emulate a slow consumer')
+    parser.add_argument('--quiet', action='store_true', help='Only print the once-per-second rates')
+    args = parser.parse_args()
+
+    subscriber = StreamSubscriber(args.address, timeout=None)
+    counts = {KIND_ANGLES: 0, KIND_LANDMARKS: 0}
+    last_seq = None
+    gaps = 0
+    window_start = time.monotonic()
+    try:
+        for frame in subscriber:
+            counts[frame.kind] = counts.get(frame.kind, 0) + 1
+            if frame.kind == KIND_LANDMARKS:
+                if last_seq is not None and frame.seq > last_seq + 1:
+                    gaps += frame.seq - last_seq - 1  # Conflated by the publisher
+                last_seq = frame.seq
+            if not args.quiet:
+                age_ms = (time.time() - frame.timestamp) * 1000
+                if frame.kind == KIND_ANGLES:
+                    print(f"#{frame.seq} angles {decode_angles(frame.payload)} ({age_ms:.1f} ms old)")
+                else:
+                    hands = decode_landmarks(frame.payload)
+                    print(f"#{frame.seq} landmarks: {len(hands)} hand(s) ({age_ms:.1f} ms old)")
+            now = time.monotonic()
+            if now - window_start >= 1.0:
+                print(f"-- {counts[KIND_LANDMARKS]} landmark, {counts[KIND_ANGLES]} angle records/s, "
+                      f"{gaps} frames conflated, {subscriber.bytes_received} bytes total")
+                counts = {KIND_ANGLES: 0, KIND_LANDMARKS: 0}
+                gaps = 0
+                window_start = now
+            if args.slow:
+                time.sleep(args.slow / 1000)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        subscriber.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,19 +2,27 @@
 """
 Test programı - Her bir bileşeni ayrı ayrı test eder
 """
-import cv2
 import time
 import sys
 import argparse
 
-print("=== EL HAREKETİ TEMEL TEST PROGRAMI ===")
+from utils.import_profile import PROFILE_FLAG, run_with_import_profile
 
 # Argümanları işle
 parser = argparse.ArgumentParser(description="Test programı")
 parser.add_argument('--test', type=str, choices=['kamera', 'arduino', 'tam'], 
                    default='tam', help='Çalıştırılacak test')
+parser.add_argument('--source', type=str, default=None,
+                   help="Kamera indeksi, video dosyası, görüntü klasörü veya 'synthetic'")
+parser.add_argument(PROFILE_FLAG, action='store_true',
+                   help='-X importtime ile çalıştır ve import süresi raporu yazdır')
 args = parser.parse_args()
 
+if args.profile_imports:
+    sys.exit(run_with_import_profile())
+
+print("=== EL HAREKETİ TEMEL TEST PROGRAMI ===")
+
 print(f"Seçilen test: {args.test}")
 
 def test_kamera():
@@ -22,8 +30,13 @@ def test_kamera():
     print("\n=== KAMERA TESTİ ===")
     print("Kamera başlatılıyor...")
     
-    # OpenCV videocapture nesnesini oluştur
-    cap = cv2.VideoCapture(0)
+    # OpenCV sadece kamera testinde gerekli
+    import cv2
+    from capture.frame_source import open_frame_source
+    from config.settings import CAMERA_SOURCE, CAMERA_CONFIG
+    
+    # Görüntü kaynağını ayarlardaki çözünürlük/FPS/tampon değerleriyle aç
+    cap = open_frame_source(args.source if args.source is not None else CAMERA_SOURCE, **CAMERA_CONFIG)
     
     if not cap.isOpened():
         print("HATA: Kamera açılamadı!")
@@ -39,12 +52,17 @@ def test_kamera():
     # Birkaç kare al
     frame_count = 0
     start_time = time.time()
+    first_timestamp = last_timestamp = None
     
     while (time.time() - start_time) < 3:  # 3 saniye çalıştır
-        ret, frame = cap.read()
-        if not ret:
+        captured = cap.read_frame()
+        if captured is None:
             print("HATA: Kamera karesi okunamadı!")
             break
+        frame = captured.image
+        if first_timestamp is None:
+            first_timestamp = captured.timestamp
+        last_timestamp = captured.timestamp
         
         # Kare sayısını göster
         frame_count += 1
@@ -68,6 +86,9 @@ def test_kamera():
     cv2.destroyAllWindows()
     
     print(f"Kamera testi tamamlandı. {frame_count} kare işlendi.")
+    if frame_count > 1 and last_timestamp > first_timestamp:
+        print(f"Kare hızı (yakalama zaman damgalarından): "
+              f"{(frame_count - 1) / (last_timestamp - first_timestamp):.1f} FPS")
     return True
 
 def test_arduino():
@@ -1,2 +1,9 @@
 # utils/__init__.py
-from .calibration import CalibrationSystem
\ No newline at end of file
+from .lazy_import import lazy_exports
+
+__all__ = ['CalibrationSystem', 'LatencyTracer']
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'CalibrationSystem': '.calibration',
+    'LatencyTracer': '.tracing',
+})
@@ -3,22 +3,27 @@ Calibration module for hand tracking system.
 """
 import cv2
 import time
-from typing import Dict, Tuple
+from typing import Dict, Tuple, Union
+
+from capture.frame_source import open_frame_source
+from config.settings import CAMERA_SOURCE, CAMERA_CONFIG
 
 class CalibrationSystem:
     """
     System for calibrating finger angle ranges.
     """
-    def __init__(self, hand_detector, angle_calculator):
+    def __init__(self, hand_detector, angle_calculator, source: Union[int, str] = CAMERA_SOURCE):
         """
         Initialize calibration system.
         
         Args:
             hand_detector: HandDetector instance
             angle_calculator: AngleCalculator instance
+            source: Camera index, video file, image directory or 'synthetic'
         """
         self.hand_detector = hand_detector
         self.angle_calculator = angle_calculator
+        self.source = source
         self.window_name = 'Calibration Mode'
         
         # Min/max angles for each finger
@@ -40,7 +45,7 @@ class CalibrationSystem:
         print("Press SPACE to start/pause, press S to save, press Q to quit")
         
         # Start camera
-        cap = cv2.VideoCapture(0)
+        cap = open_frame_source(self.source, **CAMERA_CONFIG)
         if not cap.isOpened():
             print("Could not open camera!")
             return
@@ -0,0 +1,112 @@
+"""
+Import-time profiling helpers.
+
+Re-runs the current program under ``python -X importtime`` and prints a summary
+of the slowest imports once it exits, so start-up regressions are easy to spot.
+"""
+import os
+import subprocess
+import sys
+from typing import List, NamedTuple, Optional
+
+PROFILE_FLAG = '--profile-imports'
+_IMPORTTIME_PREFIX = 'import time:'
+
+
+class ImportRecord(NamedTuple):
+    """One line of ``-X importtime`` output."""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(lines: List[str]) -> List[ImportRecord]:
+    """
+    Parse ``-X importtime`` output lines.
+
+    Args:
+        lines: Raw stderr lines (other lines are ignored)
+
+    Returns:
+        List of import records in the order they were reported
+    """
+    records = []
+    for line in lines:
+        if not line.startswith(_IMPORTTIME_PREFIX):
+            continue
+        parts = line[len(_IMPORTTIME_PREFIX):].split('|')
+        if len(parts) != 3:
+            continue
+        try:
+            self_us = int(parts[0])
+            cumulative_us = int(parts[1])
+        except ValueError:
+            # Header line: "self [us] | cumulative | imported package"
+            continue
+        # Nested imports are indented by two spaces per level after the separator
+        name = parts[2][1:].rstrip()
+        stripped = name.lstrip()
+        depth = (len(name) - len(stripped)) // 2
+        records.append(ImportRecord(stripped, self_us, cumulative_us, depth))
+    return records
+
+
+def format_report(records: List[ImportRecord], top: int = 20) -> str:
+    """
+    Format a summary of the slowest imports.
+
+    Args:
+        records: Parsed import records
+        top: Number of entries to list
+
+    Returns:
+        Multi-line report text
+    """
+    total_us = sum(r.cumulative_us for r in records if r.depth == 0)
+    lines = [
+        "\n=== IMPORT TIME PROFILE ===",
+        f"Modules imported: {len(records)}, total: {total_us / 1000:.1f} ms",
+        f"{'cumulative [ms]':>16} {'self [ms]':>10}  module",
+    ]
+    top_level = sorted((r for r in records if r.depth == 0),
+                       key=lambda r: r.cumulative_us, reverse=True)
+    for record in top_level[:top]:
+        lines.append(f"{record.cumulative_us / 1000:16.1f} {record.self_us / 1000:10.1f}  {record.module}")
+    return "\n".join(lines)
+
+
+def run_with_import_profile(argv: Optional[List[str]] = None, top: int = 20) -> int:
+    """
+    Re-run the current script with ``-X importtime`` and print a report.
+
+    The profiling flag is removed from the child's arguments. Regular stderr
+    output of the child is passed through unchanged.
+
+    Args:
+        argv: Script arguments (defaults to sys.argv)
+        top: Number of entries to list in the report
+
+    Returns:
+        Exit code of the profiled run
+    """
+    argv = list(sys.argv if argv is None else argv)
+    child_args = [arg for arg in argv if arg != PROFILE_FLAG]
+    cmd = [sys.executable, '-X', 'importtime'] + child_args
+
+    env = dict(os.environ, PYTHONUNBUFFERED='1')
+    process = subprocess.Popen(cmd, stderr=subprocess.PIPE, universal_newlines=True, env=env)
+    importtime_lines = []
+    try:
+        for line in process.stderr:
+            if line.startswith(_IMPORTTIME_PREFIX):
+                importtime_lines.append(line)
+            else:
+                sys.stderr.write(line)
+        returncode = process.wait()
+    except KeyboardInterrupt:
+        process.terminate()
+        returncode = process.wait()
+
+    print(format_report(parse_importtime(importtime_lines), top))
+    return returncode
@@ -0,0 +1,36 @@
+"""
+Lazy attribute loading for package ``__init__`` modules.
+
+Heavy dependencies (OpenCV, MediaPipe, NumPy) are only imported when the class
+that needs them is first accessed, so tools that never touch a subsystem do not
+pay its import cost.
+"""
+import importlib
+from typing import Callable, Dict, List, Tuple
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable, Callable]:
+    """
+    Build PEP 562 ``__getattr__``/``__dir__`` hooks for a package.
+
+    Args:
+        package: Name of the package (``__name__`` of its ``__init__``)
+        exports: Mapping of exported name -> relative submodule (e.g. '.hand_detector')
+
+    Returns:
+        Tuple of (__getattr__, __dir__) functions to assign at module level
+    """
+    def __getattr__(name: str):
+        module_name = exports.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        module = importlib.import_module(module_name, package)
+        value = getattr(module, name)
+        # Cache on the package so later lookups skip this hook
+        setattr(importlib.import_module(package), name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(exports) | set(vars(importlib.import_module(package))))
+
+    return __getattr__, __dir__
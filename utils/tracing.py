@@ -0,0 +1,209 @@
+"""
+Per-frame latency tracing from camera capture to servo command.
+
+Each processed frame gets a FrameTrace with a frame ID and monotonic
+timestamps at every stage boundary (capture, read, detect, angles, decide,
+write). When the frame results in a command, the command's sequence number
+is recorded on the trace so the board's ``ack:<seq>:<millis>`` reply can
+close the loop with an ``ack`` stage.
+
+LatencyTracer collects finished traces and reports p50/p95/p99 per stage and
+end to end, and can export them as a Chrome trace / Perfetto JSON file
+(open in chrome://tracing or https://ui.perfetto.dev).
+"""
+import json
+import time
+from collections import OrderedDict, deque
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Stage names in pipeline order
+CAPTURE = 'capture'
+READ = 'read'
+DETECT = 'detect'
+ANGLES = 'angles'
+DECIDE = 'decide'
+WRITE = 'write'
+ACK = 'ack'
+STAGES = (CAPTURE, READ, DETECT, ANGLES, DECIDE, WRITE, ACK)
+
+PERCENTILES = (50, 95, 99)
+
+# Unacknowledged sequence numbers kept for matching late acks
+MAX_PENDING_ACKS = 1024
+
+
+class FrameTrace:
+    """
+    Stage timestamps of one frame.
+    """
+    __slots__ = ('frame_id', 'marks', 'seq', 'board_ms')
+
+    def __init__(self, frame_id: int, timestamp: Optional[float] = None):
+        """
+        Start a trace.
+
+        Args:
+            frame_id: Frame number
+            timestamp: Capture time (time.monotonic()); defaults to now
+        """
+        self.frame_id = frame_id
+        self.marks = [(CAPTURE, time.monotonic() if timestamp is None else timestamp)]
+        self.seq = None
+        self.board_ms = None
+
+    def mark(self, stage: str, timestamp: Optional[float] = None):
+        """
+        Record the end of a stage.
+
+        Args:
+            stage: Stage name
+            timestamp: time.monotonic() value (defaults to now)
+        """
+        self.marks.append((stage, time.monotonic() if timestamp is None else timestamp))
+
+    def time_of(self, stage: str) -> Optional[float]:
+        for name, timestamp in self.marks:
+            if name == stage:
+                return timestamp
+        return None
+
+    def durations(self) -> List[Tuple[str, float, float]]:
+        """
+        Returns:
+            (stage, start, end) for every stage after capture, in order
+        """
+        return [(name, start, end) for (_, start), (name, end) in zip(self.marks, self.marks[1:])]
+
+
+class LatencyTracer:
+    """
+    Collects frame traces and reports stage latencies.
+    """
+    def __init__(self, max_frames: int = 100000):
+        """
+        Initialize the tracer.
+
+        Args:
+            max_frames: Number of most recent traces kept
+        """
+        self.traces = deque(maxlen=max_frames)
+        self.next_frame_id = 0
+        self.epoch = time.monotonic()
+        self._pending = OrderedDict()  # seq -> FrameTrace awaiting an ack
+
+    def begin(self, timestamp: Optional[float] = None, frame_id: Optional[int] = None) -> FrameTrace:
+        """
+        Start tracing a frame.
+
+        Args:
+            timestamp: Capture time of the frame (time.monotonic())
+            frame_id: Frame number (defaults to a running counter)
+
+        Returns:
+            FrameTrace to mark stages on
+        """
+        if frame_id is None:
+            frame_id = self.next_frame_id
+        self.next_frame_id = frame_id + 1
+        return FrameTrace(frame_id, timestamp)
+
+    def finish(self, trace: FrameTrace):
+        """
+        Store a completed trace; if it sent a command, wait for the ack.
+
+        Args:
+            trace: Trace returned by begin()
+        """
+        self.traces.append(trace)
+        if trace.seq is not None:
+            self._pending[trace.seq] = trace
+            while len(self._pending) > MAX_PENDING_ACKS:
+                self._pending.popitem(last=False)
+
+    def ack(self, seq: int, board_ms: Optional[int] = None, timestamp: Optional[float] = None) -> bool:
+        """
+        Record the board's acknowledgement of a command.
+
+        Args:
+            seq: Sequence number from the ack
+            board_ms: Board millis() when the command was applied
+            timestamp: Host time the ack was read (defaults to now)
+
+        Returns:
+            True if the sequence number belonged to a traced frame
+        """
+        trace = self._pending.pop(seq, None)
+        if trace is None:
+            return False
+        trace.board_ms = board_ms
+        trace.mark(ACK, timestamp)
+        return True
+
+    def stage_latencies(self) -> Dict[str, np.ndarray]:
+        """
+        Returns:
+            Durations in milliseconds per stage, plus 'glass-to-write' and
+            'glass-to-ack' end-to-end latencies
+        """
+        samples = {}
+        for trace in self.traces:
+            for name, start, end in trace.durations():
+                samples.setdefault(name, []).append((end - start) * 1000)
+            capture = trace.marks[0][1]
+            for stage, label in ((WRITE, 'glass-to-write'), (ACK, 'glass-to-ack')):
+                end = trace.time_of(stage)
+                if end is not None:
+                    samples.setdefault(label, []).append((end - capture) * 1000)
+
+        order = [stage for stage in STAGES if stage in samples]
+        order += [name for name in samples if name not in order]
+        return OrderedDict((name, np.array(samples[name])) for name in order)
+
+    def report(self) -> str:
+        """
+        Format per-stage percentiles as a table.
+
+        Returns:
+            Multi-line report
+        """
+        latencies = self.stage_latencies()
+        header = f"{'stage':<15} {'count':>7}" + ''.join(f" {'p' + str(p) + ' [ms]':>10}" for p in PERCENTILES)
+        lines = [f"Latency over {len(self.traces)} frames", header]
+        for name, values in latencies.items():
+            if not len(values):
+                continue
+            percentiles = np.percentile(values, PERCENTILES)
+            lines.append(f"{name:<15} {len(values):>7}" + ''.join(f" {value:10.2f}" for value in percentiles))
+        return "\n".join(lines)
+
+    def export_chrome_trace(self, path: str):
+        """
+        Write the traces in Chrome trace event format.
+
+        Host stages are drawn on one track and acks on a 'board' track;
+        every slice carries the frame ID and sequence number.
+
+        Args:
+            path: Output .json path
+        """
+        events = [
+            {'name': 'process_name', 'ph': 'M', 'pid': 1, 'args': {'name': 'hand mimic'}},
+            {'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': 1, 'args': {'name': 'host pipeline'}},
+            {'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': 2, 'args': {'name': 'board ack'}},
+        ]
+        for trace in self.traces:
+            args = {'frame': trace.frame_id}
+            if trace.seq is not None:
+                args['seq'] = trace.seq
+            if trace.board_ms is not None:
+                args['board_ms'] = trace.board_ms
+            for name, start, end in trace.durations():
+                events.append({
+                    'name': name, 'ph': 'X', 'pid': 1, 'tid': 2 if name == ACK else 1,
+                    'ts': (start - self.epoch) * 1e6, 'dur': max(0.0, (end - start) * 1e6),
+                    'args': args,
+                })
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
@@ -1,2 +1,8 @@
 # visualization/__init__.py
-from .renderer import Renderer
\ No newline at end of file
+from utils.lazy_import import lazy_exports
+
+__all__ = ['Renderer']
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'Renderer': '.renderer',
+})
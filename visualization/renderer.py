@@ -15,7 +15,8 @@ class Renderer:
         self.window_name = 'Real-Time Hand Tracking'
         cv2.namedWindow(self.window_name, cv2.WINDOW_NORMAL)
     
-    def render_frame(self, frame, finger_angles: Optional[Dict[str, int]] = None, hand_detected: bool = True):
+    def render_frame(self, frame, finger_angles: Optional[Dict[str, int]] = None, hand_detected: bool = True,
+                     gesture: Optional[str] = None):
         """
         Render a frame with angle information.
         
@@ -23,6 +24,7 @@ class Renderer:
             frame: Camera frame
             finger_angles: Dictionary of finger angles
             hand_detected: Flag indicating if hand was detected
+            gesture: Active preset gesture, if streaming is paused for one
             
         Returns:
             Processed frame
@@ -55,6 +57,39 @@ class Renderer:
                 )
                 y_pos += 25
         
+        # Display active preset gesture
+        if gesture:
+            cv2.putText(
+                frame, 
+                f"Preset: {gesture}", 
+                (10, 190), 
+                cv2.FONT_HERSHEY_SIMPLEX, 
+                0.7, 
+                (255, 0, 0), 
+                2
+            )
+        
+        return frame
+    
+    def render_idle(self, frame):
+        """
+        Render a frame in idle mode, while no hand is present.
+        
+        Args:
+            frame: Camera frame
+            
+        Returns:
+            Processed frame
+        """
+        cv2.putText(
+            frame, 
+            "Idle - waiting for hand", 
+            (10, 30), 
+            cv2.FONT_HERSHEY_SIMPLEX, 
+            0.7, 
+            (128, 128, 128), 
+            2
+        )
         return frame
     
     def display_frame(self, frame):
@@ -66,14 +101,17 @@ class Renderer:
         """
         cv2.imshow(self.window_name, frame)
     
-    def get_key(self) -> int:
+    def get_key(self, delay: int = 1) -> int:
         """
         Get a keypress.
         
+        Args:
+            delay: Milliseconds to wait for a key
+            
         Returns:
             Key code
         """
-        return cv2.waitKey(1) & 0xFF
+        return cv2.waitKey(delay) & 0xFF
     
     def close(self):
         """